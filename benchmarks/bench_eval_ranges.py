@@ -0,0 +1,48 @@
+"""
+Compare the per villain and the vectorized Monte Carlo evaluations.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_eval_ranges
+"""
+
+import argparse
+import timeit
+
+import poker_coach
+
+VILLAINS_RANGE = [5, 10, 15, 20, 30, 40, 50, 100]
+
+
+def bench(method: str, times: int, repeat: int) -> float:
+    """ Best wall time (in seconds) of an 8 villains evaluation. """
+    return min(
+        timeit.repeat(
+            lambda: poker_coach.Scenario.eval_ranges(
+                "AsKs", VILLAINS_RANGE, times=times, method=method
+            ),
+            number=1,
+            repeat=repeat,
+        )
+    )
+
+
+def main():
+    """ Print the evaluation time of each method. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--times", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'runs':>8} {'monte_carlo (s)':>16} {'vectorized (s)':>16} {'speedup':>8}")
+    for times in args.times:
+        reference = bench("monte_carlo", times, args.repeat)
+        vectorized = bench("vectorized", times, args.repeat)
+        print(
+            f"{times:>8} {reference:>16.3f} {vectorized:>16.3f} "
+            f"{reference / vectorized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Measure the seven cards hand evaluator throughput.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_evaluator
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from poker_coach import cards, evaluator
+
+
+def main():
+    """ Print how many hands per second the evaluator ranks. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--hands", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random_state = np.random.default_rng(0)
+    keys = random_state.random((args.hands, len(cards.DECK)))
+    hands = np.argsort(keys, axis=1)[:, :7].astype(np.int8)
+
+    evaluator.tables()  # Build the tables out of the measurement.
+    elapsed = min(
+        timeit.repeat(lambda: evaluator.evaluate(hands), number=1, repeat=args.repeat)
+    )
+    print(f"{args.hands / elapsed / 1e6:.1f} million hands per second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare the table rendering time of the matplotlib and the SVG hand viewers.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_handviz
+"""
+
+import argparse
+import io
+import timeit
+
+from poker_coach import handviz
+
+NAMES = ["UTG+1", "MP", "MP+1", "HJ", "CO", "BTN", "SB", "BB"]
+
+
+def kwargs(n_seats: int) -> dict:
+    """ Hand viewer arguments of a table with every seat taken. """
+    n_villains = n_seats - 1
+    return dict(
+        n_seats=n_seats,
+        pot=1.5 + n_seats * 0.125,
+        hero_name="UTG",
+        hero_hand="AsKd",
+        hero_chips=20,
+        villains_names=NAMES[-n_villains:],
+        villains_ranges=[20] * n_villains,
+        villains_chips=[30] * n_villains,
+    )
+
+
+def png(**hand) -> bytes:
+    """ Render a matplotlib hand viewer as PNG, as the app does. """
+    fig = handviz.hand(**hand)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def bench(render, hand: dict, number: int, repeat: int) -> float:
+    """ Best wall time (in milliseconds) of a render. """
+    times = timeit.repeat(lambda: render(**hand), number=number, repeat=repeat)
+    return min(times) / number * 1000
+
+
+def main():
+    """ Print the render time of each backend. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--seats", type=int, nargs="+", default=[2, 6, 9])
+    parser.add_argument("--number", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'seats':>6} {'figure (ms)':>12} {'png (ms)':>10} {'svg (ms)':>10}")
+    for n_seats in args.seats:
+        hand = kwargs(n_seats)
+        figure = bench(handviz.hand, hand, args.number, args.repeat)
+        raster = bench(png, hand, args.number, args.repeat)
+        svg = bench(handviz.hand_svg, hand, args.number, args.repeat)
+        print(f"{n_seats:>6} {figure:>12.2f} {raster:>10.2f} {svg:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measure the cold start import time of the package with python -X importtime.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_import
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(statement: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Run a statement in a fresh interpreter, from the repository root, and get the
+    import time of each module.
+
+    Args:
+        statement: Python statement.
+
+    Returns:
+        Self and cumulative import time (in microseconds) of each imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        fields = line.replace("import time:", "").split("|")
+        if len(fields) == 3 and fields[0].strip().isdigit():
+            times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times
+
+
+def main():
+    """ Print the cumulative import time of each statement and its slowest modules. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--statements",
+        nargs="+",
+        default=["import poker_coach", "from poker_coach import handviz"],
+    )
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for statement in args.statements:
+        runs = [import_times(statement) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: sum(self for self, _ in times.values()))
+        total = sum(self for self, _ in best.values())
+        print(f"{statement}: {total / 1000:.1f} ms")
+        slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self, cumulative) in slowest[: args.top]:
+            print(f"    {name:<40} {self / 1000:>8.1f} ms {cumulative / 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Measure the cost of st.State() as the number of live sessions grows.
+
+The Streamlit server is replaced by a fake one holding the simulated sessions, so
+only the session lookup and the key derivation are timed. Run from the repository
+root with:
+
+    python -m benchmarks.bench_state_patch
+"""
+
+import argparse
+import threading
+import timeit
+import types
+
+import st_state_patch
+
+
+class FakeSession:
+    """ Streamlit session stand-in. """
+
+    def enqueue(self, msg):
+        """ Forward a message to the browser. """
+
+
+class FakeContext:
+    """ Streamlit report context stand-in. """
+
+    def __init__(self, session, session_id=None):
+        self.enqueue = session.enqueue
+        if session_id is not None:
+            self.session_id = session_id
+
+
+def install(n_sessions: int, with_session_id: bool) -> None:
+    """ Register the simulated sessions and make the last one current. """
+    sessions = {str(i): FakeSession() for i in range(n_sessions)}
+    server = types.SimpleNamespace(
+        _session_info_by_id={
+            i: types.SimpleNamespace(session=session) for i, session in sessions.items()
+        }
+    )
+    last = str(n_sessions - 1)
+    ctx = FakeContext(sessions[last], last if with_session_id else None)
+    st_state_patch.Server = types.SimpleNamespace(get_current=lambda: server)
+    st_state_patch.ReportThread = types.SimpleNamespace(get_report_ctx=lambda: ctx)
+
+
+def state_call():
+    """ Get the session state as the app does, from a fresh run. """
+    vars(threading.current_thread()).pop("_key_counts", None)
+    return st_state_patch.State()
+
+
+def bench(n_sessions: int, with_session_id: bool, number: int, repeat: int) -> float:
+    """ Best time (in microseconds) of a st.State() call. """
+    install(n_sessions, with_session_id)
+    times = timeit.repeat(state_call, number=number, repeat=repeat)
+    return min(times) / number * 1e6
+
+
+def main():
+    """ Print the cost of a st.State() call per number of sessions. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8} {'session id (us)':>16} {'context (us)':>13}")
+    for n_sessions in args.sessions:
+        by_id = bench(n_sessions, True, args.number, args.repeat)
+        by_ctx = bench(n_sessions, False, args.number, args.repeat)
+        print(f"{n_sessions:>8} {by_id:>16.2f} {by_ctx:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
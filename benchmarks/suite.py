@@ -0,0 +1,326 @@
+"""
+Benchmark suite of the scenario generation, evaluation and rendering hot paths.
+
+Every case runs for each seat count from 2 to 9. A case is timed as the best of
+several repeats (of enough calls to last 0.2 seconds), and its peak memory is
+measured with tracemalloc in a separate run, since tracing slows the code down.
+Results are compared with a stored baseline, and any case slower or hungrier than
+the baseline by more than a threshold is measured again and, if it still is, it is
+a regression. Only the standard library and the package dependencies are used, so
+the suite runs offline. Baselines depend on the machine, so store one on the box
+that runs the comparison. Run from the repository root with:
+
+    python -m benchmarks.suite --save         # Store the baseline.
+    python -m benchmarks.suite                # Compare with the baseline.
+    python -m benchmarks.suite --filter hand  # Only cases matching a pattern.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+import poker_coach
+from poker_coach import handviz
+
+BASELINE_PATH: str = os.path.join(os.path.dirname(__file__), "baseline.json")
+TIME_THRESHOLD: float = 2.0
+MEMORY_THRESHOLD: float = 1.5
+SEATS = range(2, 10)
+FIELD = (5, 20, 50)
+HERO_HAND = "AsKd"
+
+
+class Case(NamedTuple):
+    """ Benchmark case. The setup runs untimed and returns the function to time. """
+
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+
+
+class Result(NamedTuple):
+    """ Best time (in seconds) and peak traced memory (in bytes) of a case. """
+
+    name: str
+    seconds: float
+    peak: int
+
+
+class Regression(NamedTuple):
+    """ Case measure worse than its baseline by more than the threshold. """
+
+    name: str
+    metric: str
+    baseline: float
+    value: float
+
+    @property
+    def ratio(self) -> float:
+        """ Get how many times the baseline the measure is. """
+        return self.value / self.baseline
+
+
+def villains_range(n_seats: int) -> np.ndarray:
+    """ Get fixed ranges of every villain of a table. """
+    return np.linspace(5, 50, n_seats - 1)
+
+
+def png(fig) -> bytes:
+    """ Render a figure as PNG, as the app does. """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def draw(n_seats: int) -> poker_coach.PushFoldScenario:
+    """ Draw a scenario whose hero acts first, so every villain is after it. """
+    return poker_coach.PushFoldScenario.from_values(
+        n_seats=n_seats,
+        ante=12.5,
+        hero_hand=HERO_HAND,
+        hero_chips=20,
+        hero_position=0,
+        villains_range=villains_range(n_seats),
+        villains_chips=np.full(n_seats - 1, 30),
+        random_state=0,
+    )
+
+
+def table(scene: poker_coach.PushFoldScenario) -> dict:
+    """ Get the table viewer arguments of a scenario. """
+    return dict(
+        n_seats=scene.n_seats,
+        pot=scene.pot,
+        hero_name=scene.hero_position,
+        hero_hand=scene.hero_hand,
+        hero_chips=scene.hero_chips,
+        villains_names=scene.villains_after_position,
+        villains_ranges=scene.villains_after_range,
+        villains_chips=scene.villains_after_chips,
+    )
+
+
+def rerun(n_seats: int) -> bytes:
+    """ Run the open shove path of an app rerun with its default settings. """
+    scene = poker_coach.PushFoldScenario(
+        n_seats=n_seats, field=FIELD, random_state=n_seats
+    )
+    png(handviz.hand(**table(scene)))
+    equities = scene.eval_ranges(
+        scene.hero_hand,
+        scene.villains_after_range,
+        times=10000,
+        random_state=scene.random_state,
+    )
+    scene.evaluate(equities=equities)
+    push_chart = scene.push_chart()
+    return png(
+        handviz.chart(
+            poker_coach.hands.CLASSES, np.nanmin(push_chart.expected_value, axis=-1)
+        )
+    )
+
+
+def eval_ranges(n_seats: int, method: str, times: int = 10000) -> Callable:
+    """ Set up an equity evaluation against every villain of a table. """
+    ranges = villains_range(n_seats)
+    return lambda: poker_coach.Scenario.eval_ranges(
+        HERO_HAND, ranges, times=times, method=method, random_state=0
+    )
+
+
+def cases() -> List[Case]:
+    """ Get every benchmark case. """
+    result = []
+    for n in SEATS:
+        result += [
+            Case(
+                f"scenario[{n}]",
+                lambda n=n: lambda: poker_coach.PushFoldScenario(
+                    n_seats=n, field=FIELD, random_state=0
+                ),
+            ),
+            Case(
+                f"scenario_batch[{n}]",
+                lambda n=n: lambda: poker_coach.ScenarioBatch(
+                    1024, n_seats=n, random_state=0
+                ),
+            ),
+            Case(
+                f"eval_ranges[monte_carlo,1000,{n}]",
+                lambda n=n: eval_ranges(n, "monte_carlo", 1000),
+            ),
+            Case(
+                f"eval_ranges[monte_carlo,10000,{n}]",
+                lambda n=n: eval_ranges(n, "monte_carlo", 10000),
+            ),
+            Case(f"eval_ranges[table,{n}]", lambda n=n: eval_ranges(n, "table")),
+            Case(f"eval_ranges[grid,{n}]", lambda n=n: eval_ranges(n, "grid")),
+            Case(f"eval_ranges[model,{n}]", lambda n=n: eval_ranges(n, "model")),
+            Case(
+                f"hand[{n}]",
+                lambda n=n: lambda: png(handviz.hand(**table(draw(n)))),
+            ),
+            Case(
+                f"hand_svg[{n}]",
+                lambda n=n: lambda: handviz.hand_svg(**table(draw(n))),
+            ),
+            Case(f"rerun[{n}]", lambda n=n: lambda: rerun(n)),
+        ]
+    return result
+
+
+def measure(case: Case, repeat: int = 3) -> Result:
+    """
+    Time a case and measure its peak memory.
+
+    The number of calls of each timed run is set so that a run takes at least 0.2
+    seconds, which also warms up lazy loads and caches before the measures.
+
+    Args:
+        case: Benchmark case.
+        repeat: Number of timed runs.
+
+    Returns:
+        Best time and peak memory.
+    """
+    fn = case.setup()
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return Result(case.name, seconds, peak)
+
+
+def compare(
+    results: List[Result],
+    baseline: Dict[str, Dict[str, float]],
+    time_threshold: float = TIME_THRESHOLD,
+    memory_threshold: float = MEMORY_THRESHOLD,
+) -> List[Regression]:
+    """
+    Find the cases worse than their baseline by more than the thresholds.
+
+    Args:
+        results: Measured results.
+        baseline: Time and peak memory of each case name.
+        time_threshold: Maximum ratio of the time to the baseline time.
+        memory_threshold: Maximum ratio of the peak memory to the baseline one.
+
+    Returns:
+        Regressions. Cases without a baseline are skipped.
+    """
+    regressions = []
+    for result in results:
+        if result.name not in baseline:
+            continue
+        reference = baseline[result.name]
+        checks = (
+            ("seconds", result.seconds, time_threshold),
+            ("peak", result.peak, memory_threshold),
+        )
+        for metric, value, threshold in checks:
+            if value > reference[metric] * threshold:
+                regressions.append(
+                    Regression(result.name, metric, reference[metric], value)
+                )
+    return regressions
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    """ Load the time and peak memory of each case name (empty if missing). """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def save_baseline(results: List[Result], path: str = BASELINE_PATH):
+    """ Store results as the baseline, keeping the cases that did not run. """
+    baseline = load_baseline(path)
+    for result in results:
+        baseline[result.name] = {"seconds": result.seconds, "peak": result.peak}
+    machine = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+    with open(path, "w") as file:
+        json.dump({"machine": machine, "results": baseline}, file, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Run the benchmark suite and compare it with the baseline. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--filter", default="", help="Regular expression of names.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Store as baseline.")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    selected = [case for case in cases() if re.search(args.filter, case.name)]
+
+    print(f"{'case':<36} {'time (ms)':>10} {'peak (kB)':>10} {'vs baseline':>12}")
+    results = []
+    for case in selected:
+        result = measure(case, args.repeat)
+        results.append(result)
+        ratio = ""
+        if case.name in baseline:
+            ratio = f"{result.seconds / baseline[case.name]['seconds']:.2f}x"
+        print(
+            f"{result.name:<36} {result.seconds * 1000:>10.2f} "
+            f"{result.peak / 1024:>10.0f} {ratio:>12}",
+            flush=True,
+        )
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"Baseline stored at {args.baseline}")
+        return 0
+
+    thresholds = (args.time_threshold, args.memory_threshold)
+    regressions = compare(results, baseline, *thresholds)
+    # Confirm the regressions, since a busy machine slows a single measure down.
+    # Time and memory are kept at their best independently over both attempts.
+    retry = {regression.name for regression in regressions}
+    retried = []
+    for case, result in zip(selected, results):
+        if case.name in retry:
+            again = measure(case, args.repeat)
+            retried.append(
+                Result(
+                    case.name,
+                    min(result.seconds, again.seconds),
+                    min(result.peak, again.peak),
+                )
+            )
+    regressions = compare(retried, baseline, *thresholds)
+    for regression in regressions:
+        print(
+            f"Regression: {regression.name} {regression.metric} "
+            f"{regression.ratio:.2f}x the baseline"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
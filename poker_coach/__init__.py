@@ -1,10 +1,27 @@
-from typing import Iterator
-from typing import Sequence, Optional, Tuple
+import importlib
+from concurrent.futures import Executor
+from typing import AsyncIterator, Iterator
+from typing import List, NamedTuple, Sequence, Optional, Tuple, Type
 
 import numpy as np
 
 import bluff
-from bluff.holdem import equity
+
+from . import cards, equity_table, grid, hands, icm, model, nash, range_equity
+from . import ranges, simulation
+from .cache import EquityCache
+
+# Modules with heavy dependencies (pandas), imported on first access.
+_LAZY_MODULES = {"equity": "bluff.holdem.equity"}
+
+
+def __getattr__(name: str):
+    """ Import the modules with heavy dependencies on first access. """
+    if name in _LAZY_MODULES:
+        module = importlib.import_module(_LAZY_MODULES[name])
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def flatten(i: Iterator) -> Iterator:
@@ -16,6 +33,10 @@ def flatten(i: Iterator) -> Iterator:
             yield i
 
 
+# Evaluation methods that simulate hands.
+SIMULATIONS: Tuple[str, ...] = ("monte_carlo", "vectorized")
+
+
 class Scenario:
     """ General training scenario. """
 
@@ -41,6 +62,7 @@ class Scenario:
         """
         self._n_seats = n_seats
         self._ante = ante
+        self._random_state = random_state
         self._deck = bluff.Deck(random_state)
 
         r = np.random.RandomState(random_state)
@@ -61,6 +83,45 @@ class Scenario:
 
         self._villains_chips = r.randint(self.MIN_BB, self.MAX_BB, n_seats - 1)
 
+    @classmethod
+    def from_values(
+        cls,
+        n_seats: int,
+        ante: float,
+        hero_hand: str,
+        hero_chips: int,
+        hero_position: int,
+        villains_range: Sequence[float],
+        villains_chips: Sequence[int],
+        random_state: Optional[int] = None,
+    ) -> "Scenario":
+        """
+        Create a scenario from already drawn values, without drawing anything.
+
+        Args:
+            n_seats: Number of players in the table.
+            ante: Ante size (big blind percentage).
+            hero_hand: Hero hand.
+            hero_chips: Hero chips amount.
+            hero_position: Hero seat (from 0 to n_seats - 2).
+            villains_range: Ranges of the villains.
+            villains_chips: Chips amounts of the villains.
+            random_state: Random state for evaluating the scenario.
+
+        Returns:
+            Scenario.
+        """
+        scene = cls.__new__(cls)
+        scene._n_seats = n_seats
+        scene._ante = ante
+        scene._random_state = random_state
+        scene._hero_chips = hero_chips
+        scene._hero_hand = hero_hand
+        scene._hero_position = hero_position
+        scene._villains_range = villains_range
+        scene._villains_chips = villains_chips
+        return scene
+
     @property
     def n_seats(self) -> int:
         """ Get number of seats on the table. """
@@ -81,6 +142,11 @@ class Scenario:
         """ Get hero hand. """
         return self._hero_hand
 
+    @property
+    def hero_percentage(self) -> float:
+        """ Get hero hand percentage rank. """
+        return hands.percentage(self._hero_hand)
+
     @property
     def hero_index(self) -> int:
         """ Get hero index. """
@@ -106,6 +172,12 @@ class Scenario:
         """ Get ranges from villains after the hero. """
         return np.array(self.villains_range[self._hero_position :])
 
+    @property
+    def villains_after_combos(self) -> List[ranges.Range]:
+        """ Get combos of the villains after the hero, without the hero cards. """
+        hero_hand = self._hero_hand
+        return [ranges.top(rng).without(hero_hand) for rng in self.villains_after_range]
+
     @property
     def villains_before_position(self) -> Sequence[str]:
         """ Get position name from villains before the hero. """
@@ -136,6 +208,11 @@ class Scenario:
         """ Get ranges from villains after the hero. """
         return np.array(self.villains_chips[self._hero_position :])
 
+    @property
+    def random_state(self) -> Optional[int]:
+        """ Get the random state the scenario was generated from. """
+        return self._random_state
+
     @property
     def ante(self) -> float:
         """ Get ante size (big blind percentage)."""
@@ -165,16 +242,207 @@ class Scenario:
 
     @staticmethod
     def eval_ranges(
-        hero_hand: str, villains_range: Sequence[float], times: int = 10000
+        hero_hand: str,
+        villains_range: Sequence[float],
+        times: int = 10000,
+        method: str = "monte_carlo",
+        random_state: Optional[int] = None,
+        target_se: Optional[float] = None,
+        break_even: Optional[Sequence[float]] = None,
+        confidence: float = 0.95,
+        workers: int = 1,
+        cache: Optional[EquityCache] = None,
     ) -> np.ndarray:
-        """ Evaluate chances of hero winning against each villain range. """
+        """
+        Evaluate chances of hero winning against each villain range.
+
+        Args:
+            hero_hand: Hero hand.
+            villains_range: Villain ranges.
+            times: Number of Monte Carlo runs per villain.
+            method: "monte_carlo" to simulate each villain apart, "vectorized" to
+                simulate every villain at once on shared boards, "table" to look
+                up the precomputed equity table, "model" to predict with the
+                equity model or "grid" to interpolate the distilled equity model.
+            random_state: Random state.
+            target_se: Stop simulating once every standard error is at most this
+                value (vectorized method only).
+            break_even: Stop simulating once the decision against these break even
+                equities is settled (vectorized method only).
+            confidence: Decision confidence level.
+            workers: Number of worker processes to split the simulations into.
+            cache: Equity cache for simulations with a fixed number of runs.
+
+        Returns:
+            Equity against each villain.
+        """
+        adaptive = target_se is not None or break_even is not None
+        if cache is not None and method in SIMULATIONS and not adaptive:
+            return Scenario.estimate_ranges(
+                hero_hand,
+                villains_range,
+                times=times,
+                random_state=random_state,
+                workers=workers,
+                cache=cache,
+            ).equity
+        if method == "table":
+            return equity_table.lookup(hero_hand, villains_range)
+        if method == "model":
+            return model.predict_equities(hero_hand, villains_range)
+        if method == "grid":
+            return grid.predict_equities(hero_hand, villains_range)
+        if method == "vectorized":
+            if not adaptive:
+                return simulation.eval_ranges(
+                    hero_hand,
+                    villains_range,
+                    times=times,
+                    random_state=random_state,
+                    workers=workers,
+                )
+            return simulation.estimate_ranges(
+                hero_hand,
+                villains_range,
+                times=times,
+                target_se=target_se,
+                break_even=break_even,
+                confidence=confidence,
+                random_state=random_state,
+                workers=workers,
+            ).equity
+        if method != "monte_carlo":
+            raise ValueError(f"'{method}' is not a valid evaluation method.")
+        seeds = np.random.SeedSequence(random_state).spawn(len(villains_range))
         return np.array(
             [
-                equity.equity([hero_hand, villain], times=times)[0]
-                for villain in villains_range
+                simulation.eval_ranges(
+                    hero_hand,
+                    [villain],
+                    times=times,
+                    random_state=seed,
+                    workers=workers,
+                )[0]
+                for villain, seed in zip(villains_range, seeds)
             ]
         )
 
+    @staticmethod
+    def estimate_ranges(
+        hero_hand: str,
+        villains_range: Sequence[float],
+        times: int = 10000,
+        random_state: Optional[int] = None,
+        target_se: Optional[float] = None,
+        break_even: Optional[Sequence[float]] = None,
+        confidence: float = 0.95,
+        workers: int = 1,
+        cache: Optional[EquityCache] = None,
+    ) -> simulation.Estimate:
+        """
+        Estimate chances of hero winning against each villain range, with their
+        standard errors and the number of runs used.
+
+        Args:
+            hero_hand: Hero hand.
+            villains_range: Villain ranges.
+            times: Maximum number of Monte Carlo runs.
+            random_state: Random state.
+            target_se: Stop simulating once every standard error is at most this
+                value.
+            break_even: Stop simulating once the decision against these break even
+                equities is settled.
+            confidence: Decision confidence level.
+            workers: Number of worker processes to split the simulations into.
+            cache: Equity cache for simulations with a fixed number of runs.
+
+        Returns:
+            Equity estimate.
+        """
+
+        def evaluate(ranges: Sequence[float]) -> simulation.Estimate:
+            return simulation.estimate_ranges(
+                hero_hand,
+                ranges,
+                times=times,
+                target_se=target_se,
+                break_even=break_even,
+                confidence=confidence,
+                random_state=random_state,
+                workers=workers,
+            )
+
+        if cache is not None and target_se is None and break_even is None:
+            return cache.estimate(hero_hand, villains_range, times, evaluate)
+        return evaluate(villains_range)
+
+    @staticmethod
+    async def eval_ranges_async(
+        hero_hand: str,
+        villains_range: Sequence[float],
+        times: int = 10000,
+        chunk_size: int = simulation.ADAPTIVE_CHUNK_SIZE,
+        random_state: Optional[int] = None,
+        target_se: Optional[float] = None,
+        break_even: Optional[Sequence[float]] = None,
+        confidence: float = 0.95,
+        workers: int = 1,
+        executor: Optional[Executor] = None,
+    ) -> AsyncIterator[simulation.Estimate]:
+        """
+        Estimate chances of hero winning against each villain range, yielding the
+        estimate after each chunk of runs. Chunks run in an executor and
+        cancelling the consumer stops the simulation.
+
+        Args:
+            hero_hand: Hero hand.
+            villains_range: Villain ranges.
+            times: Maximum number of Monte Carlo runs.
+            chunk_size: Number of Monte Carlo runs per chunk.
+            random_state: Random state.
+            target_se: Stop simulating once every standard error is at most this
+                value.
+            break_even: Stop simulating once the decision against these break even
+                equities is settled.
+            confidence: Decision confidence level.
+            workers: Number of worker processes to split the simulations into.
+            executor: Executor running the chunks (the event loop default if None).
+
+        Yields:
+            Equity estimate.
+        """
+        estimates = simulation.aiter_estimates(
+            hero_hand,
+            villains_range,
+            times=times,
+            chunk_size=chunk_size,
+            target_se=target_se,
+            break_even=break_even,
+            confidence=confidence,
+            random_state=random_state,
+            workers=workers,
+            executor=executor,
+        )
+        async for estimate in estimates:
+            yield estimate
+
+    @staticmethod
+    def break_even(win_action, lose_action, no_action):
+        """
+        Chances of winning where taking and avoiding the action are worth the same.
+
+        Args:
+            win_action: Return value when winning the action.
+            lose_action: Return value when losing the action.
+            no_action: Return value when avoiding the action.
+
+        Returns:
+            Break even chances.
+        """
+        return np.divide(
+            np.subtract(no_action, lose_action), np.subtract(win_action, lose_action)
+        )
+
     @staticmethod
     def expected_value(chances, success, failure):
         """
@@ -231,3 +499,555 @@ class PushFoldScenario(Scenario):
         super().__init__(
             n_seats=n_seats, field=field, ante=ante, random_state=random_state,
         )
+
+    @property
+    def win_value(self) -> np.ndarray:
+        """ Get return value when winning the showdown against each villain after. """
+        return self.pot + np.minimum(self.villains_after_chips, self.hero_chips)
+
+    @property
+    def lose_value(self) -> np.ndarray:
+        """ Get return value when losing the showdown against each villain after. """
+        return -np.minimum(self.villains_after_chips, self.hero_chips)
+
+    @property
+    def fold_equity(self) -> np.ndarray:
+        """ Get value of each villain after folding to the push. """
+        return self.pot * (1 - self.villains_after_range / 100)
+
+    @classmethod
+    def evaluate_batch(
+        cls, pot, hero_chips, villains_chips, villains_range, equities
+    ) -> "PushFoldResult":
+        """
+        Evaluate pushing in many scenarios at once.
+
+        Scenarios are given as arrays with a row for each scenario and a column for
+        each villain after the hero. Scenarios with fewer villains are padded with
+        NaN, which is ignored by the decision.
+
+        Args:
+            pot: Pot of each scenario.
+            hero_chips: Hero chips of each scenario.
+            villains_chips: Chips of each villain after the hero.
+            villains_range: Range of each villain after the hero.
+            equities: Hero equity against each villain after the hero.
+
+        Returns:
+            Push fold evaluation, with a decision for each scenario.
+        """
+        pot = np.expand_dims(pot, -1)
+        hero_chips = np.expand_dims(hero_chips, -1)
+        equities = np.asarray(equities, dtype=float)
+
+        win_value = pot + np.minimum(villains_chips, hero_chips)
+        lose_value = -np.minimum(villains_chips, hero_chips)
+        return cls._result(equities, win_value, lose_value, pot, villains_range)
+
+    @classmethod
+    def _result(
+        cls, equities, win_value, lose_value, steal_value, villains_range
+    ) -> "PushFoldResult":
+        """ Combine showdown and fold values into the push fold evaluation. """
+        fold_equity = steal_value * (1 - np.divide(villains_range, 100))
+        showdown_value = cls.expected_value(equities, win_value, lose_value)
+        expected_values = showdown_value + fold_equity
+        push = np.all((expected_values > 0) | np.isnan(expected_values), axis=-1)
+        return PushFoldResult(
+            equities, showdown_value, fold_equity, expected_values, push
+        )
+
+    def evaluate(
+        self,
+        equities: Optional[Sequence[float]] = None,
+        method: str = "monte_carlo",
+        times: int = 10000,
+        workers: int = 1,
+        cache: Optional[EquityCache] = None,
+        payout: Optional[Sequence[float]] = None,
+    ) -> "PushFoldResult":
+        """
+        Evaluate pushing against the villains after the hero.
+
+        Args:
+            equities: Hero equity against each villain after the hero (evaluated
+                with the given method if not provided).
+            method: Evaluation method (see Scenario.eval_ranges).
+            times: Number of Monte Carlo runs per villain.
+            workers: Number of worker processes to split the simulations into.
+            cache: Equity cache for simulations with a fixed number of runs.
+            payout: Prize of each tournament place. If provided, values are
+                tournament payouts (Independent Chip Model) instead of chips.
+
+        Returns:
+            Push fold evaluation.
+        """
+        if equities is None:
+            equities = self.eval_ranges(
+                self.hero_hand,
+                self.villains_after_range,
+                times=times,
+                method=method,
+                random_state=self.random_state,
+                workers=workers,
+                cache=cache,
+            )
+        result = self._evaluate(np.asarray(equities, dtype=float), payout)
+        return result._replace(push=bool(result.push))
+
+    async def evaluate_async(
+        self,
+        times: int = 10000,
+        chunk_size: int = simulation.ADAPTIVE_CHUNK_SIZE,
+        target_se: Optional[float] = None,
+        settle: bool = False,
+        workers: int = 1,
+        payout: Optional[Sequence[float]] = None,
+        executor: Optional[Executor] = None,
+    ) -> AsyncIterator["PushFoldProgress"]:
+        """
+        Evaluate pushing with Monte Carlo simulations, yielding the evaluation
+        after each chunk of runs.
+
+        Args:
+            times: Maximum number of Monte Carlo runs.
+            chunk_size: Number of Monte Carlo runs per chunk.
+            target_se: Stop simulating once every standard error is at most this
+                value.
+            settle: Stop simulating once the push decision is settled.
+            workers: Number of worker processes to split the simulations into.
+            payout: Prize of each tournament place (see PushFoldScenario.evaluate).
+            executor: Executor running the chunks (the event loop default if None).
+
+        Yields:
+            Equity estimate and push fold evaluation.
+        """
+        break_even = self.push_break_even(payout=payout) if settle else None
+        estimates = self.eval_ranges_async(
+            self.hero_hand,
+            self.villains_after_range,
+            times=times,
+            chunk_size=chunk_size,
+            random_state=self.random_state,
+            target_se=target_se,
+            break_even=break_even,
+            workers=workers,
+            executor=executor,
+        )
+        async for estimate in estimates:
+            result = self.evaluate(equities=estimate.equity, payout=payout)
+            yield PushFoldProgress(estimate, result)
+
+    def _values(
+        self, payout: Optional[Sequence[float]]
+    ) -> Tuple[np.ndarray, np.ndarray, float]:
+        """ Get the win, lose and steal values against each villain after. """
+        if payout is None:
+            return self.win_value, self.lose_value, self.pot
+        return icm.push_values(
+            self.hero_chips,
+            self.villains_chips,
+            self.pot,
+            payout,
+            callers=range(self._hero_position, len(self.villains_chips)),
+        )
+
+    def _evaluate(
+        self, equities: np.ndarray, payout: Optional[Sequence[float]]
+    ) -> "PushFoldResult":
+        """ Evaluate pushing with the given equities against the villains after. """
+        win_value, lose_value, steal_value = self._values(payout)
+        return self._result(
+            equities, win_value, lose_value, steal_value, self.villains_after_range
+        )
+
+    def push_break_even(self, payout: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        Get the equity against each villain after where pushing breaks even.
+
+        The values are the ones of the evaluation (see PushFoldScenario.evaluate),
+        so stopping a simulation once the decision is settled agrees with it.
+
+        Args:
+            payout: Prize of each tournament place (see PushFoldScenario.evaluate).
+
+        Returns:
+            Break even equity against each villain after the hero.
+        """
+        win_value, lose_value, steal_value = self._values(payout)
+        fold_equity = steal_value * (1 - self.villains_after_range / 100)
+        return self.break_even(
+            win_action=win_value + fold_equity,
+            lose_action=lose_value + fold_equity,
+            no_action=0,
+        )
+
+    def push_chart(self, payout: Optional[Sequence[float]] = None) -> "PushFoldResult":
+        """
+        Evaluate pushing every hand class from the hero seat in a single pass.
+
+        Equities come from the precomputed equity table.
+
+        Args:
+            payout: Prize of each tournament place (see PushFoldScenario.evaluate).
+
+        Returns:
+            Push fold evaluation with a row for each hand class (in the order of
+            poker_coach.hands.CLASSES) and a column for each villain after the hero.
+        """
+        equities = equity_table.lookup_classes(self.villains_after_range)
+        return self._evaluate(equities, payout)
+
+    @property
+    def effective_stack(self) -> int:
+        """ Get the most chips the hero can win or lose against a single caller. """
+        return int(min(self.hero_chips, max(self.villains_after_chips)))
+
+    def nash_push(self, iterations: int = nash.ITERATIONS) -> bool:
+        """
+        Check if the hero pushes in the Nash equilibrium at the effective stack.
+
+        Args:
+            iterations: Number of fictitious play iterations of the equilibrium.
+
+        Returns:
+            True if the hero hand is pushed at least half of the time.
+        """
+        solution = nash.equilibrium(
+            self.n_seats, self.effective_stack, self.ante, iterations
+        )
+        frequencies = solution.push[self._hero_position]
+        return bool(frequencies[hands.class_index(self.hero_hand)] >= 0.5)
+
+
+class PushFoldResult(NamedTuple):
+    """ Push fold evaluation against each villain after the hero. """
+
+    equity: np.ndarray
+    showdown_value: np.ndarray
+    fold_equity: np.ndarray
+    expected_value: np.ndarray
+    push: bool
+
+
+class CallShoveScenario(Scenario):
+    """ Call shove training scenario, where a villain before the hero pushed. """
+
+    MIN_ACTION: float = 3
+    MAX_ACTION: float = 100
+
+    def __init__(
+        self,
+        n_seats: int = 9,
+        field: Tuple[float, float, float] = (5, 20, 50),
+        ante: float = 12.5,
+        random_state: Optional[int] = None,
+    ):
+        """
+        Args:
+            n_seats: Number of players in the table.
+            field: Tuple with min, mode and max field push ranges.
+            ante: Ante size (big blind percentage).
+            random_state: Random state.
+        """
+        super().__init__(
+            n_seats=n_seats, field=field, ante=ante, random_state=random_state,
+        )
+        # The hero needs a villain before it, so it may be in the big blind.
+        r = np.random.default_rng(random_state)
+        self._hero_position = r.integers(1, n_seats)
+        self._shover = r.integers(0, self._hero_position)
+
+    @property
+    def hero_blind(self) -> float:
+        """ Get the blind posted by the hero (in big blinds). """
+        return float(nash.blinds(self.n_seats)[self._hero_position])
+
+    @property
+    def shover_position(self) -> str:
+        """ Get position name of the villain that pushed. """
+        return self.position_to_abbreviation(self._shover - self.n_seats, self.n_seats)
+
+    @property
+    def shover_range(self) -> float:
+        """ Get push range of the villain that pushed. """
+        return float(self.villains_range[self._shover])
+
+    @property
+    def shover_chips(self) -> int:
+        """ Get chips of the villain that pushed. """
+        return int(self.villains_chips[self._shover])
+
+    @property
+    def win_value(self) -> float:
+        """ Get return value when winning the showdown. """
+        return self.pot + min(self.shover_chips, self.hero_chips)
+
+    @property
+    def lose_value(self) -> float:
+        """ Get return value when losing the showdown. """
+        return self.hero_blind - min(self.shover_chips, self.hero_chips)
+
+    def _values(self, payout: Optional[Sequence[float]]) -> Tuple[float, float]:
+        """ Get the win and lose values of calling. """
+        if payout is None:
+            return self.win_value, self.lose_value
+        return icm.call_values(
+            self.hero_chips,
+            self.villains_chips,
+            self.pot,
+            payout,
+            shover=self._shover,
+            blind=self.hero_blind,
+        )
+
+    def evaluate(self, payout: Optional[Sequence[float]] = None) -> "CallShoveResult":
+        """
+        Evaluate calling the push against the villain push range.
+
+        The hero equity comes from the range versus range equities, with the hero
+        cards removed from the villain range. Players after the hero fold.
+
+        Args:
+            payout: Prize of each tournament place. If provided, values are
+                tournament payouts (Independent Chip Model) instead of chips.
+
+        Returns:
+            Call shove evaluation.
+        """
+        villain = ranges.top(self.shover_range).without(self.hero_hand)
+        chances = range_equity.equity(self.hero_hand, villain.weights)
+        win_value, lose_value = self._values(payout)
+        call_ev, fold_ev = self.strategies_expected_value(
+            chances, win_value, lose_value, 0
+        )
+        return CallShoveResult(
+            equity=chances,
+            break_even=float(self.break_even(win_value, lose_value, 0)),
+            expected_value=float(call_ev),
+            call=bool(call_ev > fold_ev),
+        )
+
+    def nash_call(self, iterations: int = nash.ITERATIONS) -> bool:
+        """
+        Check if the hero calls in the Nash equilibrium at the effective stack.
+
+        Args:
+            iterations: Number of fictitious play iterations of the equilibrium.
+
+        Returns:
+            True if the hero hand calls the push at least half of the time.
+        """
+        stack = min(self.hero_chips, self.shover_chips)
+        solution = nash.equilibrium(self.n_seats, stack, self.ante, iterations)
+        frequencies = solution.call[self._shover, self._hero_position]
+        return bool(frequencies[hands.class_index(self.hero_hand)] >= 0.5)
+
+
+class CallShoveResult(NamedTuple):
+    """ Call shove evaluation. """
+
+    equity: float
+    break_even: float
+    expected_value: float
+    call: bool
+
+
+class PushFoldProgress(NamedTuple):
+    """ Push fold evaluation from the Monte Carlo runs simulated so far. """
+
+    estimate: simulation.Estimate
+    result: PushFoldResult
+
+
+class ScenarioBatch:
+    """
+    Many training scenarios drawn at once.
+
+    Scenarios are drawn in blocks of BLOCK_SIZE rows, each block from its own random
+    generator spawned from the random state. A row therefore only depends on the
+    random state and its index, whatever the batch size.
+    """
+
+    BLOCK_SIZE: int = 1024
+
+    def __init__(
+        self,
+        n: int,
+        n_seats: int = 9,
+        field: Tuple[float, float, float] = (5, 20, 50),
+        ante: float = 12.5,
+        random_state: Optional[int] = None,
+        scenario: Type[Scenario] = Scenario,
+        start: int = 0,
+    ):
+        """
+        Args:
+            n: Number of scenarios.
+            n_seats: Number of players in the table.
+            field: Tuple with min, mode and max field action.
+            ante: Ante size (big blind percentage).
+            random_state: Random state.
+            scenario: Scenario class of the rows, Scenario or PushFoldScenario
+                (call shove scenarios draw a shover, which rows do not have).
+            start: Index of the first row, so that a large batch can be drawn in
+                parts.
+        """
+        if scenario not in (Scenario, PushFoldScenario):
+            raise ValueError(
+                f"Batches of {scenario.__name__} are not supported. "
+                "Choose Scenario or PushFoldScenario."
+            )
+        self._n_seats = n_seats
+        self._ante = ante
+        self._scenario = scenario
+        self._seed = np.random.SeedSequence(random_state)
+        self._start = start
+
+        first = start // self.BLOCK_SIZE
+        stop = max(first + 1, -(-(start + n) // self.BLOCK_SIZE))
+        blocks = [self._draw_block(block, field) for block in range(first, stop)]
+        offset = start - first * self.BLOCK_SIZE
+        (
+            self._hero_cards,
+            self._hero_chips,
+            self._hero_positions,
+            self._villains_range,
+            self._villains_chips,
+            self._random_states,
+        ) = [np.concatenate(values)[offset : offset + n] for values in zip(*blocks)]
+        self._hero_hands = np.array(
+            [cards.decode(pair) for pair in self._hero_cards], dtype=object
+        )
+
+    def _draw_block(self, block: int, field: Tuple[float, float, float]):
+        """ Draw every row of a block. """
+        seed = np.random.SeedSequence(
+            self._seed.entropy, spawn_key=self._seed.spawn_key + (block,)
+        )
+        r = np.random.default_rng(seed)
+        size = self.BLOCK_SIZE
+        n_villains = self._n_seats - 1
+        scenario = self._scenario
+
+        # Draw two distinct cards by skipping the first one on the second draw.
+        first = r.integers(0, len(cards.DECK), size)
+        second = r.integers(0, len(cards.DECK) - 1, size)
+        second += second >= first
+        hero_cards = np.column_stack([first, second])
+
+        hero_chips = r.integers(scenario.MIN_BB, scenario.MAX_BB, size)
+        hero_positions = r.integers(0, n_villains, size)
+        villains_range = np.clip(
+            r.triangular(field[0], field[1], field[2], (size, n_villains)),
+            scenario.MIN_ACTION,
+            scenario.MAX_ACTION,
+        )
+        villains_chips = r.integers(
+            scenario.MIN_BB, scenario.MAX_BB, (size, n_villains)
+        )
+        random_states = r.integers(0, 2 ** 32, size)
+        return (
+            hero_cards,
+            hero_chips,
+            hero_positions,
+            villains_range,
+            villains_chips,
+            random_states,
+        )
+
+    def __len__(self):
+        return len(self._hero_hands)
+
+    def __getitem__(self, index: int) -> Scenario:
+        """ Get a scenario view of a row. """
+        index = range(len(self))[index]
+        return self._scenario.from_values(
+            n_seats=self._n_seats,
+            ante=self._ante,
+            hero_hand=self._hero_hands[index],
+            hero_chips=int(self._hero_chips[index]),
+            hero_position=int(self._hero_positions[index]),
+            villains_range=self._villains_range[index],
+            villains_chips=self._villains_chips[index],
+            random_state=int(self._random_states[index]),
+        )
+
+    def __iter__(self) -> Iterator[Scenario]:
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def n_seats(self) -> int:
+        """ Get number of seats on the table. """
+        return self._n_seats
+
+    @property
+    def ante(self) -> float:
+        """ Get ante size (big blind percentage)."""
+        return self._ante
+
+    @property
+    def start(self) -> int:
+        """ Get the index of the first row. """
+        return self._start
+
+    @property
+    def pot(self) -> np.ndarray:
+        """ Get pot size (in big blinds) of each scenario. """
+        return np.full(len(self), 1.5 + self.n_seats * self.ante / 100)
+
+    @property
+    def hero_hands(self) -> np.ndarray:
+        """ Get hero hand of each scenario. """
+        return np.array(self._hero_hands)
+
+    @property
+    def hero_classes(self) -> np.ndarray:
+        """ Get hero hand class index of each scenario. """
+        return hands.class_indexes(self._hero_cards)
+
+    @property
+    def hero_percentages(self) -> np.ndarray:
+        """ Get hero hand percentage rank of each scenario. """
+        return hands.percentages(self._hero_cards)
+
+    @property
+    def hero_chips(self) -> np.ndarray:
+        """ Get hero chips amount of each scenario. """
+        return np.array(self._hero_chips)
+
+    @property
+    def hero_positions(self) -> np.ndarray:
+        """ Get hero seat of each scenario. """
+        return np.array(self._hero_positions)
+
+    @property
+    def villains_range(self) -> np.ndarray:
+        """ Get villain ranges with a row for each scenario. """
+        return np.array(self._villains_range)
+
+    @property
+    def villains_chips(self) -> np.ndarray:
+        """ Get villain chips amounts with a row for each scenario. """
+        return np.array(self._villains_chips)
+
+    @property
+    def random_states(self) -> np.ndarray:
+        """ Get the random state for evaluating each scenario. """
+        return np.array(self._random_states)
+
+    def after(self, values: np.ndarray) -> np.ndarray:
+        """
+        Align values of the villains after the hero to the left, padded with NaN.
+
+        Args:
+            values: Array with a row for each scenario and a column for each villain.
+
+        Returns:
+            Array with the values of the villains after the hero first.
+        """
+        values = np.asarray(values, dtype=float)
+        columns = self._hero_positions[:, None] + np.arange(values.shape[-1])
+        valid = columns < values.shape[-1]
+        aligned = np.take_along_axis(values, np.where(valid, columns, 0), axis=-1)
+        return np.where(valid, aligned, np.nan)
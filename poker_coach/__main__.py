@@ -0,0 +1,6 @@
+""" Batch evaluation command line (see poker_coach.batch). """
+
+from .batch import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+Headless batch evaluation.
+
+Push fold scenarios are drawn with poker_coach.ScenarioBatch, evaluated and streamed
+as one row per scenario to a JSON lines file or to a directory of Parquet files.
+Rows are evaluated in chunks by a pool of worker processes and written in order a
+chunk at a time, so memory stays bounded whatever the number of rows. A row only
+depends on the seed and its index, so disjoint index ranges may run separately and
+an interrupted run resumes after the rows already written. The settings are recorded
+with the output (as the first line of a JSON lines file, or in a file of the Parquet
+directory) and resuming with other settings is refused.
+
+Run with:
+
+    python -m poker_coach --rows 1000000 --output scenarios.jsonl
+"""
+
+import argparse
+import collections
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import poker_coach
+from . import hands
+
+FORMATS: Tuple[str, ...] = ("jsonl", "parquet")
+METHODS: Tuple[str, ...] = poker_coach.SIMULATIONS + ("table", "grid", "model")
+CHUNK_SIZE: int = poker_coach.ScenarioBatch.BLOCK_SIZE
+CONFIG_NAME: str = "_config.json"
+
+Row = Dict[str, Any]
+
+
+class Config(NamedTuple):
+    """ Scenario generation and evaluation settings. """
+
+    n_seats: int = 9
+    field: Tuple[float, float, float] = (5, 20, 50)
+    ante: float = 12.5
+    method: str = "table"
+    times: int = 10000
+    seed: int = 0
+
+
+def dump_config(config: Config) -> str:
+    """ Get the JSON line recording the settings of an output. """
+    return json.dumps({"config": config._asdict()}) + "\n"
+
+
+def load_config(line: str) -> Config:
+    """ Read the settings recorded in a JSON line (see dump_config). """
+    try:
+        values = json.loads(line)["config"]
+        return Config(**{**values, "field": tuple(values["field"])})
+    except (ValueError, TypeError, KeyError) as err:
+        raise ValueError("The output does not record its settings.") from err
+
+
+def check_config(output: str, recorded: Config, config: Config):
+    """ Refuse to resume an output written with other settings. """
+    if recorded != config:
+        raise ValueError(
+            f"{output} was written with {recorded}. "
+            f"Use another output to evaluate with {config}."
+        )
+
+
+def evaluate_rows(config: Config, start: int, n: int) -> List[Row]:
+    """
+    Draw and evaluate scenarios.
+
+    Args:
+        config: Scenario settings.
+        start: Index of the first scenario.
+        n: Number of scenarios.
+
+    Returns:
+        Row of each scenario.
+    """
+    batch = poker_coach.ScenarioBatch(
+        n,
+        n_seats=config.n_seats,
+        field=config.field,
+        ante=config.ante,
+        random_state=config.seed,
+        scenario=poker_coach.PushFoldScenario,
+        start=start,
+    )
+    equities = np.full(batch.villains_range.shape, np.nan)
+    for i, scene in enumerate(batch):
+        villains_range = scene.villains_after_range
+        equities[i, : len(villains_range)] = scene.eval_ranges(
+            scene.hero_hand,
+            villains_range,
+            times=config.times,
+            method=config.method,
+            random_state=scene.random_state,
+        )
+    result = poker_coach.PushFoldScenario.evaluate_batch(
+        pot=batch.pot,
+        hero_chips=batch.hero_chips,
+        villains_chips=batch.after(batch.villains_chips),
+        villains_range=batch.after(batch.villains_range),
+        equities=equities,
+    )
+
+    rows = []
+    n_villains = batch.n_seats - 1 - batch.hero_positions
+    for i, hand in enumerate(batch.hero_hands):
+        after = slice(0, int(n_villains[i]))
+        rows.append(
+            {
+                "index": start + i,
+                "n_seats": batch.n_seats,
+                "ante": batch.ante,
+                "pot": float(batch.pot[i]),
+                "hero_hand": hand,
+                "hero_class": hands.CLASSES[batch.hero_classes[i]],
+                "hero_percentage": float(batch.hero_percentages[i]),
+                "hero_chips": int(batch.hero_chips[i]),
+                "hero_position": int(batch.hero_positions[i]),
+                "villains_range": batch.villains_range[i].tolist(),
+                "villains_chips": batch.villains_chips[i].tolist(),
+                "equity": result.equity[i, after].tolist(),
+                "fold_equity": result.fold_equity[i, after].tolist(),
+                "expected_value": result.expected_value[i, after].tolist(),
+                "push": bool(result.push[i]),
+            }
+        )
+    return rows
+
+
+def chunks(start: int, stop: int, chunk_size: int = CHUNK_SIZE) -> List[range]:
+    """ Split an index range into chunks aligned to multiples of the chunk size. """
+    bounds = [start, *range(chunk_size * (start // chunk_size + 1), stop, chunk_size)]
+    return [range(lo, hi) for lo, hi in zip(bounds, [*bounds[1:], stop]) if lo < hi]
+
+
+def evaluate_chunks(
+    config: Config,
+    pending: List[range],
+    executor: Optional[Executor] = None,
+    window: int = 2,
+) -> Iterator[Tuple[range, List[Row]]]:
+    """
+    Evaluate chunks of scenarios, keeping a bounded number of them in flight.
+
+    Args:
+        config: Scenario settings.
+        pending: Index range of each chunk.
+        executor: Executor evaluating the chunks (evaluated here if None).
+        window: Maximum number of chunks submitted and not yet yielded.
+
+    Yields:
+        Index range and rows of each chunk, in order.
+    """
+    if executor is None:
+        for indexes in pending:
+            yield indexes, evaluate_rows(config, indexes.start, len(indexes))
+        return
+
+    futures = collections.deque()
+    try:
+        for indexes in pending:
+            future = executor.submit(
+                evaluate_rows, config, indexes.start, len(indexes)
+            )
+            futures.append((indexes, future))
+            if len(futures) >= window:
+                done, future = futures.popleft()
+                yield done, future.result()
+        while futures:
+            done, future = futures.popleft()
+            yield done, future.result()
+    finally:
+        # Closing the generator early cancels the chunks not started yet.
+        for _, future in futures:
+            future.cancel()
+
+
+def resume_jsonl(path: str) -> Optional[int]:
+    """
+    Get the index of the last row of a JSON lines file.
+
+    A partially written last line (from an interrupted run) is removed. The first
+    line records the settings and is not a row.
+
+    Args:
+        path: File path.
+
+    Returns:
+        Index of the last row, or None if there are no rows.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb+") as file:
+        size = file.seek(0, os.SEEK_END)
+        end = size
+        tail = b""
+        # Read blocks backwards until the tail holds the whole last complete line.
+        while end > 0 and tail.count(b"\n") < 2:
+            begin = max(0, end - 2 ** 16)
+            file.seek(begin)
+            tail = file.read(end - begin) + tail
+            end = begin
+        complete, _, partial = tail.rpartition(b"\n")
+        if partial:
+            file.truncate(size - len(partial))
+    last = complete.rsplit(b"\n", 1)[-1]
+    if not last:
+        return None
+    row = json.loads(last)
+    return int(row["index"]) if "index" in row else None
+
+
+def part_path(path: str, indexes: range) -> str:
+    """ Get the Parquet file path of a chunk in an output directory. """
+    return os.path.join(path, f"part-{indexes.start:012d}-{indexes.stop:012d}.parquet")
+
+
+def write_parquet(path: str, rows: List[Row]):
+    """ Write rows to a Parquet file atomically. """
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError as err:
+        raise ImportError("Parquet output requires pyarrow") from err
+
+    temp = f"{path}.{os.getpid()}.tmp"
+    pyarrow.parquet.write_table(pyarrow.Table.from_pylist(rows), temp)
+    os.replace(temp, path)
+
+
+def run(
+    output: str,
+    rows: int,
+    config: Config = Config(),
+    start: int = 0,
+    fmt: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+    workers: int = 1,
+) -> int:
+    """
+    Evaluate scenarios and stream their rows, skipping the rows already written.
+
+    Raises ValueError if the output was written with other settings.
+
+    Args:
+        output: JSON lines file or Parquet directory path.
+        rows: Number of scenarios.
+        config: Scenario settings.
+        start: Index of the first scenario.
+        fmt: Output format (inferred from the output extension if None).
+        chunk_size: Number of scenarios evaluated and written at once.
+        workers: Number of worker processes.
+
+    Returns:
+        Number of rows written.
+    """
+    if fmt is None:
+        fmt = "parquet" if output.endswith(".parquet") else "jsonl"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt}. Choose one of {FORMATS}.")
+
+    stop = start + rows
+    if fmt == "jsonl":
+        if os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        if os.path.exists(output) and os.path.getsize(output):
+            # Check the settings before resuming, which truncates a partial line.
+            with open(output, "rb") as file:
+                check_config(output, load_config(file.readline()), config)
+        else:
+            with open(output, "w") as file:
+                file.write(dump_config(config))
+        last = resume_jsonl(output)
+        begin = start if last is None else max(start, last + 1)
+        pending = chunks(begin, stop, chunk_size)
+    else:
+        os.makedirs(output, exist_ok=True)
+        config_path = os.path.join(output, CONFIG_NAME)
+        if os.path.exists(config_path):
+            with open(config_path) as file:
+                check_config(output, load_config(file.read()), config)
+        else:
+            with open(config_path, "w") as file:
+                file.write(dump_config(config))
+        pending = [
+            indexes
+            for indexes in chunks(start, stop, chunk_size)
+            if not os.path.exists(part_path(output, indexes))
+        ]
+
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    evaluated = evaluate_chunks(config, pending, executor, window=2 * workers)
+    written = 0
+    try:
+        for indexes, chunk in evaluated:
+            if fmt == "jsonl":
+                with open(output, "a") as file:
+                    file.writelines(json.dumps(row) + "\n" for row in chunk)
+            else:
+                write_parquet(part_path(output, indexes), chunk)
+            written += len(chunk)
+    finally:
+        # Cancel the chunks not started yet before waiting for the running ones.
+        evaluated.close()
+        if executor is not None:
+            executor.shutdown()
+    return written
+
+
+def main():
+    """ Evaluate push fold scenarios and stream them to JSON lines or Parquet. """
+    defaults = Config()
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--format", choices=FORMATS, default=None)
+    parser.add_argument("--seats", type=int, default=defaults.n_seats)
+    parser.add_argument("--field", type=float, nargs=3, default=defaults.field)
+    parser.add_argument("--ante", type=float, default=defaults.ante)
+    parser.add_argument("--method", choices=METHODS, default=defaults.method)
+    parser.add_argument("--times", type=int, default=defaults.times)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    config = Config(
+        n_seats=args.seats,
+        field=tuple(args.field),
+        ante=args.ante,
+        method=args.method,
+        times=args.times,
+        seed=args.seed,
+    )
+    try:
+        written = run(
+            args.output,
+            args.rows,
+            config=config,
+            start=args.start,
+            fmt=args.format,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+        )
+    except ValueError as err:
+        parser.error(str(err))
+    print(f"{written} rows written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Persistent equity cache.
+
+Simulated equities are stored in a SQLite database, so they survive restarts and
+are shared by every session of the process and by other processes on the same box.
+Entries are keyed on canonical inputs: the hero hand class (ranges are the same for
+every suit, so suits do not matter), the number of hand classes in the villain
+range and the number of Monte Carlo runs. The least recently used entries are
+evicted when the cache grows beyond its size cap.
+"""
+
+import functools
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from . import hands, simulation
+
+DEFAULT_PATH: str = os.path.join(
+    os.path.expanduser("~"), ".cache", "poker_coach", "equities.sqlite"
+)
+DEFAULT_MAX_ENTRIES: int = 100000
+
+Key = Tuple[int, int, int]
+
+
+class CacheStats(NamedTuple):
+    """ Equity cache statistics. """
+
+    hits: int
+    misses: int
+    entries: int
+
+
+class EquityCache:
+    """ Persistent hero hand against villain range equity cache. """
+
+    def __init__(
+        self, path: str = DEFAULT_PATH, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Args:
+            path: SQLite database file path.
+            max_entries: Maximum number of entries kept.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._path = path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            # Write ahead log lets other processes read while this one writes.
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS equities ("
+                "hero INTEGER, villain INTEGER, times INTEGER, "
+                "equity REAL, stderr REAL, accessed REAL, "
+                "PRIMARY KEY (hero, villain, times))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS equities_accessed ON equities (accessed)"
+            )
+
+    @property
+    def path(self) -> str:
+        """ Get the database file path. """
+        return self._path
+
+    @property
+    def max_entries(self) -> int:
+        """ Get the maximum number of entries kept. """
+        return self._max_entries
+
+    @property
+    def hits(self) -> int:
+        """ Get the number of equities found in the cache. """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """ Get the number of equities missing from the cache. """
+        return self._misses
+
+    def __len__(self):
+        with self._lock:
+            query = self._connection.execute("SELECT COUNT(*) FROM equities")
+            return query.fetchone()[0]
+
+    def stats(self) -> CacheStats:
+        """ Get cache statistics. """
+        return CacheStats(self.hits, self.misses, len(self))
+
+    @staticmethod
+    def key(hero_hand: str, villain_range: float, times: int) -> Key:
+        """
+        Get the canonical key of a hero hand against a villain range.
+
+        Args:
+            hero_hand: Hero hand.
+            villain_range: Villain range.
+            times: Number of Monte Carlo runs.
+
+        Returns:
+            Tuple with the hero class index, the number of classes in the villain
+            range and the number of runs.
+        """
+        n_classes = hands.top_classes(villain_range)
+        return hands.class_index(hero_hand), n_classes, int(times)
+
+    def get(self, keys: Sequence[Key]) -> Dict[Key, Tuple[float, float]]:
+        """
+        Get cached equities and refresh their last access.
+
+        Args:
+            keys: Canonical keys.
+
+        Returns:
+            Dictionary with the equity and standard error of every cached key.
+        """
+        found = {}
+        with self._lock, self._connection:
+            for key in set(keys):
+                row = self._connection.execute(
+                    "SELECT equity, stderr FROM equities "
+                    "WHERE hero = ? AND villain = ? AND times = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    found[key] = row
+            self._connection.executemany(
+                "UPDATE equities SET accessed = ? "
+                "WHERE hero = ? AND villain = ? AND times = ?",
+                [(time.time(), *key) for key in found],
+            )
+            self._hits += sum(key in found for key in keys)
+            self._misses += sum(key not in found for key in keys)
+        return found
+
+    def set(self, values: Dict[Key, Tuple[float, float]]):
+        """
+        Store equities, evicting the least recently used ones beyond the size cap.
+
+        Args:
+            values: Dictionary with the equity and standard error of each key.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO equities VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (*key, float(equity), float(stderr), time.time())
+                    for key, (equity, stderr) in values.items()
+                ],
+            )
+            self._connection.execute(
+                "DELETE FROM equities WHERE rowid IN ("
+                "SELECT rowid FROM equities ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+
+    def clear(self):
+        """ Remove every entry and reset the statistics. """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM equities")
+            self._hits = 0
+            self._misses = 0
+
+    def estimate(
+        self,
+        hero_hand: str,
+        villains_range: Sequence[float],
+        times: int,
+        evaluate: Callable[[Sequence[float]], simulation.Estimate],
+    ) -> simulation.Estimate:
+        """
+        Estimate equities, simulating only the villains missing from the cache.
+
+        Args:
+            hero_hand: Hero hand.
+            villains_range: Villain ranges.
+            times: Number of Monte Carlo runs.
+            evaluate: Function that simulates a sequence of villain ranges.
+
+        Returns:
+            Equity estimate.
+        """
+        keys = [self.key(hero_hand, rng, times) for rng in villains_range]
+        found = self.get(keys)
+
+        missing = [i for i, key in enumerate(keys) if key not in found]
+        if missing:
+            estimate = evaluate([villains_range[i] for i in missing])
+            computed = {
+                keys[i]: (equity, stderr)
+                for i, equity, stderr in zip(missing, estimate.equity, estimate.stderr)
+            }
+            self.set(computed)
+            found.update(computed)
+
+        values = np.array([found[key] for key in keys]).reshape(-1, 2)
+        return simulation.Estimate(values[:, 0], values[:, 1], times)
+
+
+@functools.lru_cache(maxsize=None)
+def default_cache() -> EquityCache:
+    """ Get the process wide equity cache at the default path. """
+    return EquityCache(os.environ.get("POKER_COACH_CACHE", DEFAULT_PATH))
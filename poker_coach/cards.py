@@ -0,0 +1,42 @@
+""" Integer card encoding. """
+
+from typing import Sequence
+
+import numpy as np
+
+RANKS: str = "23456789TJQKA"
+SUITS: str = "shcd"
+
+# Cards are encoded as rank * 4 + suit, so the deck is sorted from deuces to aces.
+DECK: Sequence[str] = [rank + suit for rank in RANKS for suit in SUITS]
+
+_CARD_INDEX = {card: i for i, card in enumerate(DECK)}
+
+
+def encode(cards: str) -> np.ndarray:
+    """
+    Encode concatenated cards as integers.
+
+    Args:
+        cards: Concatenated cards (such as "AsKd").
+
+    Returns:
+        Array of integer cards.
+    """
+    return np.array(
+        [_CARD_INDEX[cards[i : i + 2]] for i in range(0, len(cards), 2)],
+        dtype=np.int8,
+    )
+
+
+def decode(cards: Sequence[int]) -> str:
+    """
+    Decode integer cards into concatenated cards.
+
+    Args:
+        cards: Integer cards.
+
+    Returns:
+        Concatenated cards (such as "AsKd").
+    """
+    return "".join(DECK[card] for card in cards)
@@ -0,0 +1,208 @@
+"""
+Precomputed hero hand versus villain range equities.
+
+The table holds the equity of every starting hand class against the top 1% to 100%
+villain ranges. It is built offline with:
+
+    python -m poker_coach.equity_table --times 20000
+
+and saved next to the model as a small binary file that is memory-mapped on read,
+along with the hand class versus hand class equity matrix it is built from.
+"""
+
+import argparse
+import functools
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+from . import cards, hands, simulation
+
+TABLE_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "equity_table.npy"
+)
+MATRIX_PATH: str = os.path.join(os.path.dirname(TABLE_PATH), "equity_matrix.npy")
+
+# Integer range percentages covered by the table columns.
+RANGES: np.ndarray = np.arange(1, 101)
+
+
+def _representative(descr: str) -> str:
+    """ Get a hand that represents its class. """
+    return hands.class_combos(descr)[0]
+
+
+def _blocked(hand: str, combo: str) -> bool:
+    """ Check if two hands share a card. """
+    return bool({hand[:2], hand[2:]} & {combo[:2], combo[2:]})
+
+
+def build_weights() -> np.ndarray:
+    """
+    Count combos of each villain class available against each hero class.
+
+    Returns:
+        Matrix with hero classes as rows and villain classes as columns.
+    """
+    weights = np.zeros((len(hands.CLASSES), len(hands.CLASSES)))
+    for i, hero_descr in enumerate(hands.CLASSES):
+        hero_hand = _representative(hero_descr)
+        for j, villain_descr in enumerate(hands.CLASSES):
+            weights[i, j] = sum(
+                not _blocked(hero_hand, combo)
+                for combo in hands.class_combos(villain_descr)
+            )
+    return weights
+
+
+def build_matrix(
+    times: int = 20000, random_state: Optional[int] = None
+) -> np.ndarray:
+    """
+    Simulate the equity of each hand class against each other hand class.
+
+    Args:
+        times: Number of Monte Carlo runs per match up.
+        random_state: Random state.
+
+    Returns:
+        Matrix with hero classes as rows and villain classes as columns.
+    """
+    random_state = np.random.default_rng(random_state)
+    villains_combos = [
+        cards.encode("".join(hands.class_combos(descr))).reshape(-1, 2)
+        for descr in hands.CLASSES
+    ]
+    matrix = np.zeros((len(hands.CLASSES), len(hands.CLASSES)))
+    for i, hero_descr in enumerate(hands.CLASSES):
+        hero = cards.encode(_representative(hero_descr))
+        combos = [
+            combo[~np.isin(combo, hero).any(axis=1)] for combo in villains_combos
+        ]
+        matrix[i] = simulation.eval_combos(
+            hero, combos, times=times, random_state=random_state
+        )
+    return matrix
+
+
+def build_table(matrix: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Combine class versus class equities into class versus range equities.
+
+    Args:
+        matrix: Class versus class equities.
+        weights: Available villain combos for each hero class.
+
+    Returns:
+        Table with hero classes as rows and range percentages as columns.
+    """
+    masks = np.array([hands.top_range(pct) for pct in RANGES], dtype=float)
+    return ((matrix * weights) @ masks.T) / (weights @ masks.T)
+
+
+def build(
+    times: int = 20000,
+    path: str = TABLE_PATH,
+    random_state: Optional[int] = 0,
+    matrix_path: str = MATRIX_PATH,
+) -> np.ndarray:
+    """
+    Build the equity table and save it with its class versus class matrix.
+
+    Args:
+        times: Number of Monte Carlo runs per class match up.
+        path: File path.
+        random_state: Random state.
+        matrix_path: Class versus class matrix file path.
+
+    Returns:
+        Equity table.
+    """
+    matrix = build_matrix(times, random_state)
+    table = build_table(matrix, build_weights())
+    np.save(path, table.astype(np.float16))
+    np.save(matrix_path, matrix.astype(np.float16))
+    load.cache_clear()
+    load_matrix.cache_clear()
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def load(path: str = TABLE_PATH) -> np.ndarray:
+    """ Memory-map the equity table. """
+    return np.load(path, mmap_mode="r")
+
+
+@functools.lru_cache(maxsize=None)
+def load_matrix(path: str = MATRIX_PATH) -> np.ndarray:
+    """
+    Load the class versus class equity matrix.
+
+    Both halves of the matrix are simulated apart, so they are averaged to make the
+    equity of a class against another one minus the opposite equity.
+    """
+    matrix = np.load(path).astype(float)
+    return (matrix + 1 - matrix.T) / 2
+
+
+def lookup(
+    hero_hand: str, villains_range: Sequence[float], path: str = TABLE_PATH
+) -> np.ndarray:
+    """
+    Look up the hero equity against each villain range.
+
+    Fractional ranges are linearly interpolated between the neighbour integer
+    percentages. Ranges outside the table are clipped to its limits.
+
+    Args:
+        hero_hand: Hero hand.
+        villains_range: Villain ranges.
+        path: Equity table file path.
+
+    Returns:
+        Equity against each villain.
+    """
+    row = np.asarray(load(path)[hands.class_index(hero_hand)], dtype=float)
+    villains_range = np.clip(villains_range, RANGES[0], RANGES[-1])
+    return np.interp(villains_range, RANGES, row)
+
+
+def lookup_classes(
+    villains_range: Sequence[float], path: str = TABLE_PATH
+) -> np.ndarray:
+    """
+    Look up the equity of every hand class against each villain range at once.
+
+    Args:
+        villains_range: Villain ranges.
+        path: Equity table file path.
+
+    Returns:
+        Array with hand classes as rows and villains as columns.
+    """
+    table = load(path)
+    villains_range = np.clip(villains_range, RANGES[0], RANGES[-1])
+    lower = np.minimum(np.floor(villains_range).astype(int), RANGES[-2]) - RANGES[0]
+    weight = villains_range - RANGES[lower]
+    return table[:, lower] * (1 - weight) + table[:, lower + 1] * weight
+
+
+def main():
+    """ Build the equity table from the command line. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--times", type=int, default=20000)
+    parser.add_argument("--path", default=TABLE_PATH)
+    parser.add_argument("--matrix-path", default=MATRIX_PATH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    build(
+        times=args.times,
+        path=args.path,
+        random_state=args.seed,
+        matrix_path=args.matrix_path,
+    )
+
+
+if __name__ == "__main__":
+    main()
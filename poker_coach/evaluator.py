@@ -0,0 +1,182 @@
+"""
+Lookup table seven cards hand evaluator.
+
+Hands are arrays of integer cards (see poker_coach.cards) and their values are
+integers where a bigger value means a stronger hand. Equal values mean a tie.
+
+Without a flush, a hand value depends only on its ranks. Each rank has a key chosen
+so that the key sums of any seven ranks are unique, and that sum indexes a table of
+values. Flushes are looked up by the bit mask of the ranks in the flush suit.
+Tables are built on the first evaluation.
+"""
+
+import functools
+import itertools
+from typing import Tuple
+
+import numpy as np
+
+HIGH_CARD: int = 0
+PAIR: int = 1
+TWO_PAIRS: int = 2
+THREE_OF_A_KIND: int = 3
+STRAIGHT: int = 4
+FLUSH: int = 5
+FULL_HOUSE: int = 6
+FOUR_OF_A_KIND: int = 7
+STRAIGHT_FLUSH: int = 8
+
+N_RANKS: int = 13
+N_SUITS: int = 4
+N_CARDS: int = 7
+N_MASKS: int = 1 << N_RANKS
+
+# Key sums of any seven ranks (up to four of a kind) are unique.
+RANK_KEYS: np.ndarray = np.array(
+    [0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181]
+)
+
+# Suit counts fit in three bits each.
+SUIT_KEYS: np.ndarray = 8 ** np.arange(N_SUITS)
+
+
+def _top_ranks(mask: int, n: int = 5) -> int:
+    """ Pack the highest ranks of a ranks bit mask. """
+    value = 0
+    count = 0
+    for rank in reversed(range(N_RANKS)):
+        if count == n:
+            break
+        if mask & (1 << rank):
+            value = (value << 4) | rank
+            count += 1
+    return value << (4 * (n - count))
+
+
+def _straight_high(mask: int) -> int:
+    """ Get the highest rank of a straight in a ranks bit mask (or -1). """
+    for high in reversed(range(4, N_RANKS)):
+        straight = 0b11111 << (high - 4)
+        if mask & straight == straight:
+            return high
+    wheel = 0b1000000001111  # Ace to five.
+    if mask & wheel == wheel:
+        return 3
+    return -1
+
+
+def _pack(category, ranks):
+    """ Pack a category and its packed ranks into a hand value. """
+    return (category << 20) | ranks
+
+
+def _ranks_value(counts: Tuple[int, ...]) -> int:
+    """ Get the packed value of a hand without flush from its rank counts. """
+    mask = sum(1 << rank for rank, count in enumerate(counts) if count)
+    groups = sorted(((count, rank) for rank, count in enumerate(counts)), reverse=True)
+    (count0, rank0), (count1, rank1) = groups[:2]
+    kickers0 = _top_ranks(mask & ~(1 << rank0)) >> 4
+    kickers1 = _top_ranks(mask & ~(1 << rank0) & ~(1 << rank1)) >> 8
+    straight = _straight_high(mask)
+
+    if count0 == 4:
+        return _pack(FOUR_OF_A_KIND, (rank0 << 16) | (kickers0 & 0xF000))
+    if count0 == 3 and count1 >= 2:
+        return _pack(FULL_HOUSE, (rank0 << 16) | (rank1 << 12))
+    if straight >= 0:
+        return _pack(STRAIGHT, straight << 16)
+    if count0 == 3:
+        return _pack(THREE_OF_A_KIND, (rank0 << 16) | (kickers0 & 0xFF00))
+    if count0 == 2 and count1 == 2:
+        return _pack(TWO_PAIRS, (rank0 << 16) | (rank1 << 12) | (kickers1 & 0xF00))
+    if count0 == 2:
+        return _pack(PAIR, (rank0 << 16) | (kickers0 & 0xFFF0))
+    return _pack(HIGH_CARD, _top_ranks(mask))
+
+
+def _flush_value(mask: int) -> int:
+    """ Get the packed value of a flush from the ranks bit mask of its suit. """
+    straight = _straight_high(mask)
+    if straight >= 0:
+        return _pack(STRAIGHT_FLUSH, straight << 16)
+    return _pack(FLUSH, _top_ranks(mask))
+
+
+@functools.lru_cache(maxsize=None)
+def tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the lookup tables.
+
+    Returns:
+        Tuple with the values indexed by rank keys sum, the flush values indexed by
+        ranks bit mask, the flush suit indexed by suit keys sum (or -1) and the
+        lowest value of each category.
+    """
+    rank_keys = []
+    rank_values = []
+    for ranks in itertools.combinations_with_replacement(range(N_RANKS), N_CARDS):
+        counts = tuple(ranks.count(rank) for rank in range(N_RANKS))
+        if max(counts) <= N_SUITS:
+            rank_keys.append(sum(RANK_KEYS[rank] for rank in ranks))
+            rank_values.append(_ranks_value(counts))
+
+    flush_masks = [mask for mask in range(N_MASKS) if bin(mask).count("1") >= 5]
+    flush_values = [_flush_value(mask) for mask in flush_masks]
+
+    # Replace packed values by their dense ranking.
+    packed = np.unique(rank_values + flush_values)
+
+    rank_table = np.zeros(RANK_KEYS[-1] * N_SUITS + RANK_KEYS[-2] * 3 + 1, np.uint16)
+    rank_table[rank_keys] = np.searchsorted(packed, rank_values)
+
+    flush_table = np.zeros(N_MASKS, np.uint16)
+    flush_table[flush_masks] = np.searchsorted(packed, flush_values)
+
+    flush_suit = np.full(SUIT_KEYS[-1] * N_CARDS + 1, -1, np.int8)
+    for counts in itertools.product(range(N_CARDS + 1), repeat=N_SUITS):
+        if sum(counts) == N_CARDS and max(counts) >= 5:
+            flush_suit[np.dot(counts, SUIT_KEYS)] = np.argmax(counts)
+
+    categories = np.searchsorted(packed, np.arange(STRAIGHT_FLUSH + 1) << 20)
+    return rank_table, flush_table, flush_suit, categories
+
+
+def evaluate(cards: np.ndarray) -> np.ndarray:
+    """
+    Evaluate seven cards hands.
+
+    Args:
+        cards: Integer cards array where the last axis holds each hand cards.
+
+    Returns:
+        Value of each hand.
+    """
+    rank_table, flush_table, flush_suit, _ = tables()
+    cards = np.asarray(cards)
+    shape = cards.shape[:-1]
+    cards = cards.reshape(-1, cards.shape[-1])
+    ranks = cards >> 2
+    suits = cards & 3
+
+    values = rank_table[RANK_KEYS[ranks].sum(axis=-1)].astype(np.int32)
+
+    suit = flush_suit[SUIT_KEYS[suits].sum(axis=-1)]
+    is_flush = suit >= 0
+    if is_flush.any():
+        flush_bits = np.where(suits[is_flush] == suit[is_flush, None], 1, 0)
+        flush_masks = (flush_bits << ranks[is_flush]).sum(axis=-1)
+        values[is_flush] = flush_table[flush_masks]
+    return values.reshape(shape)
+
+
+def category(values: np.ndarray) -> np.ndarray:
+    """
+    Get the category (such as PAIR or FLUSH) of hand values.
+
+    Args:
+        values: Hand values.
+
+    Returns:
+        Category of each hand.
+    """
+    return np.searchsorted(tables()[-1], values, side="right") - 1
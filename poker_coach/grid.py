@@ -0,0 +1,243 @@
+"""
+Equity model distilled into an interpolation grid.
+
+The equity model only takes the hero hand percentage and the villain range
+percentage, so it can be sampled onto a grid with a node for each hand class
+percentage and each integer range percentage. Predictions are bilinearly
+interpolated between the grid nodes. The grid is built with:
+
+    python -m poker_coach.grid --source model
+
+which also reports its errors against the model and against Monte Carlo.
+"""
+
+import argparse
+import functools
+import os
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from . import hands, model, simulation
+
+GRID_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "model_grid.npz"
+)
+
+HERO_AXIS: np.ndarray = np.sort(hands.PERCENTAGES)
+VILLAIN_AXIS: np.ndarray = np.arange(1, 101, dtype=float)
+
+SOURCES: Sequence[str] = ("model", "simulation")
+
+
+class GridModel:
+    """ Bilinear interpolation of equities over hero and villain percentages. """
+
+    def __init__(self, hero_axis: np.ndarray, villain_axis: np.ndarray, values):
+        """
+        Args:
+            hero_axis: Increasing hero percentages.
+            villain_axis: Increasing villain range percentages.
+            values: Equities with hero percentages as rows and villain range
+                percentages as columns.
+        """
+        self.hero_axis = np.asarray(hero_axis, dtype=float)
+        self.villain_axis = np.asarray(villain_axis, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+
+    @staticmethod
+    def _locate(axis: np.ndarray, x: np.ndarray):
+        """ Get the lower node index and the weight of the upper node. """
+        x = np.clip(x, axis[0], axis[-1])
+        i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, len(axis) - 2)
+        return i, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """
+        Predict equities.
+
+        Args:
+            x: Array with a row of hero and villain percentages for each sample.
+
+        Returns:
+            Predicted equities.
+        """
+        x = np.asarray(x, dtype=float)
+        i, u = self._locate(self.hero_axis, x[:, 0])
+        j, v = self._locate(self.villain_axis, x[:, 1])
+        return (
+            self.values[i, j] * (1 - u) * (1 - v)
+            + self.values[i + 1, j] * u * (1 - v)
+            + self.values[i, j + 1] * (1 - u) * v
+            + self.values[i + 1, j + 1] * u * v
+        )
+
+    def save(self, path: str = GRID_PATH):
+        """ Save the grid. """
+        np.savez(
+            path,
+            hero_axis=self.hero_axis,
+            villain_axis=self.villain_axis,
+            values=self.values.astype(np.float16),
+        )
+
+
+class Report(NamedTuple):
+    """ Grid errors against a reference. """
+
+    max_error: float
+    mean_error: float
+
+
+@functools.lru_cache(maxsize=None)
+def load(path: str = GRID_PATH) -> GridModel:
+    """ Load the grid once per process. """
+    with np.load(path) as data:
+        return GridModel(data["hero_axis"], data["villain_axis"], data["values"])
+
+
+def predict_equities(
+    hero_hand: str, villain_ranges: Sequence[float], path: Optional[str] = None
+) -> np.ndarray:
+    """
+    Predict the hero equity against every villain range in a single call.
+
+    Args:
+        hero_hand: Hero hand.
+        villain_ranges: Villain ranges.
+        path: Grid file path (defaults to GRID_PATH).
+
+    Returns:
+        Equity against each villain.
+    """
+    if not len(villain_ranges):
+        return np.zeros(0)
+    return load(path or GRID_PATH).predict(model.features(hero_hand, villain_ranges))
+
+
+def _class_hand(percentage: float) -> str:
+    """ Get a hand from the class with a hand percentage. """
+    descr = hands.CLASSES[int(np.argmin(np.abs(hands.PERCENTAGES - percentage)))]
+    return hands.class_combos(descr)[0]
+
+
+def build(
+    source: str = "model",
+    times: int = 5000,
+    model_path: Optional[str] = None,
+    random_state: Optional[int] = 0,
+) -> GridModel:
+    """
+    Sample equities onto the grid nodes.
+
+    Args:
+        source: "model" to sample the equity model or "simulation" to simulate.
+        times: Number of Monte Carlo runs per node (simulation only).
+        model_path: Equity model file path (model only).
+        random_state: Random state (simulation only).
+
+    Returns:
+        Grid model.
+    """
+    if source == "model":
+        estimator = model.load(model_path or model.MODEL_PATH)
+        hero, villain = np.meshgrid(HERO_AXIS, VILLAIN_AXIS, indexing="ij")
+        x = np.column_stack([hero.ravel(), villain.ravel()])
+        values = estimator.predict(x).reshape(hero.shape)
+    elif source == "simulation":
+        seeds = np.random.SeedSequence(random_state).spawn(len(HERO_AXIS))
+        values = np.array(
+            [
+                simulation.eval_ranges(
+                    _class_hand(hero), VILLAIN_AXIS, times=times, random_state=seed
+                )
+                for hero, seed in zip(HERO_AXIS, seeds)
+            ]
+        )
+    else:
+        raise ValueError(f"'{source}' is not a valid grid source.")
+    return GridModel(HERO_AXIS, VILLAIN_AXIS, values)
+
+
+def _errors(predicted: np.ndarray, expected: np.ndarray) -> Report:
+    """ Get maximum and mean absolute errors. """
+    errors = np.abs(np.asarray(predicted) - np.asarray(expected))
+    return Report(float(errors.max()), float(errors.mean()))
+
+
+def report_model(
+    grid: GridModel, model_path: Optional[str] = None, samples: int = 10000
+) -> Report:
+    """
+    Compare the grid with the equity model on random hands and ranges.
+
+    Args:
+        grid: Grid model.
+        model_path: Equity model file path.
+        samples: Number of random samples.
+
+    Returns:
+        Errors against the model.
+    """
+    random_state = np.random.default_rng(0)
+    x = np.column_stack(
+        [
+            random_state.choice(hands.PERCENTAGES, samples),
+            random_state.uniform(VILLAIN_AXIS[0], VILLAIN_AXIS[-1], samples),
+        ]
+    )
+    estimator = model.load(model_path or model.MODEL_PATH)
+    return _errors(grid.predict(x), estimator.predict(x))
+
+
+def report_simulation(
+    grid: GridModel, samples: int = 200, times: int = 20000
+) -> Report:
+    """
+    Compare the grid with Monte Carlo simulations on random hands and ranges.
+
+    Args:
+        grid: Grid model.
+        samples: Number of random samples.
+        times: Number of Monte Carlo runs per sample.
+
+    Returns:
+        Errors against Monte Carlo (including the Monte Carlo noise).
+    """
+    random_state = np.random.default_rng(1)
+    hero = random_state.choice(hands.PERCENTAGES, samples)
+    villain = random_state.uniform(VILLAIN_AXIS[0], VILLAIN_AXIS[-1], samples)
+    expected = [
+        simulation.eval_ranges(_class_hand(h), [v], times=times, random_state=i)[0]
+        for i, (h, v) in enumerate(zip(hero, villain))
+    ]
+    return _errors(grid.predict(np.column_stack([hero, villain])), expected)
+
+
+def main():
+    """ Build the grid from the command line and report its errors. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--source", choices=SOURCES, default="model")
+    parser.add_argument("--times", type=int, default=5000)
+    parser.add_argument("--model", default=model.MODEL_PATH)
+    parser.add_argument("--path", default=GRID_PATH)
+    args = parser.parse_args()
+
+    grid = build(source=args.source, times=args.times, model_path=args.model)
+    grid.save(args.path)
+    load.cache_clear()
+
+    try:
+        errors = report_model(grid, model_path=args.model)
+        print(f"Model: max error {errors.max_error:.4f}, mean {errors.mean_error:.4f}")
+    except Exception as error:  # pylint: disable=broad-except
+        print(f"Model: could not be loaded ({error.__class__.__name__}).")
+    errors = report_simulation(grid)
+    print(
+        f"Monte Carlo: max error {errors.max_error:.4f}, "
+        f"mean {errors.mean_error:.4f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
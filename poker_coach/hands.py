@@ -0,0 +1,153 @@
+""" Starting hand classes. """
+
+import csv
+import itertools
+import os
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+import bluff.holdem
+
+from .cards import DECK, RANKS, SUITS
+
+# Hand ranking shipped with bluff, read without its pandas based equity module.
+RANKING_PATH: str = os.path.join(
+    os.path.dirname(bluff.holdem.__file__), "data", "sk_hand_rankings.csv"
+)
+
+with open(RANKING_PATH, newline="") as file:
+    _RANKING = list(csv.DictReader(file))
+
+# Hand classes ("AA", "AKs", "AK", ...) from the strongest to the weakest.
+CLASSES: Sequence[str] = [row["hand"] for row in _RANKING]
+
+# Percentage of all hands that are as good as or better than each class.
+PERCENTAGES: np.ndarray = np.array([row["value"] for row in _RANKING], dtype=float)
+
+_CLASS_INDEX: Dict[str, int] = {descr: i for i, descr in enumerate(CLASSES)}
+
+# Every two cards combination as integer cards, with the highest card first.
+COMBOS: np.ndarray = np.array(
+    [[high, low] for high in range(len(DECK)) for low in range(high)], dtype=np.int8
+)
+
+
+def _descr(high: int, low: int) -> str:
+    """ Get the class description of two integer cards, the highest first. """
+    descr = RANKS[high >> 2] + RANKS[low >> 2]
+    if high >> 2 != low >> 2 and high & 3 == low & 3:
+        descr += "s"
+    return descr
+
+
+# Class index of each combo.
+COMBO_CLASSES: np.ndarray = np.array(
+    [_CLASS_INDEX[_descr(high, low)] for high, low in COMBOS]
+)
+
+# Combo index of each pair of integer cards (-1 for the same card twice).
+PAIR_COMBOS: np.ndarray = np.full((len(DECK), len(DECK)), -1, dtype=np.int16)
+PAIR_COMBOS[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(len(COMBOS))
+PAIR_COMBOS[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(len(COMBOS))
+
+# Combo index of each two cards hand, in both cards orders.
+_HAND_COMBOS: Dict[str, int] = {
+    DECK[first] + DECK[second]: int(combo)
+    for (first, second), combo in np.ndenumerate(PAIR_COMBOS)
+    if combo >= 0
+}
+
+
+def combo_index(hand: str) -> int:
+    """ Get the index in COMBOS of a two cards hand (such as "AsKd"). """
+    return _HAND_COMBOS[hand]
+
+
+def class_index(hand: str) -> int:
+    """ Get the class index of a two cards hand (such as "AsKd"). """
+    return int(COMBO_CLASSES[_HAND_COMBOS[hand]])
+
+
+def percentage(hand: str) -> float:
+    """ Get the percentage rank of a two cards hand (such as "AsKd"). """
+    return float(PERCENTAGES[COMBO_CLASSES[_HAND_COMBOS[hand]]])
+
+
+def combo_indexes(hands: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    """
+    Get the index in COMBOS of many hands at once.
+
+    Args:
+        hands: Two cards hands (such as "AsKd") or integer cards array where the
+            last axis holds the two cards of each hand.
+
+    Returns:
+        Combo index of each hand.
+    """
+    if len(hands) and isinstance(hands[0], str):
+        return np.array([_HAND_COMBOS[hand] for hand in hands], dtype=np.int16)
+    hands = np.asarray(hands, dtype=np.intp)
+    return PAIR_COMBOS[hands[..., 0], hands[..., 1]]
+
+
+def class_indexes(hands: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    """ Get the class index of many hands at once (see combo_indexes). """
+    return COMBO_CLASSES[combo_indexes(hands)]
+
+
+def percentages(hands: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    """ Get the percentage rank of many hands at once (see combo_indexes). """
+    return PERCENTAGES[class_indexes(hands)]
+
+
+def class_combos(descr: str) -> List[str]:
+    """
+    Enumerate every two cards combination of a hand class.
+
+    Args:
+        descr: Hand class description (such as "AA", "AKs" or "AK").
+
+    Returns:
+        List of hands.
+    """
+    high, low = descr[0], descr[1]
+    if high == low:
+        suits = itertools.combinations(SUITS, 2)
+    elif descr.endswith("s"):
+        suits = ((suit, suit) for suit in SUITS)
+    else:
+        suits = itertools.permutations(SUITS, 2)
+    return [high + suit0 + low + suit1 for suit0, suit1 in suits]
+
+
+def top_classes(percentage: Union[float, np.ndarray]) -> Union[int, np.ndarray]:
+    """
+    Get the number of hand classes within the top percentage of hands.
+
+    Classes are sorted from the strongest, so the top range is the first ones. The
+    strongest class is always included, so tiny percentages still have hands.
+
+    Args:
+        percentage: Range percentage, or an array of them.
+
+    Returns:
+        Number of classes, or an array of them.
+    """
+    n_classes = np.searchsorted(
+        PERCENTAGES, np.maximum(percentage, PERCENTAGES[0]), side="right"
+    )
+    return int(n_classes) if np.ndim(n_classes) == 0 else n_classes
+
+
+def top_range(percentage: float) -> np.ndarray:
+    """
+    Get the hand classes within the top percentage of hands (see top_classes).
+
+    Args:
+        percentage: Range percentage.
+
+    Returns:
+        Boolean mask over the hand classes.
+    """
+    return np.arange(len(CLASSES)) < top_classes(percentage)
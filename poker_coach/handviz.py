@@ -2,14 +2,18 @@
 # TODO: Show results in the plot
 # TODO: Conditional coloring in the plot
 
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
+import functools
+import pickle
+from html import escape
+from typing import NamedTuple
 
-from . import equity
+import numpy as np
 
-rcParams["font.family"] = "monospace"
+from . import hands
 
+# Font of the viewers texts, set on each text instead of the global matplotlib
+# settings, which every thread shares.
+FONT = {"family": "monospace"}
 
 SUITS_COLORS = {"s": "k", "h": "r", "c": "g", "d": "b"}
 
@@ -21,7 +25,56 @@ def ellipse(theta):
     return a * b / np.sqrt((a * np.sin(theta) ** 2) + (b * np.cos(theta) ** 2))
 
 
-def hand(
+class Layout(NamedTuple):
+    """ Static table geometry, in polar coordinates. """
+
+    table_theta: np.ndarray
+    table_radius: np.ndarray
+    seats_theta: np.ndarray
+    seats_radius: np.ndarray
+
+
+class Mark(NamedTuple):
+    """ Text drawn over the table. """
+
+    text: str
+    theta: float
+    radius: float
+    style: str = "plain"
+    ha: str = "center"
+    color: str = "k"
+
+
+# Matplotlib annotation arguments of each mark style.
+STYLES = {
+    "plain": {},
+    "seat": dict(bbox=dict(boxstyle="Round", fc="whitesmoke", ec="gray")),
+    "dealer": dict(bbox=dict(boxstyle="Circle", fc="pink", ec="k")),
+    "card": dict(
+        bbox=dict(boxstyle="Round", fc="w", ec="gray"),
+        fontsize="x-large",
+        fontweight="bold",
+        annotation_clip=False,
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def layout(n_seats):
+    """ Get the table outline and the seats coordinates of a table size. """
+    # Table line
+    table_theta = np.linspace(start=0, stop=2 * np.pi, num=100, endpoint=True)
+    # Seats coordinates.
+    seats_theta = -1 * np.linspace(start=0, stop=2 * np.pi, num=n_seats, endpoint=False)
+    geometry = Layout(
+        table_theta, ellipse(table_theta), seats_theta, ellipse(seats_theta)
+    )
+    for values in geometry:
+        values.flags.writeable = False
+    return geometry
+
+
+def marks(
     n_seats,
     pot,
     hero_name,
@@ -31,32 +84,15 @@ def hand(
     villains_ranges,
     villains_chips,
 ):
-    """ Hand viewer. """
-
-    # Table line
-    theta_arr = np.linspace(start=0, stop=2 * np.pi, num=100, endpoint=True)
-    radius_arr = [ellipse(t) for t in theta_arr]
-
-    # Seats coordinates.
-    seats_theta = -1 * np.linspace(start=0, stop=2 * np.pi, num=n_seats, endpoint=False)
-    seats_radius = [ellipse(t) for t in seats_theta]
+    """ Get the players, dealer, blinds and hero cards marks (see hand). """
+    geometry = layout(n_seats)
 
     # Place players into the seats. (+ 1 because of the hero).
-    players_theta = [seats_theta[i] for i in range(len(villains_names) + 1)]
-    players_radius = [seats_radius[i] for i in range(len(villains_names) + 1)]
-
-    # Create figure and polar axes.
-    fig = plt.figure(figsize=(8, 4))
-    ax = fig.add_axes([0.1, 0, 0.8, 1], polar=True)
-
-    # Create table.
-    ax.plot(theta_arr, radius_arr, color="gainsboro", linewidth=5)
-    ax.fill_between(theta_arr, radius_arr, color="whitesmoke")
-    ax.axis("off")
+    players_theta = geometry.seats_theta[: len(villains_names) + 1]
+    players_radius = geometry.seats_radius[: len(villains_names) + 1]
 
     # Get hero hand percentage.
-    hero_descr = equity.hand_to_descr(hero_hand)
-    hero_percent = equity.descr_to_percentage(hero_descr)
+    hero_percent = hands.percentage(hero_hand)
 
     # Concatenate hero and villains.
     players_name = np.concatenate([[hero_name], villains_names])
@@ -68,85 +104,304 @@ def hand(
     )
 
     # Players
-    for name, rng, chips, theta, radius in iterator:
-
-        bbox_props = dict(boxstyle="Round", fc="whitesmoke", ec="gray")
-        ax.annotate(
-            f"{name} {rng:.0f}%\n{chips} BB",
-            xy=(theta, radius),
-            ha="center",
-            va="center",
-            bbox=bbox_props,
-        )
+    result = [
+        Mark(f"{name} {rng:.0f}%\n{chips} BB", theta, radius, "seat")
+        for name, rng, chips, theta, radius in iterator
+    ]
 
-    # How much the small blind will be moved to avoid overlapping.
-    move_small_blind = 0
+    # Blinds and dealer are placed by seat name, without notes such as "all in".
+    seats = [str(name).split()[0] for name in players_name]
+    index = {name: i for i, name in enumerate(seats)}
 
-    # Dealer index.
+    # Heads up, the small blind is the dealer.
     if n_seats == 2:
-        dealer_idx = -2
+        dealer_idx = index.get("SB")
         move_small_blind = -0.2  # Displace small blind to not overlap the button.
-    elif len(players_name) == 2:
-        dealer_idx = None
     else:
-        dealer_idx = -3
+        dealer_idx = index.get("BTN")
+        move_small_blind = 0
 
     if dealer_idx is not None:
-        bbox_props = dict(boxstyle="Circle", fc="pink", ec="k")
-        ax.annotate(
-            "D",
-            xy=(players_theta[dealer_idx], 0.7 * players_radius[dealer_idx]),
-            ha="center",
-            va="center",
-            bbox=bbox_props,
+        result.append(
+            Mark(
+                "D",
+                players_theta[dealer_idx],
+                0.7 * players_radius[dealer_idx],
+                "dealer",
+            )
         )
 
     # Blinds and antes
-    ax.annotate(f"Antes\n{pot - 1.5} BB", xy=(0, 0), ha="center", va="center")
-    ax.annotate(
-        "1 BB",
-        xy=(players_theta[-1], 0.7 * players_radius[-1]),
-        ha="center",
-        va="center",
-    )
-    ax.annotate(
-        ".5 BB",
-        xy=(players_theta[-2], (0.7 + move_small_blind) * players_radius[-2]),
-        ha="center",
-        va="center",
-    )
+    result.append(Mark(f"Antes\n{pot - 1.5} BB", 0, 0))
+    blinds = (("1 BB", "BB", 0.7), (".5 BB", "SB", 0.7 + move_small_blind))
+    for text, name, scale in blinds:
+        if name in index:
+            i = index[name]
+            result.append(Mark(text, players_theta[i], scale * players_radius[i]))
 
     # Hero cards.
     card0 = hero_hand[:2]
     card1 = hero_hand[2:]
+    result.append(
+        Mark(
+            card0[0],
+            players_theta[0],
+            1.35 * players_radius[0],
+            "card",
+            "right",
+            SUITS_COLORS[card0[1]],
+        )
+    )
+    result.append(
+        Mark(
+            card1[0],
+            players_theta[0],
+            1.41 * players_radius[0],
+            "card",
+            "left",
+            SUITS_COLORS[card1[1]],
+        )
+    )
+    return result
 
-    rank0 = card0[0]
-    rank1 = card1[0]
 
-    suit0 = card0[1]
-    suit1 = card1[1]
+def _figure(**kwargs):
+    """
+    Create a figure without pyplot, so that figures are thread-safe.
 
-    bbox_props = dict(boxstyle="Round", fc="w", ec="gray")
-    hero_cards_kwargs = dict(
-        va="center",
-        bbox=bbox_props,
-        fontsize="x-large",
-        fontweight="bold",
-        annotation_clip=False,
+    Pyplot keeps global figures and settings, while a figure of its own may be drawn
+    and saved in any thread. Matplotlib is imported on first use, so that the SVG
+    viewer does not need it.
+    """
+    # pylint: disable=import-outside-toplevel
+    from matplotlib.figure import Figure
+
+    return Figure(**kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def figure_table(n_seats):
+    """
+    Get the pickled figure of the table background of a table size.
+
+    Unpickling gives a figure of its own to draw on, many times faster than creating
+    the figure and its polar axes again.
+    """
+    geometry = layout(n_seats)
+
+    # Create figure and polar axes.
+    fig = _figure(figsize=(8, 4))
+    ax = fig.add_axes([0.1, 0, 0.8, 1], polar=True)
+
+    # Create table, outline and filling as a single patch.
+    ax.fill(
+        geometry.table_theta,
+        geometry.table_radius,
+        facecolor="whitesmoke",
+        edgecolor="gainsboro",
+        linewidth=5,
+    )
+    ax.set_rmax(1.05 * geometry.table_radius.max())
+    ax.axis("off")
+    return pickle.dumps(fig)
+
+
+def hand(
+    n_seats,
+    pot,
+    hero_name,
+    hero_hand,
+    hero_chips,
+    villains_names,
+    villains_ranges,
+    villains_chips,
+):
+    """
+    Hand viewer.
+
+    The table background is cached per table size (see figure_table), so each call
+    only draws the players, dealer, blinds and hero cards on a copy of it.
+    """
+    fig = pickle.loads(figure_table(n_seats))
+    ax = fig.axes[0]
+
+    iterator = marks(
+        n_seats,
+        pot,
+        hero_name,
+        hero_hand,
+        hero_chips,
+        villains_names,
+        villains_ranges,
+        villains_chips,
     )
-    ax.annotate(
-        rank0,
-        xy=(players_theta[0], 1.35 * players_radius[0]),
-        ha="right",
-        color=SUITS_COLORS[suit0],
-        **hero_cards_kwargs,
+    for mark in iterator:
+        ax.annotate(
+            mark.text,
+            xy=(mark.theta, mark.radius),
+            ha=mark.ha,
+            va="center",
+            color=mark.color,
+            **FONT,
+            **STYLES[mark.style],
+        )
+
+    return fig
+
+
+# SVG pixels per table radius unit, and size of the drawing in units.
+SVG_SCALE = 100
+SVG_WIDTH = 8
+SVG_HEIGHT = 4
+
+# SVG font size, in units, and its (monospace) character width.
+_SVG_FONT = {"plain": 0.14, "seat": 0.14, "dealer": 0.14, "card": 0.2}
+_SVG_CHAR_WIDTH = 0.6
+
+# SVG box colors of each mark style.
+_SVG_BOXES = {
+    "seat": ("whitesmoke", "gray"),
+    "dealer": ("pink", "black"),
+    "card": ("white", "gray"),
+}
+_SVG_COLORS = {"k": "black", "r": "red", "g": "green", "b": "blue"}
+
+
+def _xy(theta, radius):
+    """ Convert polar coordinates to SVG pixels. """
+    return (
+        SVG_SCALE * radius * np.cos(theta),
+        -SVG_SCALE * radius * np.sin(theta),
     )
-    ax.annotate(
-        rank1,
-        xy=(players_theta[0], 1.41 * players_radius[0]),
-        ha="left",
-        color=SUITS_COLORS[suit1],
-        **hero_cards_kwargs,
+
+
+@functools.lru_cache(maxsize=None)
+def svg_table(n_seats):
+    """ Get the SVG opening tag and the table background of a table size. """
+    geometry = layout(n_seats)
+    x, y = _xy(geometry.table_theta, geometry.table_radius)
+    points = " ".join(f"{i:.1f},{j:.1f}" for i, j in zip(x, y))
+    width = SVG_SCALE * SVG_WIDTH
+    height = SVG_SCALE * SVG_HEIGHT
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="{-width / 2} {-height / 2} {width} {height}" '
+        'font-family="monospace">'
+        f'<polygon points="{points}" fill="whitesmoke" stroke="gainsboro" '
+        'stroke-width="5"/>'
+    )
+
+
+def _svg_mark(mark):
+    """ Get the SVG elements of a mark. """
+    font = SVG_SCALE * _SVG_FONT[mark.style]
+    lines = mark.text.split("\n")
+    x, y = _xy(mark.theta, mark.radius)
+    width = font * _SVG_CHAR_WIDTH * max(len(line) for line in lines)
+    height = font * len(lines)
+    # Horizontal alignment sets which side of the text is at the coordinates.
+    left = {"center": x - width / 2, "right": x - width, "left": x}[mark.ha]
+    top = y - height / 2
+
+    elements = []
+    if mark.style in _SVG_BOXES:
+        fill, stroke = _SVG_BOXES[mark.style]
+        pad = font / 3
+        radius = max(width, height) if mark.style == "dealer" else pad
+        elements.append(
+            f'<rect x="{left - pad:.1f}" y="{top - pad:.1f}" '
+            f'width="{width + 2 * pad:.1f}" height="{height + 2 * pad:.1f}" '
+            f'rx="{radius:.1f}" fill="{fill}" stroke="{stroke}"/>'
+        )
+    weight = "bold" if mark.style == "card" else "normal"
+    for i, line in enumerate(lines):
+        elements.append(
+            f'<text x="{left:.1f}" y="{top + font * (i + 0.8):.1f}" '
+            f'font-size="{font:.1f}" font-weight="{weight}" '
+            f'fill="{_SVG_COLORS[mark.color]}">{escape(line)}</text>'
+        )
+    return "".join(elements)
+
+
+def hand_svg(
+    n_seats,
+    pot,
+    hero_name,
+    hero_hand,
+    hero_chips,
+    villains_names,
+    villains_ranges,
+    villains_chips,
+):
+    """
+    Hand viewer as a lightweight SVG document (see hand).
+
+    The table background is cached per table size, so each call only writes the
+    players, dealer, blinds and hero cards.
+
+    Returns:
+        SVG document.
+    """
+    iterator = marks(
+        n_seats,
+        pot,
+        hero_name,
+        hero_hand,
+        hero_chips,
+        villains_names,
+        villains_ranges,
+        villains_chips,
     )
+    overlays = "".join(_svg_mark(mark) for mark in iterator)
+    return svg_table(n_seats) + overlays + "</svg>"
+
+
+CHART_RANKS = "AKQJT98765432"
+
+
+def chart_position(descr):
+    """ Get the row and column of a hand class in the 13x13 chart. """
+    high = CHART_RANKS.index(descr[0])
+    low = CHART_RANKS.index(descr[1])
+    # Suited hands above the diagonal and offsuit hands below it.
+    if descr.endswith("s"):
+        return high, low
+    return low, high
+
+
+def chart(classes, values, title=""):
+    """
+    Hand classes chart.
 
+    Args:
+        classes: Hand classes descriptions (such as "AKs").
+        values: Value of each class. Positive values are green and negative red.
+        title: Chart title.
+
+    Returns:
+        Figure.
+    """
+    grid = np.full((len(CHART_RANKS), len(CHART_RANKS)), np.nan)
+    labels = np.full(grid.shape, "", dtype=object)
+    for descr, value in zip(classes, values):
+        row, col = chart_position(descr)
+        grid[row, col] = value
+        suffix = "" if descr[0] == descr[1] or descr.endswith("s") else "o"
+        labels[row, col] = descr + suffix
+
+    limit = np.nanmax(np.abs(grid)) or 1
+    fig = _figure(figsize=(6, 6))
+    ax = fig.subplots()
+    ax.imshow(grid, cmap="RdYlGn", vmin=-limit, vmax=limit)
+    for (row, col), label in np.ndenumerate(labels):
+        ax.annotate(
+            label,
+            xy=(col, row),
+            ha="center",
+            va="center",
+            fontsize="x-small",
+            **FONT,
+        )
+    ax.set_title(title, **FONT)
+    ax.axis("off")
     return fig
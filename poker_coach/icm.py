@@ -0,0 +1,145 @@
+"""
+Independent Chip Model.
+
+The Malmuth-Harville model values tournament stacks: a player finishes first with
+probability proportional to its stack, and the following places are filled the same
+way among the remaining players. Expected payouts of the players left after each
+subset of players has finished are memoized, so each subset is solved only once.
+"""
+
+import functools
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+def equities(stacks: Sequence[float], payouts: Sequence[float]) -> np.ndarray:
+    """
+    Calculate the expected payout of each player.
+
+    Args:
+        stacks: Chips of each player.
+        payouts: Prize of each place, from the first one.
+
+    Returns:
+        Expected payout of each player.
+    """
+    stacks = [float(stack) for stack in stacks]
+    n_players = len(stacks)
+    payouts = [float(payout) for payout in payouts[:n_players]]
+
+    @functools.lru_cache(maxsize=None)
+    def remaining(mask: int) -> Tuple[float, ...]:
+        """ Expected payouts of the players in the mask, for the places left. """
+        values = [0.0] * n_players
+        place = n_players - bin(mask).count("1")
+        if place >= len(payouts):
+            return tuple(values)
+        players = [i for i in range(n_players) if mask >> i & 1]
+        total = sum(stacks[i] for i in players)
+        for i in players:
+            # Players without chips finish last, in any order.
+            chances = stacks[i] / total if total > 0 else 1 / len(players)
+            if chances > 0:
+                for j, value in enumerate(remaining(mask & ~(1 << i))):
+                    values[j] += chances * value
+                values[i] += chances * payouts[place]
+        return tuple(values)
+
+    return np.array(remaining((1 << n_players) - 1))
+
+
+def push_values(
+    hero_chips: float,
+    villains_chips: Sequence[float],
+    pot: float,
+    payouts: Sequence[float],
+    callers: Sequence[int],
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Calculate the hero payout changes of pushing compared to folding.
+
+    When the hero folds, the pot goes to the big blind (the last villain).
+
+    Args:
+        hero_chips: Hero chips.
+        villains_chips: Chips of each villain, in seat order.
+        pot: Pot (in chips).
+        payouts: Prize of each place, from the first one.
+        callers: Index of each villain that may call the push.
+
+    Returns:
+        Tuple with the payout change when winning and when losing the showdown
+        against each caller, and when every villain folds.
+    """
+    stacks = np.concatenate([[hero_chips], villains_chips]).astype(float)
+
+    fold = stacks.copy()
+    fold[-1] += pot
+    no_action = equities(fold, payouts)[0]
+
+    steal = stacks.copy()
+    steal[0] += pot
+    steal_value = equities(steal, payouts)[0] - no_action
+
+    win_values = []
+    lose_values = []
+    for caller in callers:
+        risk = min(hero_chips, villains_chips[caller])
+
+        win = stacks.copy()
+        win[0] += pot + risk
+        win[caller + 1] -= risk
+        win_values.append(equities(win, payouts)[0] - no_action)
+
+        lose = stacks.copy()
+        lose[0] -= risk
+        lose[caller + 1] += pot + risk
+        lose_values.append(equities(lose, payouts)[0] - no_action)
+
+    return np.array(win_values), np.array(lose_values), steal_value
+
+
+def call_values(
+    hero_chips: float,
+    villains_chips: Sequence[float],
+    pot: float,
+    payouts: Sequence[float],
+    shover: int,
+    blind: float,
+) -> Tuple[float, float]:
+    """
+    Calculate the hero payout changes of calling a push compared to folding.
+
+    The hero blind is counted in its chips and in the pot, so folding gives it up
+    and the pot goes to the shover. Players after the hero fold.
+
+    Args:
+        hero_chips: Hero chips.
+        villains_chips: Chips of each villain.
+        pot: Pot before the push (in chips).
+        payouts: Prize of each place, from the first one.
+        shover: Index of the villain that pushed.
+        blind: Blind posted by the hero.
+
+    Returns:
+        Tuple with the payout change when winning and when losing the showdown.
+    """
+    stacks = np.concatenate([[hero_chips], villains_chips]).astype(float)
+    risk = min(hero_chips, villains_chips[shover])
+
+    fold = stacks.copy()
+    fold[0] -= blind
+    fold[shover + 1] += pot
+    no_action = equities(fold, payouts)[0]
+
+    win = stacks.copy()
+    win[0] += pot + risk - blind
+    win[shover + 1] -= risk
+    lose = stacks.copy()
+    lose[0] -= risk
+    lose[shover + 1] += pot + risk - blind
+    return (
+        equities(win, payouts)[0] - no_action,
+        equities(lose, payouts)[0] - no_action,
+    )
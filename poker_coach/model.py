@@ -0,0 +1,79 @@
+"""
+Equity model backend.
+
+The model predicts the hero equity from two features: the hero hand percentage and
+the villain range percentage. It is loaded once per process, memory-mapped by
+default so that processes reading the same file share its pages. joblib (and the
+estimator library) is only imported when the model is loaded.
+"""
+
+import functools
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+from . import hands
+
+MODEL_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "model.pkl"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def load(path: str = MODEL_PATH, mmap_mode: Optional[str] = "r"):
+    """
+    Load the equity model once per process.
+
+    Args:
+        path: Model file path.
+        mmap_mode: Memory-map mode for the model arrays (None to read them).
+
+    Returns:
+        Fitted estimator.
+    """
+    import joblib  # pylint: disable=import-outside-toplevel
+
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+def features(hero_hand: str, villain_ranges: Sequence[float]) -> np.ndarray:
+    """
+    Build the model features of a hero hand against each villain range.
+
+    Args:
+        hero_hand: Hero hand.
+        villain_ranges: Villain ranges.
+
+    Returns:
+        Array with a row of hero and villain percentages for each villain.
+    """
+    hero_percentage = hands.percentage(hero_hand)
+    villain_ranges = np.asarray(villain_ranges, dtype=float)
+    return np.column_stack(
+        [np.full(len(villain_ranges), hero_percentage), villain_ranges]
+    )
+
+
+def predict_equities(
+    hero_hand: str,
+    villain_ranges: Sequence[float],
+    path: Optional[str] = None,
+    mmap_mode: Optional[str] = "r",
+) -> np.ndarray:
+    """
+    Predict the hero equity against every villain range in a single call.
+
+    Args:
+        hero_hand: Hero hand.
+        villain_ranges: Villain ranges.
+        path: Model file path (defaults to MODEL_PATH).
+        mmap_mode: Memory-map mode for the model arrays (None to read them).
+
+    Returns:
+        Equity against each villain.
+    """
+    if not len(villain_ranges):
+        return np.zeros(0)
+    estimator = load(path or MODEL_PATH, mmap_mode)
+    return estimator.predict(features(hero_hand, villain_ranges))
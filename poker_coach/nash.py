@@ -0,0 +1,299 @@
+"""
+Nash push fold equilibrium.
+
+When the action folds to a player, it either pushes all in or folds, and the
+players after it either call or fold. Stacks are the same for every player. The
+equilibrium is found by fictitious play: each iteration every player takes its best
+response against the average strategies of the others, vectorized over the 169 hand
+classes with the class versus class equity matrix. Only the first caller is taken
+into account, so players do not overcall.
+
+The solutions of every table size and stack drawn by the scenarios (at the default
+ante) are shipped next to the equity table, and built offline with:
+
+    python -m poker_coach.nash
+
+Other solutions are saved to disk per table configuration, so grading a scenario
+against the equilibrium is a lookup once it has been solved.
+"""
+
+import argparse
+import functools
+import os
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from . import equity_table, hands
+
+DEFAULT_DIR: str = os.path.join(
+    os.path.expanduser("~"), ".cache", "poker_coach", "nash"
+)
+ITERATIONS: int = 1000
+
+SOLUTIONS_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nash.npz"
+)
+
+# Table sizes and stacks of the shipped solutions, as the scenarios draw them.
+SEATS = range(2, 10)
+STACKS = range(1, 20)
+
+
+class Equilibrium(NamedTuple):
+    """ Push and call frequencies of each hand class. """
+
+    # Push frequencies with a row for each pusher seat.
+    push: np.ndarray
+    # Call frequencies indexed by pusher seat, caller seat and hand class.
+    call: np.ndarray
+
+    def push_range(self, position: int) -> float:
+        """
+        Get the percentage of hands pushed from a seat.
+
+        Args:
+            position: Pusher seat (from 0 to n_seats - 2).
+
+        Returns:
+            Push range percentage.
+        """
+        return _range_percentage(self.push[position])
+
+    def call_range(self, position: int, caller: int) -> float:
+        """
+        Get the percentage of hands calling a push.
+
+        Args:
+            position: Pusher seat.
+            caller: Caller seat (after the pusher).
+
+        Returns:
+            Call range percentage.
+        """
+        return _range_percentage(self.call[position, caller])
+
+
+def _range_percentage(frequencies: np.ndarray) -> float:
+    """ Get the percentage of hand combos played with the given frequencies. """
+    return float(frequencies @ _class_combos() / _class_combos().sum() * 100)
+
+
+@functools.lru_cache(maxsize=None)
+def _class_combos() -> np.ndarray:
+    """ Get the number of combos of each hand class. """
+    return np.array([len(hands.class_combos(descr)) for descr in hands.CLASSES])
+
+
+@functools.lru_cache(maxsize=None)
+def _weights() -> np.ndarray:
+    """ Get the combos of each class available against each class. """
+    return equity_table.build_weights()
+
+
+def blinds(n_seats: int) -> np.ndarray:
+    """ Get the blind posted by each seat (in big blinds). """
+    values = np.zeros(n_seats)
+    values[-2:] = [0.5, 1]
+    return values
+
+
+def best_call(push, stack, pot, blind, caller_blind, matrix, weights) -> np.ndarray:
+    """
+    Get the hand classes calling a push.
+
+    Args:
+        push: Push frequencies of each hand class.
+        stack: Stack (in big blinds).
+        pot: Pot before the push (in big blinds).
+        blind: Blind posted by the pusher.
+        caller_blind: Blind posted by the caller.
+        matrix: Class versus class equity matrix.
+        weights: Combos of each class available against each class.
+
+    Returns:
+        Call decision (1 or 0) of each hand class.
+    """
+    total = pot + 2 * stack - blind - caller_blind
+    reach = weights @ push
+    equity = np.divide(
+        (weights * matrix) @ push, reach, out=np.zeros_like(reach), where=reach > 0
+    )
+    return ((reach > 0) & (equity * total - stack + caller_blind > 0)).astype(float)
+
+
+def best_push(calls, stack, pot, blind, callers_blind, matrix, weights) -> np.ndarray:
+    """
+    Get the hand classes pushing when the action folds to them.
+
+    Args:
+        calls: Call frequencies with a row for each player after the pusher.
+        stack: Stack (in big blinds).
+        pot: Pot before the push (in big blinds).
+        blind: Blind posted by the pusher.
+        callers_blind: Blind posted by each player after the pusher.
+        matrix: Class versus class equity matrix.
+        weights: Combos of each class available against each class.
+
+    Returns:
+        Push decision (1 or 0) of each hand class.
+    """
+    combos = weights.sum(axis=1)
+    reach = np.ones(len(combos))
+    value = np.zeros(len(combos))
+    for call, caller_blind in zip(calls, callers_blind):
+        total = pot + 2 * stack - blind - caller_blind
+        showdown = (weights * (matrix * total - stack + blind)) @ call / combos
+        value += reach * showdown
+        reach *= 1 - weights @ call / combos
+    value += reach * pot
+    return (value > 0).astype(float)
+
+
+def solve(
+    n_seats: int, stack: float, ante: float = 12.5, iterations: int = ITERATIONS
+) -> Equilibrium:
+    """
+    Solve the push fold equilibrium by fictitious play.
+
+    Args:
+        n_seats: Number of players in the table.
+        stack: Stack of every player (in big blinds).
+        ante: Ante size (big blind percentage).
+        iterations: Number of fictitious play iterations.
+
+    Returns:
+        Equilibrium.
+    """
+    matrix = equity_table.load_matrix()
+    weights = _weights()
+    seats_blind = blinds(n_seats)
+    pot = 1.5 + n_seats * ante / 100
+    stack = max(stack, 1)
+
+    push = np.ones((n_seats - 1, len(hands.CLASSES)))
+    call = np.zeros((n_seats - 1, n_seats, len(hands.CLASSES)))
+    for position in range(n_seats - 1):
+        blind = seats_blind[position]
+        callers = slice(position + 1, n_seats)
+        for i in range(1, iterations + 1):
+            push_response = best_push(
+                call[position, callers],
+                stack,
+                pot,
+                blind,
+                seats_blind[callers],
+                matrix,
+                weights,
+            )
+            call_response = [
+                best_call(
+                    push[position], stack, pot, blind, caller_blind, matrix, weights
+                )
+                for caller_blind in seats_blind[callers]
+            ]
+            # Average the best responses into the strategies.
+            push[position] += (push_response - push[position]) / (i + 1)
+            calls = call[position, callers]
+            calls += (np.array(call_response) - calls) / (i + 1)
+    return Equilibrium(push, call)
+
+
+def _name(n_seats: int, stack: float, ante: float, iterations: int) -> str:
+    """ Get the name of a solution. """
+    return f"nash_{n_seats}_{stack:g}_{ante:g}_{iterations}"
+
+
+def _file_name(n_seats: int, stack: float, ante: float, iterations: int) -> str:
+    """ Get the file name of a solution. """
+    return _name(n_seats, stack, ante, iterations) + ".npz"
+
+
+def build(
+    path: str = SOLUTIONS_PATH, ante: float = 12.5, iterations: int = ITERATIONS
+):
+    """
+    Solve every table size and stack drawn by the scenarios and save them together.
+
+    Args:
+        path: File path.
+        ante: Ante size (big blind percentage).
+        iterations: Number of fictitious play iterations.
+    """
+    arrays = {}
+    for n_seats in SEATS:
+        for stack in STACKS:
+            solution = solve(n_seats, stack, ante, iterations)
+            name = _name(n_seats, stack, ante, iterations)
+            arrays[f"{name}_push"] = solution.push.astype(np.float16)
+            arrays[f"{name}_call"] = solution.call.astype(np.float16)
+    np.savez_compressed(path, **arrays)
+    shipped.cache_clear()
+    equilibrium.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def shipped(path: str = SOLUTIONS_PATH) -> Dict[str, np.ndarray]:
+    """ Load the shipped solutions (none if the file is missing). """
+    if not os.path.exists(path):
+        return {}
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+@functools.lru_cache(maxsize=None)
+def equilibrium(
+    n_seats: int,
+    stack: float,
+    ante: float = 12.5,
+    iterations: int = ITERATIONS,
+    directory: Optional[str] = None,
+) -> Equilibrium:
+    """
+    Get the push fold equilibrium, solving it only if it is not shipped or saved yet.
+
+    Args:
+        n_seats: Number of players in the table.
+        stack: Stack of every player (in big blinds).
+        ante: Ante size (big blind percentage).
+        iterations: Number of fictitious play iterations.
+        directory: Directory where solutions are saved (defaults to the
+            POKER_COACH_NASH environment variable or DEFAULT_DIR).
+
+    Returns:
+        Equilibrium.
+    """
+    name = _name(n_seats, stack, ante, iterations)
+    solutions = shipped()
+    if f"{name}_push" in solutions:
+        return Equilibrium(
+            solutions[f"{name}_push"].astype(float),
+            solutions[f"{name}_call"].astype(float),
+        )
+
+    directory = directory or os.environ.get("POKER_COACH_NASH", DEFAULT_DIR)
+    path = os.path.join(directory, _file_name(n_seats, stack, ante, iterations))
+    if os.path.exists(path):
+        with np.load(path) as data:
+            return Equilibrium(data["push"], data["call"])
+
+    solution = solve(n_seats, stack, ante, iterations)
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temporary file first so that readers never see a partial file.
+    temporary = f"{path}.{os.getpid()}.npz"
+    np.savez(temporary, push=solution.push, call=solution.call)
+    os.replace(temporary, path)
+    return solution
+
+
+def main():
+    """ Solve the shipped equilibria from the command line. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--path", default=SOLUTIONS_PATH)
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    args = parser.parse_args()
+    build(path=args.path, iterations=args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Background prefetching.
+
+Work is submitted ahead of time to a thread pool and keyed by its inputs, so that
+asking for it later returns the result already computed (or waits for the rest of
+it). Work for keys that are no longer relevant is cancelled if it has not started,
+and long running work polls a stop event of its key to give up once it is dropped.
+Each kind of work may have its own pool, so that quick work never waits behind
+long running work.
+"""
+
+import functools
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+MAX_WORKERS: int = 2
+
+
+@functools.lru_cache(maxsize=None)
+def executor(name: str) -> ThreadPoolExecutor:
+    """ Get a process wide thread pool by name. """
+    return ThreadPoolExecutor(
+        max_workers=MAX_WORKERS, thread_name_prefix=f"prefetch-{name}"
+    )
+
+
+def default_executor() -> ThreadPoolExecutor:
+    """ Get the process wide prefetch thread pool. """
+    return executor("default")
+
+
+class Prefetcher:
+    """ Keyed background work. """
+
+    def __init__(self, executor: Optional[Executor] = None):
+        """
+        Args:
+            executor: Executor running the work (defaults to a shared thread pool).
+        """
+        self._executor = executor or default_executor()
+        self._futures: Dict[Hashable, Future] = {}
+        self._stops: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._futures
+
+    def __len__(self):
+        with self._lock:
+            return len(self._futures)
+
+    def submit(self, key: Hashable, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Start work in the background unless work with the same key already exists.
+
+        Args:
+            key: Work key, which should identify every input of the work.
+            fn: Function to call.
+            *args: Function positional arguments.
+            **kwargs: Function keyword arguments.
+
+        Returns:
+            Future of the work.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or future.cancelled():
+                future = self._executor.submit(fn, *args, **kwargs)
+                self._futures[key] = future
+            return future
+
+    def stop_event(self, key: Hashable) -> threading.Event:
+        """
+        Get the event set once the work of a key is dropped (see retain).
+
+        Cancelling only prevents work that has not started, so long running work
+        should check this event and give up once it is set.
+
+        Args:
+            key: Work key.
+
+        Returns:
+            Stop event.
+        """
+        with self._lock:
+            return self._stops.setdefault(key, threading.Event())
+
+    def result(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """ Get the result of the work, starting it if it does not exist yet. """
+        return self.submit(key, fn, *args, **kwargs).result()
+
+    def retain(self, keys: Iterable[Hashable]):
+        """
+        Forget the work of every other key, cancelling it if it has not started and
+        setting its stop event.
+
+        Args:
+            keys: Keys of the work to keep.
+        """
+        keys = set(keys)
+        with self._lock:
+            for key in list(self._futures):
+                if key not in keys:
+                    self._futures.pop(key).cancel()
+            for key in list(self._stops):
+                if key not in keys:
+                    self._stops.pop(key).set()
@@ -0,0 +1,92 @@
+"""
+Range versus range equities.
+
+Ranges are weight vectors over the 1326 two cards combos (see
+poker_coach.hands.COMBOS). The equity of a combo against another one is taken from
+the precomputed hand class versus hand class matrix, and combos sharing a card are
+masked out, so each equity is a matrix product instead of a simulation. Card
+removal is exact at the combo level, but the equities are approximate at the class
+level: every combo of a class has the same equity against every combo of another
+class, which ignores suit interactions such as shared flush draws.
+"""
+
+import functools
+from typing import Union
+
+import numpy as np
+
+from . import equity_table, hands, ranges
+
+# Hand, or weights of each combo.
+Range = Union[str, np.ndarray]
+
+
+@functools.lru_cache(maxsize=None)
+def combo_matrix() -> np.ndarray:
+    """ Get the equity of each combo (rows) against each combo (columns). """
+    classes = hands.COMBO_CLASSES
+    return equity_table.load_matrix()[classes][:, classes].astype(np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def compatible() -> np.ndarray:
+    """ Get a mask of the combos pairs without a shared card. """
+    bits = np.left_shift(np.uint64(1), hands.COMBOS.astype(np.uint64)).sum(axis=1)
+    return (bits[:, None] & bits[None, :]) == 0
+
+
+def weights(rng: Range) -> np.ndarray:
+    """
+    Get the combo weights of a hand or a weights vector.
+
+    Args:
+        rng: Two cards hand (such as "AsKd") or weights of each combo.
+
+    Returns:
+        Weights of each combo.
+    """
+    if isinstance(rng, str):
+        values = np.zeros(len(hands.COMBOS))
+        values[hands.combo_index(rng)] = 1
+        return values
+    return np.asarray(rng, dtype=float)
+
+
+def blocked(hand: str) -> np.ndarray:
+    """ Get a mask of the combos sharing a card with a hand. """
+    return ranges.blockers(hand).mask
+
+
+def equity(hero: Range, villain: Range) -> float:
+    """
+    Calculate the equity of a range against another range.
+
+    Args:
+        hero: Hero hand or combo weights.
+        villain: Villain hand or combo weights.
+
+    Returns:
+        Hero equity.
+    """
+    return float(equities(hero, weights(villain)[None])[0])
+
+
+def equities(hero: Range, villains: np.ndarray) -> np.ndarray:
+    """
+    Calculate the equity of a range against each of many ranges.
+
+    Args:
+        hero: Hero hand or combo weights.
+        villains: Combo weights with a row for each villain range.
+
+    Returns:
+        Hero equity against each villain range.
+    """
+    hero = weights(hero)
+    villains = np.atleast_2d(villains)
+    rows = np.flatnonzero(hero)
+    # Weight of each pair of combos, dropping pairs that share a card.
+    pairs = hero[rows, None] * compatible()[rows]
+    total = (pairs @ villains.T).sum(axis=0)
+    wins = ((pairs * combo_matrix()[rows]) @ villains.T).sum(axis=0)
+    return np.divide(wins, total, out=np.full(len(villains), np.nan), where=total > 0)
@@ -0,0 +1,136 @@
+"""
+Hand ranges as bit masks.
+
+Every two cards combo (see poker_coach.hands.COMBOS) has a bit, so a range is an
+integer with the bits of its combos set. Membership is a bit test, intersections
+and unions are bitwise operations, and removing the combos blocked by a hand is a
+mask with the precomputed bits of each card. The bits of every top percentage range
+are precomputed per number of hand classes.
+"""
+
+from typing import Iterable, List, Union
+
+import numpy as np
+
+from . import hands
+from .cards import DECK
+
+N_COMBOS: int = len(hands.COMBOS)
+
+
+def _bits(mask: np.ndarray) -> int:
+    """ Pack a boolean mask over the combos into an integer. """
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+# Bits of the combos holding each card.
+CARD_BITS: List[int] = [
+    _bits((hands.COMBOS == card).any(axis=1)) for card in range(len(DECK))
+]
+
+# Bits of the top classes, indexed by the number of classes.
+_TOP_BITS: List[int] = [
+    _bits(hands.COMBO_CLASSES < n) for n in range(len(hands.CLASSES) + 1)
+]
+
+
+def _combo(hand: Union[str, int]) -> int:
+    """ Get the combo index of a hand or combo index. """
+    if isinstance(hand, str):
+        return hands.combo_index(hand)
+    return int(hand)
+
+
+class Range:
+    """ Set of two cards combos. """
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, bits: int = 0):
+        """
+        Args:
+            bits: Integer with the bit of each combo in the range set.
+        """
+        self._bits = bits
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "Range":
+        """ Create a range from a boolean mask over the combos. """
+        return cls(_bits(np.asarray(mask, dtype=bool)))
+
+    @classmethod
+    def from_hands(cls, hands_: Iterable[Union[str, int]]) -> "Range":
+        """ Create a range from hands (such as "AsKd") or combo indexes. """
+        bits = 0
+        for hand in hands_:
+            bits |= 1 << _combo(hand)
+        return cls(bits)
+
+    @property
+    def bits(self) -> int:
+        """ Get the integer with the bit of each combo in the range set. """
+        return self._bits
+
+    @property
+    def mask(self) -> np.ndarray:
+        """ Get a boolean mask over the combos. """
+        data = self._bits.to_bytes(-(-N_COMBOS // 8), "little")
+        bits = np.unpackbits(np.frombuffer(data, np.uint8), bitorder="little")
+        return bits[:N_COMBOS].astype(bool)
+
+    @property
+    def weights(self) -> np.ndarray:
+        """ Get the weight of each combo. """
+        return self.mask.astype(float)
+
+    @property
+    def percentage(self) -> float:
+        """ Get the percentage of combos in the range. """
+        return len(self) / N_COMBOS * 100
+
+    def without(self, hand: Union[str, int]) -> "Range":
+        """ Remove the combos sharing a card with a hand. """
+        return self - blockers(hand)
+
+    def __contains__(self, hand: Union[str, int]) -> bool:
+        return bool(self._bits >> _combo(hand) & 1)
+
+    def __len__(self):
+        return bin(self._bits).count("1")
+
+    def __and__(self, other: "Range") -> "Range":
+        return Range(self._bits & other.bits)
+
+    def __or__(self, other: "Range") -> "Range":
+        return Range(self._bits | other.bits)
+
+    def __sub__(self, other: "Range") -> "Range":
+        return Range(self._bits & ~other.bits)
+
+    def __eq__(self, other):
+        return isinstance(other, Range) and self._bits == other.bits
+
+    def __hash__(self):
+        return hash(self._bits)
+
+    def __repr__(self):
+        return f"Range({len(self)} combos)"
+
+
+def top(percentage: float) -> Range:
+    """
+    Get the range of the top percentage of hands (see poker_coach.hands.top_classes).
+
+    Args:
+        percentage: Range percentage.
+
+    Returns:
+        Range.
+    """
+    return Range(_TOP_BITS[hands.top_classes(percentage)])
+
+
+def blockers(hand: Union[str, int]) -> Range:
+    """ Get the range of the combos sharing a card with a hand or combo index. """
+    high, low = hands.COMBOS[_combo(hand)]
+    return Range(CARD_BITS[high] | CARD_BITS[low])
@@ -0,0 +1,434 @@
+"""
+Vectorized Monte Carlo equity simulation.
+
+Every run deals a single stub of seven cards shared by all villains (common random
+numbers), so the comparison between villains is not blurred by different boards.
+Each villain board is made of the first five stub cards that the villain does not
+hold, which keeps every heads-up match up unbiased.
+
+Simulations may be split across a pool of worker processes. Each worker gets its
+own seed spawned from the random state, so results are reproducible for a given
+random state and number of workers.
+"""
+
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from statistics import NormalDist
+from typing import AsyncIterator, Dict, Iterator, List, NamedTuple, Optional
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from . import cards, evaluator, hands
+
+# Number of hero against villain runs simulated at once.
+CHUNK_SIZE: int = 100000
+ADAPTIVE_CHUNK_SIZE: int = 1000
+
+_STUB_SIZE: int = 7
+_BOARD_SIZE: int = 5
+
+# Worker pools live as long as the interpreter, so they are started only once.
+_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+class Estimate(NamedTuple):
+    """ Monte Carlo equity estimate. """
+
+    equity: np.ndarray
+    stderr: np.ndarray
+    runs: int
+
+
+def villains_combos(hero: np.ndarray, villains_range: Sequence[float]) -> List:
+    """
+    Get the combos each villain may hold.
+
+    Args:
+        hero: Hero integer cards.
+        villains_range: Villain ranges.
+
+    Returns:
+        List with an array of integer card pairs for each villain.
+    """
+    available = ~np.isin(hands.COMBOS, hero).any(axis=1)
+    return [
+        hands.COMBOS[available & hands.top_range(rng)[hands.COMBO_CLASSES]]
+        for rng in villains_range
+    ]
+
+
+def simulate_chunk(
+    hero: np.ndarray,
+    combos: Sequence[np.ndarray],
+    size: int,
+    random_state: np.random.Generator,
+) -> np.ndarray:
+    """
+    Simulate hero against every villain on shared boards.
+
+    Args:
+        hero: Hero integer cards.
+        combos: Combos each villain may hold.
+        size: Number of runs.
+        random_state: Random generator.
+
+    Returns:
+        Array with villains as rows and runs as columns, where a hero win is 1, a
+        tie is 0.5 and a loss is 0.
+    """
+    deck = np.setdiff1d(np.arange(len(cards.DECK)), hero)
+
+    # First cards from a random permutation of the deck.
+    keys = random_state.random((size, len(deck)))
+    stub = np.argpartition(keys, _STUB_SIZE, axis=1)[:, :_STUB_SIZE]
+    order = np.argsort(np.take_along_axis(keys, stub, axis=1), axis=1)
+    stub = deck[np.take_along_axis(stub, order, axis=1)]
+
+    villains = np.stack(
+        [combo[random_state.integers(len(combo), size=size)] for combo in combos]
+    )
+    held = (stub == villains[..., :1]) | (stub == villains[..., 1:])
+    kept = ~held & (np.cumsum(~held, axis=-1) <= _BOARD_SIZE)
+    boards = np.broadcast_to(stub, held.shape)[kept].reshape(len(combos), size, -1)
+
+    heros = np.broadcast_to(hero, villains.shape)
+    values = evaluator.evaluate(
+        np.stack(
+            [
+                np.concatenate([heros, boards], axis=-1),
+                np.concatenate([villains, boards], axis=-1),
+            ]
+        )
+    )
+    return (values[0] > values[1]) + (values[0] == values[1]) / 2
+
+
+def simulate_sums(
+    hero: np.ndarray,
+    combos: Sequence[np.ndarray],
+    times: int,
+    random_state: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate hero against every villain and sum the scores.
+
+    Args:
+        hero: Hero integer cards.
+        combos: Combos each villain may hold.
+        times: Number of Monte Carlo runs.
+        random_state: Random generator.
+
+    Returns:
+        Tuple with the sum of scores and the sum of squared scores of each villain.
+    """
+    total = np.zeros(len(combos))
+    total_sq = np.zeros(len(combos))
+    if not combos:
+        return total, total_sq
+    chunk_size = max(CHUNK_SIZE // len(combos), 1)
+    for start in range(0, times, chunk_size):
+        size = min(chunk_size, times - start)
+        scores = simulate_chunk(hero, combos, size, random_state)
+        total += scores.sum(axis=1)
+        total_sq += np.square(scores).sum(axis=1)
+    return total, total_sq
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """ Get a process pool with the number of workers, starting it if needed. """
+    with _POOLS_LOCK:
+        if workers not in _POOLS:
+            _POOLS[workers] = ProcessPoolExecutor(workers, initializer=evaluator.tables)
+        return _POOLS[workers]
+
+
+def _seed_sequence(random_state) -> np.random.SeedSequence:
+    """
+    Get a seed sequence from a random state.
+
+    A given seed sequence is copied, since spawning children changes it and a second
+    simulation with it would draw other runs.
+    """
+    if isinstance(random_state, np.random.SeedSequence):
+        return np.random.SeedSequence(
+            random_state.entropy,
+            spawn_key=random_state.spawn_key,
+            pool_size=random_state.pool_size,
+            n_children_spawned=random_state.n_children_spawned,
+        )
+    return np.random.SeedSequence(random_state)
+
+
+def _split(times: int, workers: int) -> List[int]:
+    """ Split runs as evenly as possible between workers. """
+    return [times // workers + (i < times % workers) for i in range(workers)]
+
+
+def _ranges_sums(
+    hero_hand: str,
+    villains_range: Sequence[float],
+    times: int,
+    seed: np.random.SeedSequence,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """ Simulate and sum scores from hands (runs in the worker processes). """
+    hero = cards.encode(hero_hand)
+    combos = villains_combos(hero, villains_range)
+    return simulate_sums(hero, combos, times, np.random.default_rng(seed))
+
+
+def _parallel_sums(
+    hero_hand: str,
+    villains_range: Sequence[float],
+    sizes: Sequence[int],
+    seed: np.random.SeedSequence,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """ Simulate and sum scores with a worker for each size. """
+    pool = get_pool(len(sizes))
+    futures = [
+        pool.submit(_ranges_sums, hero_hand, villains_range, size, child)
+        for size, child in zip(sizes, seed.spawn(len(sizes)))
+        if size
+    ]
+    results = [future.result() for future in futures]
+    return (
+        np.sum([total for total, _ in results], axis=0),
+        np.sum([total_sq for _, total_sq in results], axis=0),
+    )
+
+
+def eval_combos(
+    hero: np.ndarray,
+    combos: Sequence[np.ndarray],
+    times: int = 10000,
+    random_state: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Evaluate chances of hero winning against the combos each villain may hold.
+
+    Args:
+        hero: Hero integer cards.
+        combos: Combos each villain may hold.
+        times: Number of Monte Carlo runs.
+        random_state: Random state.
+
+    Returns:
+        Equity against each villain.
+    """
+    random_state = np.random.default_rng(random_state)
+    total, _ = simulate_sums(hero, combos, times, random_state)
+    return total / times
+
+
+def eval_ranges(
+    hero_hand: str,
+    villains_range: Sequence[float],
+    times: int = 10000,
+    random_state: Optional[int] = None,
+    workers: int = 1,
+) -> np.ndarray:
+    """
+    Evaluate chances of hero winning against each villain range.
+
+    Args:
+        hero_hand: Hero hand.
+        villains_range: Villain ranges.
+        times: Number of Monte Carlo runs.
+        random_state: Random state.
+        workers: Number of worker processes.
+
+    Returns:
+        Equity against each villain.
+    """
+    if workers > 1 and len(villains_range):
+        seed = _seed_sequence(random_state)
+        total, _ = _parallel_sums(
+            hero_hand, villains_range, _split(times, workers), seed
+        )
+        return total / times
+    hero = cards.encode(hero_hand)
+    combos = villains_combos(hero, villains_range)
+    return eval_combos(hero, combos, times=times, random_state=random_state)
+
+
+def iter_estimates(
+    hero_hand: str,
+    villains_range: Sequence[float],
+    times: int = 10000,
+    chunk_size: Optional[int] = None,
+    random_state: Optional[int] = None,
+    workers: int = 1,
+) -> Iterator[Estimate]:
+    """
+    Estimate chances of hero winning against each villain range chunk by chunk.
+
+    Args:
+        hero_hand: Hero hand.
+        villains_range: Villain ranges.
+        times: Maximum number of Monte Carlo runs.
+        chunk_size: Number of runs per chunk (all of them at once if None).
+        random_state: Random state.
+        workers: Number of worker processes, each of them simulating a chunk.
+
+    Yields:
+        Equity estimate after each chunk.
+    """
+    hero = cards.encode(hero_hand)
+    combos = villains_combos(hero, villains_range)
+    seed = _seed_sequence(random_state)
+    generator = np.random.default_rng(seed)
+
+    total = np.zeros(len(combos))
+    total_sq = np.zeros(len(combos))
+    runs = 0
+    while combos and runs < times:
+        step = times - runs
+        if chunk_size is not None:
+            step = min(chunk_size * workers, step)
+        if workers > 1:
+            sizes = _split(step, workers)
+            sums = _parallel_sums(hero_hand, villains_range, sizes, seed)
+        else:
+            sums = simulate_sums(hero, combos, step, generator)
+        total += sums[0]
+        total_sq += sums[1]
+        runs += step
+
+        mean = total / runs
+        stderr = np.sqrt(np.maximum(total_sq / runs - mean ** 2, 0) / runs)
+        yield Estimate(mean, stderr, runs)
+
+
+def settled(
+    estimate: Estimate,
+    target_se: Optional[float] = None,
+    break_even: Optional[Sequence[float]] = None,
+    confidence: float = 0.95,
+) -> bool:
+    """
+    Check if an estimate is precise enough to stop simulating.
+
+    The action is right when the hero equity is above the break even against every
+    villain, so it is settled once every confidence interval is above its break
+    even or any of them is below it.
+
+    Args:
+        estimate: Equity estimate.
+        target_se: Target standard error.
+        break_even: Break even equity against each villain.
+        confidence: Decision confidence level.
+
+    Returns:
+        True if the standard errors reached the target or the action is settled.
+    """
+    if target_se is not None and (estimate.stderr <= target_se).all():
+        return True
+    if break_even is not None:
+        z_score = NormalDist().inv_cdf(0.5 + confidence / 2)
+        lower = estimate.equity - z_score * estimate.stderr
+        upper = estimate.equity + z_score * estimate.stderr
+        return bool((lower > break_even).all() or (upper < break_even).any())
+    return False
+
+
+def estimate_ranges(
+    hero_hand: str,
+    villains_range: Sequence[float],
+    times: int = 10000,
+    target_se: Optional[float] = None,
+    break_even: Optional[Sequence[float]] = None,
+    confidence: float = 0.95,
+    random_state: Optional[int] = None,
+    workers: int = 1,
+) -> Estimate:
+    """
+    Estimate chances of hero winning against each villain range, stopping early.
+
+    Runs are simulated in chunks until the standard error of every equity is at
+    most the target or until the action decision is settled (see settled). With
+    several workers, each of them simulates a chunk per step.
+
+    Args:
+        hero_hand: Hero hand.
+        villains_range: Villain ranges.
+        times: Maximum number of Monte Carlo runs.
+        target_se: Target standard error.
+        break_even: Break even equity against each villain.
+        confidence: Decision confidence level.
+        random_state: Random state.
+        workers: Number of worker processes.
+
+    Returns:
+        Equity estimate.
+    """
+    adaptive = target_se is not None or break_even is not None
+    n_villains = len(villains_range)
+    estimate = Estimate(np.zeros(n_villains), np.zeros(n_villains), 0)
+    estimates = iter_estimates(
+        hero_hand,
+        villains_range,
+        times=times,
+        chunk_size=ADAPTIVE_CHUNK_SIZE if adaptive else None,
+        random_state=random_state,
+        workers=workers,
+    )
+    for estimate in estimates:
+        if settled(estimate, target_se, break_even, confidence):
+            break
+    return estimate
+
+
+async def aiter_estimates(
+    hero_hand: str,
+    villains_range: Sequence[float],
+    times: int = 10000,
+    chunk_size: int = ADAPTIVE_CHUNK_SIZE,
+    target_se: Optional[float] = None,
+    break_even: Optional[Sequence[float]] = None,
+    confidence: float = 0.95,
+    random_state: Optional[int] = None,
+    workers: int = 1,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Estimate]:
+    """
+    Estimate chances of hero winning against each villain range asynchronously.
+
+    Each chunk runs in an executor, so the event loop keeps running meanwhile, and
+    cancelling the consumer stops the simulation after the running chunk.
+
+    Args:
+        hero_hand: Hero hand.
+        villains_range: Villain ranges.
+        times: Maximum number of Monte Carlo runs.
+        chunk_size: Number of runs per chunk.
+        target_se: Stop once every standard error is at most this value.
+        break_even: Stop once the decision against these break even equities is
+            settled.
+        confidence: Decision confidence level.
+        random_state: Random state.
+        workers: Number of worker processes.
+        executor: Executor running the chunks (the event loop default if None).
+
+    Yields:
+        Equity estimate after each chunk, the last one being the final estimate.
+    """
+    # Only callers already running an event loop need asyncio.
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    loop = asyncio.get_running_loop()
+    estimates = iter_estimates(
+        hero_hand,
+        villains_range,
+        times=times,
+        chunk_size=chunk_size,
+        random_state=random_state,
+        workers=workers,
+    )
+    while True:
+        estimate = await loop.run_in_executor(executor, next, estimates, None)
+        if estimate is None:
+            return
+        yield estimate
+        if settled(estimate, target_se, break_even, confidence):
+            return
@@ -0,0 +1,272 @@
+"""
+Bounded in-memory result store.
+
+Results (such as scenario evaluations and rendered figures) are kept in memory and
+shared by every thread of the process. The store has a memory budget, enforced by
+evicting the least recently used entries, and entries may expire after a time to
+live. Computing a missing result holds a lock of its own key, so concurrent
+callers asking for the same key wait for a single computation instead of repeating
+it, while other keys are computed in parallel.
+"""
+
+import collections
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+
+import numpy as np
+
+DEFAULT_MAX_SIZE: int = 256 * 2 ** 20
+
+
+class StoreStats(NamedTuple):
+    """ Result store statistics. """
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    size: int
+    max_size: int
+
+
+class _Entry(NamedTuple):
+    """ Stored value, its size in bytes and when it expires. """
+
+    value: Any
+    size: int
+    expires: float
+
+
+class _KeyLock:
+    """ Lock of a key and the number of threads using it. """
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+def sizeof(value: Any) -> int:
+    """
+    Estimate the memory used by a value.
+
+    Arrays, bytes and strings count their data, containers count their items and
+    data frames count their (deep) memory usage. Anything else counts its own size.
+
+    Args:
+        value: Value.
+
+    Returns:
+        Size in bytes.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sizeof(key) + sizeof(item) for key, item in value.items()
+        )
+    if hasattr(value, "memory_usage"):
+        # Data frames.
+        return int(np.sum(value.memory_usage(deep=True)))
+    return sys.getsizeof(value)
+
+
+class Store:
+    """ Thread-safe least recently used result store with a memory budget. """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl: Optional[float] = None,
+        size: Callable[[Any], int] = sizeof,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_size: Memory budget in bytes.
+            ttl: Default time to live of the entries in seconds (None to keep them
+                until evicted).
+            size: Function estimating the size in bytes of a value.
+            clock: Function returning the current time in seconds.
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._sizeof = size
+        self._clock = clock
+        self._entries: "collections.OrderedDict[Hashable, _Entry]" = (
+            collections.OrderedDict()
+        )
+        self._key_locks: Dict[Hashable, _KeyLock] = {}
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def max_size(self) -> int:
+        """ Get the memory budget in bytes. """
+        return self._max_size
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """ Get the default time to live of the entries in seconds. """
+        return self._ttl
+
+    @property
+    def size(self) -> int:
+        """ Get the estimated memory used by the entries in bytes. """
+        return self._size
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._lookup(key, count=False) is not None
+
+    def stats(self) -> StoreStats:
+        """ Get store statistics. """
+        with self._lock:
+            return StoreStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._expirations,
+                len(self._entries),
+                self._size,
+                self._max_size,
+            )
+
+    def _lookup(self, key: Hashable, count: bool = True) -> Optional[_Entry]:
+        """ Get a live entry and mark it as recently used. Hold the store lock. """
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires <= self._clock():
+            self._remove(key)
+            self._expirations += 1
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        if count:
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return entry
+
+    def _remove(self, key: Hashable):
+        """ Remove an entry. Hold the store lock. """
+        self._size -= self._entries.pop(key).size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a stored value.
+
+        Args:
+            key: Value key.
+            default: Value returned if the key is missing or expired.
+
+        Returns:
+            Stored value.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+        return default if entry is None else entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value, evicting the least recently used ones beyond the budget.
+
+        Values larger than the whole budget are not stored.
+
+        Args:
+            key: Value key.
+            value: Value.
+            ttl: Time to live in seconds (the store default if None).
+        """
+        size = self._sizeof(value)
+        ttl = self._ttl if ttl is None else ttl
+        expires = float("inf") if ttl is None else self._clock() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self._max_size:
+                return
+            self._entries[key] = _Entry(value, size, expires)
+            self._size += size
+            while self._size > self._max_size:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def delete(self, key: Hashable):
+        """ Remove a value if it is stored. """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        """ Remove every entry and reset the statistics. """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._expirations = 0
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        fn: Callable,
+        *args,
+        ttl: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Get a stored value, computing and storing it if it is missing.
+
+        Concurrent calls with the same key wait for a single computation. If it
+        raises, nothing is stored and the next waiting call computes the value.
+
+        Args:
+            key: Value key, which should identify every input of the function.
+            fn: Function computing the value.
+            *args: Function positional arguments.
+            ttl: Time to live in seconds (the store default if None).
+            **kwargs: Function keyword arguments.
+
+        Returns:
+            Stored or computed value.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry.value
+            key_lock = self._key_locks.setdefault(key, _KeyLock())
+            key_lock.users += 1
+
+        try:
+            with key_lock.lock:
+                # Another thread may have computed it while this one waited.
+                with self._lock:
+                    entry = self._lookup(key, count=False)
+                if entry is not None:
+                    return entry.value
+                value = fn(*args, **kwargs)
+                self.set(key, value, ttl=ttl)
+                return value
+        finally:
+            with self._lock:
+                key_lock.users -= 1
+                if not key_lock.users:
+                    del self._key_locks[key]
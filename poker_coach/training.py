@@ -0,0 +1,303 @@
+"""
+Equity model training.
+
+The equity model (see poker_coach.model) predicts the hero equity from the hero
+hand percentage and the villain range percentage. Training data is labelled with
+the class versus range equities of the precomputed class matrix (see
+poker_coach.range_equity), which is exact up to the matrix precision and takes a
+fraction of a second for every pair of hand class and range. A set of compact
+regressors is fitted, and the smallest one (by pickled size) whose held-out mean
+and maximum errors and prediction latency meet the targets is saved, next to a JSON
+report of every candidate and the targets. The model is rebuilt with:
+
+    python -m poker_coach.training
+
+which also reports the errors of the selected model against Monte Carlo.
+"""
+
+import argparse
+import functools
+import json
+import os
+import pickle
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from . import grid, hands, model, range_equity, ranges, simulation
+
+SAMPLES: int = 50000
+TARGET_ERROR: float = 0.01
+TARGET_MAX_ERROR: float = 0.1
+MAX_LATENCY: float = 0.001
+
+# Smallest villain range percentage, as the scenarios draw them.
+MIN_RANGE: float = 1
+
+
+class Candidate(NamedTuple):
+    """ Fitted regressor evaluation. """
+
+    name: str
+    mean_error: float
+    max_error: float
+    latency: float
+    size: int
+    accepted: bool
+
+
+@functools.lru_cache(maxsize=None)
+def class_equities() -> np.ndarray:
+    """
+    Get the equity of each hand class against the top ranges of each size.
+
+    Returns:
+        Array with a row for each hand class and a column for each number of
+        classes in the villain range (from 1).
+    """
+    tops = np.array(
+        [ranges.top(percentage).weights for percentage in hands.PERCENTAGES]
+    )
+    return np.array(
+        [
+            range_equity.equities((hands.COMBO_CLASSES == i).astype(float), tops)
+            for i in range(len(hands.CLASSES))
+        ]
+    )
+
+
+def dataset(
+    samples: int = SAMPLES, random_state: Optional[int] = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draw random hero hand classes and villain ranges and label their equities.
+
+    Args:
+        samples: Number of samples.
+        random_state: Random state.
+
+    Returns:
+        Features (see poker_coach.model.features) and equities.
+    """
+    r = np.random.default_rng(random_state)
+    hero = r.integers(0, len(hands.CLASSES), samples)
+    villain = r.uniform(MIN_RANGE, 100, samples)
+    n_classes = hands.top_classes(villain)
+    x = np.column_stack([hands.PERCENTAGES[hero], villain])
+    return x, class_equities()[hero, n_classes - 1]
+
+
+def candidates(random_state: Optional[int] = 0) -> Dict[str, Any]:
+    """ Get the unfitted candidate regressors, from the simplest. """
+    estimators = {
+        f"tree (depth {depth})": DecisionTreeRegressor(
+            max_depth=depth, random_state=random_state
+        )
+        for depth in (6, 8, 10, 12, 14)
+    }
+    estimators["tree"] = DecisionTreeRegressor(
+        min_samples_leaf=3, random_state=random_state
+    )
+    for iterations in (50, 300):
+        estimators[f"gradient boosting ({iterations})"] = HistGradientBoostingRegressor(
+            max_iter=iterations, random_state=random_state
+        )
+    estimators["random forest"] = RandomForestRegressor(
+        n_estimators=20, min_samples_leaf=2, random_state=random_state
+    )
+    return estimators
+
+
+def latency(estimator, repeat: int = 200) -> float:
+    """ Get the mean time (in seconds) of a single prediction. """
+    x = model.features("AsKd", [20])
+    estimator.predict(x)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        estimator.predict(x)
+    return (time.perf_counter() - start) / repeat
+
+
+def size(estimator) -> int:
+    """ Get the pickled size (in bytes) of an estimator. """
+    return len(pickle.dumps(estimator, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def train(
+    samples: int = SAMPLES,
+    target_error: float = TARGET_ERROR,
+    target_max_error: float = TARGET_MAX_ERROR,
+    max_latency: float = MAX_LATENCY,
+    random_state: Optional[int] = 0,
+    estimators: Optional[Dict[str, Any]] = None,
+) -> Tuple[Any, List[Candidate]]:
+    """
+    Fit every candidate and select the smallest one meeting the targets.
+
+    A fifth of the samples is held out to measure the errors.
+
+    Args:
+        samples: Number of samples.
+        target_error: Maximum held-out mean absolute error.
+        target_max_error: Maximum held-out absolute error.
+        max_latency: Maximum time (in seconds) of a single prediction.
+        random_state: Random state.
+        estimators: Unfitted candidate regressors (see candidates if None).
+
+    Returns:
+        Selected estimator and the evaluation of every candidate.
+    """
+    x, y = dataset(samples, random_state)
+    n_train = samples * 4 // 5
+
+    fitted = {}
+    results = []
+    if estimators is None:
+        estimators = candidates(random_state)
+    for name, estimator in estimators.items():
+        estimator.fit(x[:n_train], y[:n_train])
+        errors = np.abs(estimator.predict(x[n_train:]) - y[n_train:])
+        seconds = latency(estimator)
+        fitted[name] = estimator
+        results.append(
+            Candidate(
+                name,
+                float(errors.mean()),
+                float(errors.max()),
+                seconds,
+                size(estimator),
+                bool(
+                    errors.mean() <= target_error
+                    and errors.max() <= target_max_error
+                    and seconds <= max_latency
+                ),
+            )
+        )
+
+    accepted = [result for result in results if result.accepted]
+    if not accepted:
+        raise ValueError(
+            f"No candidate meets a {target_error} mean error, "
+            f"a {target_max_error} maximum error "
+            f"and a {max_latency * 1000} ms latency."
+        )
+    best = min(accepted, key=lambda result: result.size)
+    return fitted[best.name], results
+
+
+def save(
+    estimator,
+    results: List[Candidate],
+    path: str = model.MODEL_PATH,
+    report_path: Optional[str] = None,
+    **extra,
+):
+    """
+    Save the selected estimator and a JSON report of every candidate.
+
+    Args:
+        estimator: Selected estimator.
+        results: Evaluation of every candidate.
+        path: Model file path.
+        report_path: Report file path (the model path with a .json extension if
+            None).
+        **extra: Other report values.
+    """
+    joblib.dump(estimator, path)
+    report = {
+        "selected": min(
+            (result for result in results if result.accepted),
+            key=lambda result: result.size,
+        ).name,
+        "candidates": [result._asdict() for result in results],
+        "sklearn": sklearn.__version__,
+        **extra,
+    }
+    with open(report_path or os.path.splitext(path)[0] + ".json", "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def report_simulation(
+    estimator, samples: int = 200, times: int = 20000
+) -> grid.Report:
+    """
+    Compare an estimator with Monte Carlo simulations on random hands and ranges.
+
+    Args:
+        estimator: Equity model.
+        samples: Number of random samples.
+        times: Number of Monte Carlo runs per sample.
+
+    Returns:
+        Errors against Monte Carlo (including the Monte Carlo noise).
+    """
+    r = np.random.default_rng(1)
+    hero = r.choice(len(hands.CLASSES), samples)
+    villain = r.uniform(MIN_RANGE, 100, samples)
+    hero_hands = [hands.class_combos(hands.CLASSES[i])[0] for i in hero]
+    expected = [
+        simulation.eval_ranges(hand, [rng], times=times, random_state=i)[0]
+        for i, (hand, rng) in enumerate(zip(hero_hands, villain))
+    ]
+    predicted = [
+        estimator.predict(model.features(hand, [rng]))[0]
+        for hand, rng in zip(hero_hands, villain)
+    ]
+    errors = np.abs(np.array(predicted) - np.array(expected))
+    return grid.Report(float(errors.max()), float(errors.mean()))
+
+
+def main():
+    """ Train the equity model from the command line and report the candidates. """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument("--target-error", type=float, default=TARGET_ERROR)
+    parser.add_argument("--target-max-error", type=float, default=TARGET_MAX_ERROR)
+    parser.add_argument("--max-latency", type=float, default=MAX_LATENCY)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--path", default=model.MODEL_PATH)
+    args = parser.parse_args()
+
+    estimator, results = train(
+        samples=args.samples,
+        target_error=args.target_error,
+        target_max_error=args.target_max_error,
+        max_latency=args.max_latency,
+        random_state=args.seed,
+    )
+    print(f"{'candidate':<24} {'mean':>7} {'max':>7} {'latency':>10} {'size':>10}")
+    for result in results:
+        print(
+            f"{result.name:<24} {result.mean_error:>7.4f} {result.max_error:>7.4f} "
+            f"{result.latency * 1e6:>8.0f}us {result.size / 1024:>8.0f}kB"
+            f"{'' if result.accepted else ' (rejected)'}"
+        )
+
+    errors = report_simulation(estimator)
+    print(
+        f"Monte Carlo: max error {errors.max_error:.4f}, "
+        f"mean {errors.mean_error:.4f}"
+    )
+    save(
+        estimator,
+        results,
+        path=args.path,
+        samples=args.samples,
+        seed=args.seed,
+        targets={
+            "mean_error": args.target_error,
+            "max_error": args.target_max_error,
+            "latency": args.max_latency,
+        },
+        simulation=errors._asdict(),
+    )
+    model.load.cache_clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 """ Poker coach web user ui. """
 
-import joblib
+import io
+import os
+import time
+from concurrent.futures import CancelledError
 
 import streamlit as st
 import numpy as np
@@ -8,14 +11,23 @@ import pandas as pd
 
 import st_state_patch
 import poker_coach
-from poker_coach import handviz
+from poker_coach import handviz, prefetch, simulation
 
 exception = None
 
+# Draws and evaluations shared by every session, as scenarios are keyed by their
+# settings and random state.
+store = st.GlobalStore(key="results", max_size=64 * 2 ** 20, ttl=60 * 60)
+
 # Session State
 s = st.State()
 if not s:
     s.random_state = np.random.randint(0, 1e9)
+    s.next_random_state = np.random.randint(0, 1e9)
+    # Draws have their own threads, so they never wait behind evaluations.
+    s.prefetcher = prefetch.Prefetcher()
+    s.drawer = prefetch.Prefetcher(prefetch.executor("draw"))
+    s.progress = {}
 
 # Sidebar
 
@@ -38,35 +50,93 @@ field_bandwidth = st.sidebar.slider(
 
 field_min = float(np.clip(field_mode - (field_bandwidth / 2), 0, 100))
 field_max = float(np.clip(field_mode + (field_bandwidth / 2), 0, 100))
+grade_options = ("Field", "Nash equilibrium")
+grade = st.sidebar.selectbox(label="Grade against:", options=grade_options)
+
 
+st.sidebar.subheader("Tournament")
+payout_text = st.sidebar.text_input(
+    label="Payouts (%), leave empty for chip EV:", value=""
+)
+try:
+    payout = [float(value) for value in payout_text.replace(",", " ").split()] or None
+except ValueError:
+    st.error("Payouts must be numbers, such as: 50, 30, 20. Using chip EV.")
+    payout = None
+unit = "%" if payout else "BB"
 
 st.sidebar.subheader("Evaluation")
 eval_options = [
     "Monte Carlo",
+    "Table",
     "Model",
+    "Grid",
 ]
 eval_method = st.sidebar.selectbox(label="Evaluation method:", options=eval_options)
 if "Monte Carlo" in eval_method:
     monte_carlo = st.sidebar.number_input(
         label="Number of runs:", min_value=100, value=10000, step=100
     )
+    workers = st.sidebar.number_input(
+        label="Processes:", min_value=1, max_value=os.cpu_count() or 1, value=1
+    )
+    stop_options = ("All runs", "Standard error", "Settled decision")
+    stop_rule = st.sidebar.selectbox(label="Stop at:", options=stop_options)
+    use_cache = st.sidebar.checkbox(label="Reuse cached equities", value=True)
+    target_se = None
+    if "Standard error" in stop_rule:
+        target_se = (
+            st.sidebar.number_input(
+                label="Standard error (%):", min_value=0.1, value=1.0, step=0.1
+            )
+            / 100
+        )
+    eval_settings = (monte_carlo, workers, stop_rule, use_cache, target_se)
 else:
-    model = joblib.load("model.pkl")
+    eval_settings = ()
+
+st.sidebar.subheader("Display")
+table_options = ("Image", "Lightweight (SVG)")
+table_backend = st.sidebar.selectbox(label="Table:", options=table_options)
+
+settings = (
+    scenario,
+    n_players,
+    field_min,
+    field_mode,
+    field_max,
+    grade,
+    tuple(payout or ()),
+    eval_method,
+    eval_settings,
+    table_backend,
+)
 
 # Main
 
-if st.button("Next"):
-    s.random_state = np.random.randint(0, 1e9)
 
-if "Open Shove" in scenario:
+def render(fig) -> bytes:
+    """ Render a figure as PNG. """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return buffer.getvalue()
+
 
+def draw_table(**kwargs):
+    """ Draw the table with the selected backend, as PNG bytes or an SVG document. """
+    if "SVG" in table_backend:
+        return handviz.hand_svg(**kwargs)
+    return render(handviz.hand(**kwargs))
+
+
+def draw_open_shove(random_state):
+    """ Draw an open shove scenario and its table figure. """
     scene = poker_coach.PushFoldScenario(
         n_seats=n_players,
         field=(field_min, field_mode, field_max),
-        random_state=s.random_state,
+        random_state=random_state,
     )
-
-    fig = handviz.hand(
+    image = draw_table(
         n_seats=n_players,
         pot=scene.pot,
         hero_name=scene.hero_position,
@@ -76,63 +146,209 @@ if "Open Shove" in scenario:
         villains_ranges=scene.villains_after_range,
         villains_chips=scene.villains_after_chips,
     )
+    return scene, image
+
+
+def converge(scene, villains_range, break_even, progress, stop):
+    """
+    Simulate chunk by chunk, appending each partial estimate to the progress and
+    giving up once the stop event is set.
+    """
+    estimate = None
+    estimates = simulation.iter_estimates(
+        scene.hero_hand,
+        villains_range,
+        times=monte_carlo,
+        chunk_size=simulation.ADAPTIVE_CHUNK_SIZE,
+        random_state=scene.random_state,
+        workers=workers,
+    )
+    for estimate in estimates:
+        if stop.is_set():
+            raise CancelledError
+        progress.append(estimate)
+        if simulation.settled(estimate, target_se, break_even):
+            break
+    return estimate
 
-    st.pyplot(fig, clear_figure=True)
-
-    push = st.button("Push")
-    fold = st.button("Fold")
-
-    if push or fold:
-
-        with st.spinner("Calculating..."):
-
-            if "Monte Carlo" in eval_method:
-                equities = scene.eval_ranges(
-                    hero_hand=scene.hero_hand,
-                    villains_range=scene.villains_after_range,
-                    times=monte_carlo,
-                )
-            else:
-                hero_descr = poker_coach.equity.hand_to_descr(scene.hero_hand)
-                hero_rng = poker_coach.equity.descr_to_percentage(hero_descr)
-                equities = np.array(
-                    [
-                        model.predict(np.array([[hero_rng, villain_rng]]))[0]
-                        for villain_rng in scene.villains_after_range
-                    ]
-                )
-            win_value = scene.pot + np.minimum(
-                scene.villains_after_chips, scene.hero_chips
-            )
-            lose_value = -1 * np.minimum(scene.villains_after_chips, scene.hero_chips)
-            showdown_value = scene.expected_value(
-                chances=equities, success=win_value, failure=lose_value,
-            )
-            fold_equity = scene.pot * (1 - scene.villains_after_range / 100)
-            expected_values = np.add(showdown_value, fold_equity)
-
-            df = pd.DataFrame(
-                {
-                    "Equity (%)": equities,
-                    "Showdown Value (BB)": showdown_value,
-                    "Fold Equity (BB)": fold_equity,
-                    "Expected Value (BB)": expected_values,
-                },
-                index=scene.villains_after_position,
-            )
 
-        result = bool(min(expected_values) > 0)
-        correct = (result and push) or (not result and fold)
+def evaluate_open_shove(scene, progress, stop):
+    """ Evaluate pushing, returning the decision, the table, the runs and chart. """
+    errors = None
+    runs = None
+    if "Monte Carlo" in eval_method:
+        break_even = None
+        if "Settled decision" in stop_rule:
+            break_even = scene.push_break_even(payout=payout)
 
-        if correct:
-            st.success(f"Correct")
+        def simulate(villains_range):
+            return converge(scene, villains_range, break_even, progress, stop)
+
+        # Only full runs are cached, and the cache simulates the missing villains.
+        if use_cache and target_se is None and break_even is None:
+            estimate = poker_coach.cache.default_cache().estimate(
+                scene.hero_hand, scene.villains_after_range, monte_carlo, simulate
+            )
         else:
-            st.error(f"Wrong")
+            estimate = simulate(scene.villains_after_range)
+        equities = estimate.equity
+        errors = estimate.stderr
+        runs = estimate.runs
+    elif "Table" in eval_method:
+        equities = scene.eval_ranges(
+            hero_hand=scene.hero_hand,
+            villains_range=scene.villains_after_range,
+            method="table",
+        )
+    elif "Grid" in eval_method:
+        equities = scene.eval_ranges(
+            hero_hand=scene.hero_hand,
+            villains_range=scene.villains_after_range,
+            method="grid",
+        )
+    else:
+        equities = scene.eval_ranges(
+            hero_hand=scene.hero_hand,
+            villains_range=scene.villains_after_range,
+            method="model",
+        )
+    evaluation = scene.evaluate(equities=equities, payout=payout)
+
+    columns = {"Equity (%)": equities}
+    if errors is not None:
+        columns["Standard Error (±)"] = errors
+    columns.update(
+        {
+            f"Showdown Value ({unit})": evaluation.showdown_value,
+            f"Fold Equity ({unit})": evaluation.fold_equity,
+            f"Expected Value ({unit})": evaluation.expected_value,
+        }
+    )
+    df = pd.DataFrame(columns, index=scene.villains_after_position)
+
+    should_push = evaluation.push
+    if "Nash" in grade:
+        should_push = scene.nash_push()
+
+    push_chart = scene.push_chart(payout=payout)
+    fig = handviz.chart(
+        classes=poker_coach.hands.CLASSES,
+        values=np.nanmin(push_chart.expected_value, axis=-1),
+        title=f"{scene.hero_position} push chart (smallest EV in {unit})",
+    )
+    return should_push, df, runs, render(fig)
+
+
+def draw_call_shove(random_state):
+    """ Draw a call shove scenario and its table figure. """
+    scene = poker_coach.CallShoveScenario(
+        n_seats=n_players,
+        field=(field_min, field_mode, field_max),
+        random_state=random_state,
+    )
+    image = draw_table(
+        n_seats=n_players,
+        pot=scene.pot,
+        hero_name=scene.hero_position,
+        hero_hand=scene.hero_hand,
+        hero_chips=scene.hero_chips,
+        villains_names=[f"{scene.shover_position} all in"],
+        villains_ranges=[scene.shover_range],
+        villains_chips=[scene.shover_chips],
+    )
+    return scene, image
+
+
+def evaluate_call_shove(scene):
+    """ Evaluate calling, returning the decision and the table. """
+    evaluation = scene.evaluate(payout=payout)
+    df = pd.DataFrame(
+        {
+            "Equity (%)": [evaluation.equity],
+            "Break Even (%)": [evaluation.break_even],
+            f"Expected Value ({unit})": [evaluation.expected_value],
+        },
+        index=[scene.shover_position],
+    )
+
+    should_call = evaluation.call
+    if "Nash" in grade:
+        should_call = scene.nash_call()
+    return should_call, df
+
+
+def prefetch_shared(prefetcher, key, fn, *args):
+    """ Start work in the background, reusing the results of every session. """
+    return prefetcher.submit(key, store.get_or_compute, key, fn, *args)
 
-        st.table(data=df.style.format("{:.2f}"))
 
+if st.button("Next"):
+    s.random_state = s.next_random_state
+    s.next_random_state = np.random.randint(0, 1e9)
+
+if "Open Shove" in scenario:
+    draw, evaluate = draw_open_shove, evaluate_open_shove
+    actions = ("Push", "Fold")
+else:
+    draw, evaluate = draw_call_shove, evaluate_call_shove
+    actions = ("Call", "Fold")
+
+# Evaluate the current spot and draw the next one while the user thinks. Work is
+# keyed by every setting, so changing any of them stops the stale work.
+current = (settings, s.random_state)
+upcoming = (settings, s.next_random_state)
+s.drawer.retain([("draw", current), ("draw", upcoming)])
+s.prefetcher.retain([("evaluate", current)])
+s.progress = {current: s.progress.get(current, [])}
+
+scene, image = prefetch_shared(
+    s.drawer, ("draw", current), draw, s.random_state
+).result()
+# Only simulations report their progress and stop early.
+evaluate_args = (scene,)
+if "Open Shove" in scenario:
+    stop = s.prefetcher.stop_event(("evaluate", current))
+    evaluate_args += (s.progress[current], stop)
+future = prefetch_shared(s.prefetcher, ("evaluate", current), evaluate, *evaluate_args)
+prefetch_shared(s.drawer, ("draw", upcoming), draw, s.next_random_state)
+
+if isinstance(image, str):
+    st.markdown(image, unsafe_allow_html=True)
 else:
-    raise NotImplementedError("To be developed.")
+    st.image(image, use_column_width=True)
+
+act = st.button(actions[0])
+fold = st.button(actions[1])
+
+if act or fold:
+
+    # Show the simulation converging while it finishes.
+    placeholder = st.empty()
+    while not future.done():
+        if s.progress[current]:
+            estimate = s.progress[current][-1]
+            equities = ", ".join(f"{equity:.1%}" for equity in estimate.equity)
+            placeholder.markdown(f"Monte Carlo runs: {estimate.runs} ({equities})")
+        else:
+            placeholder.markdown("Calculating...")
+        time.sleep(0.1)
+    placeholder.empty()
+    result = future.result()
+    should_act, df = result[:2]
+    correct = (should_act and act) or (not should_act and fold)
+
+    if correct:
+        st.success(f"Correct")
+    else:
+        st.error(f"Wrong")
+
+    st.table(data=df.style.format("{:.2f}"))
+
+    if "Open Shove" in scenario:
+        runs, chart = result[2:]
+        if runs is not None:
+            st.markdown(f"Monte Carlo runs: {runs}")
+        st.image(chart, use_column_width=True)
 
 st.sidebar.markdown("")
 st.sidebar.markdown("")
@@ -8,11 +8,12 @@ How to import this:
     import streamlit as st
     import st_state_patch
 
-When you do that, you will get 3 new commands in the "st" module:
+When you do that, you will get 4 new commands in the "st" module:
 
     * st.State
     * st.SessionState
     * st.GlobalState
+    * st.GlobalStore
 
 The important class here is st.State. The other two are just an alternate API
 that provides some syntax sugar.
@@ -72,17 +73,35 @@ exact State object you want:
     s1 = st.State(key="user metadata")
 
     print(s0 == s1)  # Prints True
+
+
+Sharing results between sessions
+--------------------------------
+
+st.GlobalState is a plain object, so it has no locking and keeps everything. To
+share computed results (such as evaluations or rendered figures) between
+sessions, use st.GlobalStore, a thread-safe store with a memory budget, least
+recently used eviction and optional time to live (see poker_coach.store):
+
+    store = st.GlobalStore(max_size=64 * 2 ** 20, ttl=3600)
+    result = store.get_or_compute(key, compute, *args)
+
+Sessions asking for the same key at the same time wait for a single
+computation. The "key" argument picks the store, and the size and time to live
+only apply when it is first created. Call store.stats() to inspect it.
 """
 
-import inspect
 import os
 import threading
 import collections
+import weakref
 
 from streamlit.server.Server import Server
 import streamlit as st
 import streamlit.ReportThread as ReportThread
 
+from poker_coach import store
+
 # Normally we'd use a Streamtit module, but I want a module that doesn't live in
 # your current working directory (since local modules get removed in between
 # runs), and Streamtit devs are likely to have Streamlit in their cwd.
@@ -90,6 +109,9 @@ import sys
 
 GLOBAL_CONTAINER = sys
 
+# Guards the creation of the global containers, shared by every session thread.
+_global_lock = threading.Lock()
+
 
 class State(object):
     def __new__(cls, key=None, is_global=False):
@@ -104,10 +126,8 @@ class State(object):
         if key in states_dict:
             return states_dict[key]
 
-        state = super(State, cls).__new__(cls)
-        states_dict[key] = state
-
-        return state
+        # Concurrent sessions may create the same global state at once.
+        return states_dict.setdefault(key, super(State, cls).__new__(cls))
 
     def __init__(self, key=None, is_global=False):
         pass
@@ -120,9 +140,10 @@ class State(object):
 
 
 def _get_global_state():
-    if not hasattr(GLOBAL_CONTAINER, '_global_state'):
-        GLOBAL_CONTAINER._global_state = {}
-        GLOBAL_CONTAINER._key_counts = collections.defaultdict(int)
+    with _global_lock:
+        if not hasattr(GLOBAL_CONTAINER, '_global_state'):
+            GLOBAL_CONTAINER._global_state = {}
+            GLOBAL_CONTAINER._key_counts = collections.defaultdict(int)
 
     return GLOBAL_CONTAINER._global_state, GLOBAL_CONTAINER._key_counts
 
@@ -142,19 +163,53 @@ def _get_session_state():
     return session._session_state, curr_thread._key_counts
 
 
+# Sessions already found for each report context. Contexts are held weakly and
+# sessions through weak references, so closed sessions drop out on their own.
+_sessions_by_ctx = weakref.WeakKeyDictionary()
+
+
 def _get_session_object():
     # Hack to get the session object from Streamlit.
 
     ctx = ReportThread.get_report_ctx()
+    current_server = Server.get_current()
+
+    # Streamlit >= 0.62 has the session id in the context: direct lookup.
+    session_info_by_id = getattr(current_server, '_session_info_by_id', None)
+    session_id = getattr(ctx, 'session_id', None)
+    if session_info_by_id is not None and session_id is not None:
+        session_info = session_info_by_id.get(session_id)
+        if session_info is not None:
+            return session_info.session
+
+    try:
+        session_ref = _sessions_by_ctx.get(ctx)
+    except TypeError:
+        # Context not weak referenceable.
+        session_ref = None
+    this_session = session_ref() if session_ref is not None else None
+    if this_session is not None:
+        return this_session
+
+    this_session = _find_session_object(ctx, current_server)
+    try:
+        _sessions_by_ctx[ctx] = weakref.ref(this_session)
+    except TypeError:
+        pass
+
+    return this_session
+
+
+def _find_session_object(ctx, current_server):
+    # Scan every session, only once per report context.
 
     this_session = None
 
-    current_server = Server.get_current()
     if hasattr(current_server, '_session_infos'):
         # Streamlit < 0.56
-        session_infos = Server.get_current()._session_infos.values()
+        session_infos = current_server._session_infos.values()
     else:
-        session_infos = Server.get_current()._session_info_by_id.values()
+        session_infos = current_server._session_info_by_id.values()
 
     for session_info in session_infos:
         s = session_info.session
@@ -176,24 +231,21 @@ def _get_session_object():
 
 
 def _figure_out_key(key_counts):
-    stack = inspect.stack()
+    # Walk the raw frames instead of inspect.stack(), which also reads the source
+    # context of every frame.
+    frame = sys._getframe(0)
+    stack_pos = 0
 
-    for stack_pos, stack_item in enumerate(stack):
-        filename = stack_item[1]
-        if filename != __file__:
-            break
-        else:
-            stack_item = None
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+        stack_pos += 1
 
-    if stack_item is None:
+    if frame is None:
         return None
 
     # Just breaking these out for readability.
-    # frame_id = id(stack_item[0])
-    filename = stack_item[1]
-    # line_no = stack_item[2]
-    func_name = stack_item[3]
-    # code_context = stack_item[4]
+    filename = frame.f_code.co_filename
+    func_name = frame.f_code.co_name
 
     key = "%s :: %s :: %s" % (filename, func_name, stack_pos)
 
@@ -215,6 +267,20 @@ class GlobalState(object):
         return State(key=key, is_global=True)
 
 
+class GlobalStore(object):
+    def __new__(cls, key=None, max_size=store.DEFAULT_MAX_SIZE, ttl=None):
+        with _global_lock:
+            if not hasattr(GLOBAL_CONTAINER, '_global_stores'):
+                GLOBAL_CONTAINER._global_stores = {}
+
+            stores = GLOBAL_CONTAINER._global_stores
+            if key not in stores:
+                stores[key] = store.Store(max_size=max_size, ttl=ttl)
+
+            return stores[key]
+
+
 st.State = State
 st.GlobalState = GlobalState
 st.SessionState = SessionState
+st.GlobalStore = GlobalStore
@@ -0,0 +1,14 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+
+@pytest.fixture(name="model_path")
+def fixture_model_path(tmp_path):
+    """ Save a linear model of equity on hero and villain percentages. """
+    x = np.array([[1, 10], [1, 90], [50, 10], [50, 90]])
+    estimator = LinearRegression().fit(x, 0.5 + (x[:, 1] - x[:, 0]) / 200)
+    path = str(tmp_path / "model.pkl")
+    joblib.dump(estimator, path)
+    return path
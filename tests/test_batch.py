@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+import poker_coach
+from poker_coach import batch
+
+CONFIG = batch.Config(n_seats=6, method="table", seed=0)
+
+
+def read(path):
+    """ Read the rows of a JSON lines file, after its settings. """
+    with open(path) as file:
+        return [json.loads(line) for line in file][1:]
+
+
+class TestBatch:
+    """ Test headless batch evaluation. """
+
+    @staticmethod
+    def test_rows_match_scenarios():
+        rows = batch.evaluate_rows(CONFIG, 0, 20)
+        scenes = poker_coach.ScenarioBatch(
+            20, n_seats=6, random_state=0, scenario=poker_coach.PushFoldScenario
+        )
+        for row, scene in zip(rows, scenes):
+            result = scene.evaluate(method="table")
+            assert row["hero_hand"] == scene.hero_hand
+            assert row["equity"] == pytest.approx(result.equity.tolist())
+            assert row["push"] == result.push
+
+    @staticmethod
+    def test_chunks():
+        chunks = batch.chunks(5, 25, chunk_size=10)
+        assert chunks == [range(5, 10), range(10, 20), range(20, 25)]
+
+    @staticmethod
+    def test_parts_match_whole(tmp_path):
+        whole = tmp_path / "whole.jsonl"
+        parts = tmp_path / "parts.jsonl"
+        batch.run(str(whole), 30, CONFIG, chunk_size=8)
+        batch.run(str(parts), 12, CONFIG, chunk_size=8)
+        batch.run(str(parts), 18, CONFIG, start=12, chunk_size=8)
+        assert read(whole) == read(parts)
+
+    @staticmethod
+    def test_resume_after_partial_line(tmp_path):
+        path = tmp_path / "rows.jsonl"
+        batch.run(str(path), 5, CONFIG)
+        with open(path, "a") as file:
+            file.write('{"index": 5, "n_se')
+        assert batch.run(str(path), 8, CONFIG) == 3
+        assert [row["index"] for row in read(path)] == list(range(8))
+
+    @staticmethod
+    def test_config_header(tmp_path):
+        path = tmp_path / "rows.jsonl"
+        batch.run(str(path), 3, CONFIG)
+        with open(path) as file:
+            assert batch.load_config(file.readline()) == CONFIG
+        assert batch.resume_jsonl(str(path)) == 2
+
+    @staticmethod
+    def test_resume_other_config(tmp_path):
+        path = tmp_path / "rows.jsonl"
+        batch.run(str(path), 3, CONFIG)
+        with pytest.raises(ValueError):
+            batch.run(str(path), 6, CONFIG._replace(seed=1))
+        assert len(read(path)) == 3
+
+    @staticmethod
+    def test_resume_other_config_unchanged(tmp_path):
+        path = tmp_path / "rows.jsonl"
+        batch.run(str(path), 3, CONFIG)
+        with open(path, "a") as file:
+            file.write('{"index": 3, "n_se')
+        before = path.read_bytes()
+        with pytest.raises(ValueError):
+            batch.run(str(path), 6, CONFIG._replace(seed=1))
+        assert path.read_bytes() == before
+
+    @staticmethod
+    def test_resume_other_file(tmp_path):
+        path = tmp_path / "rows.jsonl"
+        path.write_bytes(b"not json\n\x00\xff partial")
+        with pytest.raises(ValueError, match="does not record its settings"):
+            batch.run(str(path), 3, CONFIG)
+        assert path.read_bytes() == b"not json\n\x00\xff partial"
+
+    @staticmethod
+    def test_workers(tmp_path):
+        single = tmp_path / "single.jsonl"
+        multiple = tmp_path / "multiple.jsonl"
+        batch.run(str(single), 20, CONFIG, chunk_size=5)
+        batch.run(str(multiple), 20, CONFIG, chunk_size=5, workers=2)
+        assert read(single) == read(multiple)
+
+    @staticmethod
+    def test_parquet(tmp_path):
+        pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "rows.parquet"
+        assert batch.run(str(path), 10, CONFIG, chunk_size=4) == 10
+        assert batch.run(str(path), 10, CONFIG, chunk_size=4) == 0
+        with pytest.raises(ValueError):
+            batch.run(str(path), 10, CONFIG._replace(method="grid"))
+        table = pyarrow_parquet.read_table(str(path))
+        assert sorted(table.column("index").to_pylist()) == list(range(10))
@@ -0,0 +1,80 @@
+import sqlite3
+
+import poker_coach
+from poker_coach import cache, simulation
+
+
+def evaluate(ranges):
+    """ Fake simulation returning the villain ranges as equities. """
+    return simulation.Estimate(
+        equity=[rng / 100 for rng in ranges], stderr=[0.01 for _ in ranges], runs=100
+    )
+
+
+class TestEquityCache:
+    """ Test persistent equity cache. """
+
+    @staticmethod
+    def test_key_ignores_suits():
+        assert cache.EquityCache.key("AsKs", 20, 100) == cache.EquityCache.key(
+            "AhKh", 20, 100
+        )
+
+    @staticmethod
+    def test_key_canonical_range():
+        # There is no hand class between 20.0% and 20.05%.
+        assert cache.EquityCache.key("AsKs", 20, 100) == cache.EquityCache.key(
+            "AsKs", 20.05, 100
+        )
+
+    @staticmethod
+    def test_hits_and_misses(tmp_path):
+        equities = cache.EquityCache(str(tmp_path / "cache.sqlite"))
+        equities.estimate("AsKs", [20, 50], 100, evaluate)
+        estimate = equities.estimate("AhKh", [50, 20, 30], 100, evaluate)
+        assert equities.stats() == cache.CacheStats(hits=2, misses=3, entries=3)
+        assert list(estimate.equity) == [0.5, 0.2, 0.3]
+
+    @staticmethod
+    def test_simulates_missing_only(tmp_path):
+        equities = cache.EquityCache(str(tmp_path / "cache.sqlite"))
+        equities.estimate("AsKs", [20], 100, evaluate)
+        calls = []
+
+        def record(ranges):
+            calls.append(ranges)
+            return evaluate(ranges)
+
+        equities.estimate("AsKs", [20, 50], 100, record)
+        assert calls == [[50]]
+
+    @staticmethod
+    def test_lru_eviction(tmp_path):
+        equities = cache.EquityCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+        equities.estimate("AsKs", [20], 100, evaluate)
+        equities.estimate("AsKs", [50], 100, evaluate)
+        equities.estimate("AsKs", [20], 100, evaluate)  # Refresh 20%.
+        equities.estimate("AsKs", [80], 100, evaluate)
+        assert len(equities) == 2
+        keys = [cache.EquityCache.key("AsKs", rng, 100) for rng in (20, 50, 80)]
+        assert set(equities.get(keys)) == {keys[0], keys[2]}
+
+    @staticmethod
+    def test_readable_by_another_connection(tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        cache.EquityCache(path).estimate("AsKs", [20], 100, evaluate)
+        with sqlite3.connect(path) as connection:
+            count = connection.execute("SELECT COUNT(*) FROM equities").fetchone()[0]
+        assert count == 1
+
+    @staticmethod
+    def test_eval_ranges_cache(tmp_path):
+        equities = cache.EquityCache(str(tmp_path / "cache.sqlite"))
+        eqs0 = poker_coach.Scenario.eval_ranges(
+            "AsKs", [5, 20], times=500, method="vectorized", cache=equities
+        )
+        eqs1 = poker_coach.Scenario.eval_ranges(
+            "AsKs", [5, 20], times=500, method="vectorized", cache=equities
+        )
+        assert (eqs0 == eqs1).all()
+        assert equities.hits == 2
@@ -0,0 +1,50 @@
+import numpy as np
+
+from poker_coach import equity_table, hands
+
+
+class TestEquityTable:
+    """ Test precomputed equity table. """
+
+    @staticmethod
+    def test_table_shape():
+        table = equity_table.load()
+        assert table.shape == (len(hands.CLASSES), len(equity_table.RANGES))
+
+    @staticmethod
+    def test_lookup_interpolates():
+        low, high = sorted(equity_table.lookup("AsKs", [10, 11]))
+        assert low <= equity_table.lookup("AsKs", [10.5])[0] <= high
+
+    @staticmethod
+    def test_lookup_clips():
+        assert (
+            equity_table.lookup("AsKs", [0.1]) == equity_table.lookup("AsKs", [1])
+        ).all()
+
+    @staticmethod
+    def test_aces_beat_every_range():
+        assert (equity_table.lookup("AsAh", equity_table.RANGES) > 0.5).all()
+
+    @staticmethod
+    def test_build_table_weights():
+        n_classes = len(hands.CLASSES)
+        matrix = np.full((n_classes, n_classes), 0.25)
+        weights = equity_table.build_weights()
+        table = equity_table.build_table(matrix, weights)
+        assert np.allclose(table, 0.25)
+
+    @staticmethod
+    def test_weights_card_removal():
+        weights = equity_table.build_weights()
+        aces = hands.CLASSES.index("AA")
+        assert weights[aces, aces] == 1
+
+    @staticmethod
+    def test_lookup_classes():
+        villains_range = [3.5, 20, 99.9]
+        equities = equity_table.lookup_classes(villains_range)
+        assert equities.shape == (len(hands.CLASSES), 3)
+        for i in (0, 50, 168):
+            hand = hands.class_combos(hands.CLASSES[i])[0]
+            assert np.allclose(equities[i], equity_table.lookup(hand, villains_range))
@@ -0,0 +1,96 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import bluff
+from poker_coach import cards, evaluator
+
+
+def bluff_hands(hand: str):
+    """ Enumerate every five cards bluff hand from seven cards. """
+    split = [hand[i : i + 2] for i in range(0, len(hand), 2)]
+    return (bluff.Hand("".join(combo)) for combo in itertools.combinations(split, 5))
+
+
+def bluff_value(hand: str) -> int:
+    """ Evaluate the best five cards with bluff. """
+    return max(five.value for five in bluff_hands(hand))
+
+
+def value(hand: str) -> int:
+    """ Evaluate with poker_coach. """
+    return int(evaluator.evaluate(cards.encode(hand)))
+
+
+class TestEvaluator:
+    """ Test seven cards hand evaluator. """
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "hand, category",
+        [
+            ("2s4h6c8dTsQhAc", evaluator.HIGH_CARD),
+            ("2s2h6c8dTsQhAc", evaluator.PAIR),
+            ("2s2h6c6dTsQhAc", evaluator.TWO_PAIRS),
+            ("2s2h2c8dTsQhAc", evaluator.THREE_OF_A_KIND),
+            ("As2h3c4d5sQhKc", evaluator.STRAIGHT),
+            ("2s4s6s8sTsQhAc", evaluator.FLUSH),
+            ("2s2h2c8d8sQhAc", evaluator.FULL_HOUSE),
+            ("2s2h2c2d8sQhAc", evaluator.FOUR_OF_A_KIND),
+            ("As2s3s4s5sQhKc", evaluator.STRAIGHT_FLUSH),
+        ],
+    )
+    def test_category(hand, category):
+        assert evaluator.category(value(hand)) == category
+
+    @staticmethod
+    def test_wheel_is_lowest_straight():
+        assert value("As2h3c4d5sQhKc") < value("2s3h4c5d6sQhKc")
+
+    @staticmethod
+    def test_kicker():
+        assert value("AsAh2c5d8sThKc") > value("AsAh2c5d8sThQc")
+
+    @staticmethod
+    def test_unused_kicker_ties():
+        assert value("AsAhKcQdJs3h2c") == value("AsAhKcQdJs4h3c")
+
+    @staticmethod
+    def test_third_pair_as_kicker():
+        assert value("KsKhQcQd2s2hAc") > value("KsKhQcQdJs2hTc")
+
+    @staticmethod
+    def test_shape():
+        hands = np.arange(7 * 6).reshape(2, 3, 7)
+        assert evaluator.evaluate(hands).shape == (2, 3)
+
+    @staticmethod
+    def test_against_bluff():
+        random_state = np.random.default_rng(0)
+        for _ in range(300):
+            deck = random_state.permutation(len(cards.DECK))
+            hero = cards.decode(np.concatenate([deck[:2], deck[4:9]]))
+            villain = cards.decode(deck[2:9])
+            expected = np.sign(bluff_value(hero) - bluff_value(villain))
+            assert np.sign(value(hero) - value(villain)) == expected
+
+    @staticmethod
+    def test_categories_against_bluff():
+        random_state = np.random.default_rng(1)
+        names = [
+            "high_card",
+            "pair",
+            "two_pairs",
+            "three_of_a_kind",
+            "straight",
+            "flush",
+            "full_house",
+            "four_of_a_kind",
+            "straight_flush",
+        ]
+        for _ in range(300):
+            hand = cards.decode(random_state.permutation(len(cards.DECK))[:7])
+            best = max(bluff_hands(hand), key=lambda five: five.value)
+            name = best.name.replace("royal_", "")
+            assert names[evaluator.category(value(hand))] == name
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import poker_coach
+from poker_coach import grid
+
+
+class TestGrid:
+    """ Test distilled equity model grid. """
+
+    @staticmethod
+    def test_predict_nodes():
+        model = grid.GridModel([0, 1], [0, 1], [[0, 1], [2, 3]])
+        x = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+        assert np.allclose(model.predict(x), [0, 1, 2, 3])
+
+    @staticmethod
+    def test_predict_interpolates():
+        model = grid.GridModel([0, 1], [0, 1], [[0, 1], [2, 3]])
+        assert np.allclose(model.predict([[0.5, 0.5], [0.25, 0]]), [1.5, 0.5])
+
+    @staticmethod
+    def test_predict_clips():
+        model = grid.GridModel([0, 1], [0, 1], [[0, 1], [2, 3]])
+        assert np.allclose(model.predict([[-1, -1], [2, 2]]), [0, 3])
+
+    @staticmethod
+    def test_distill_model(model_path):
+        model = grid.build(source="model", model_path=model_path)
+        report = grid.report_model(model, model_path=model_path, samples=100)
+        assert report.max_error < 1e-6
+
+    @staticmethod
+    def test_save_and_load(model_path, tmp_path):
+        path = str(tmp_path / "grid.npz")
+        grid.build(source="model", model_path=model_path).save(path)
+        eqs = grid.predict_equities("AsAh", [10, 90], path=path)
+        assert np.allclose(eqs, [0.5 + 9.5 / 200, 0.5 + 89.5 / 200], atol=1e-3)
+
+    @staticmethod
+    def test_invalid_source():
+        with pytest.raises(ValueError):
+            grid.build(source="oracle")
+
+    @staticmethod
+    def test_shipped_grid():
+        model = grid.load()
+        assert model.values.shape == (len(grid.HERO_AXIS), len(grid.VILLAIN_AXIS))
+        assert (grid.predict_equities("AsAh", grid.VILLAIN_AXIS) > 0.5).all()
+
+    @staticmethod
+    def test_predict_equities_empty():
+        assert len(grid.predict_equities("AsAh", [])) == 0
+
+    @staticmethod
+    def test_eval_ranges_grid():
+        eqs = poker_coach.Scenario.eval_ranges("AsAh", [10, 90], method="grid")
+        assert len(eqs) == 2
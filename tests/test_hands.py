@@ -0,0 +1,56 @@
+import numpy as np
+from bluff.holdem import equity
+
+from poker_coach import cards, hands
+
+
+class TestHands:
+    """ Test starting hand lookup tables. """
+
+    @staticmethod
+    def test_classes_match_bluff():
+        for high, low in hands.COMBOS:
+            hand = cards.decode([high, low])
+            assert hands.CLASSES[hands.class_index(hand)] == equity.hand_to_descr(hand)
+
+    @staticmethod
+    def test_percentage_matches_bluff():
+        for hand in ("AsAh", "KdAs", "7s2d", "Th9h"):
+            descr = equity.hand_to_descr(hand)
+            assert hands.percentage(hand) == equity.descr_to_percentage(descr)
+
+    @staticmethod
+    def test_cards_order():
+        assert hands.combo_index("AsKd") == hands.combo_index("KdAs")
+
+    @staticmethod
+    def test_combo_index():
+        for i, combo in enumerate(hands.COMBOS):
+            assert hands.combo_index(cards.decode(combo)) == i
+
+    @staticmethod
+    def test_vectorized_strings():
+        hand_list = ["AsAh", "KdAs", "7s2d"]
+        assert hands.percentages(hand_list).tolist() == [
+            hands.percentage(hand) for hand in hand_list
+        ]
+
+    @staticmethod
+    def test_top_classes():
+        percentages = np.array([0.1, 2, 50, 100])
+        expected = [hands.top_range(pct).sum() for pct in percentages]
+        assert hands.top_classes(percentages).tolist() == expected
+        assert hands.top_classes(0.1) == 1
+        assert hands.top_classes(100) == len(hands.CLASSES)
+
+    @staticmethod
+    def test_vectorized_cards():
+        hand_cards = np.array([cards.encode("AsAh"), cards.encode("2d7s")])
+        assert hands.class_indexes(hand_cards).tolist() == [
+            hands.class_index("AsAh"),
+            hands.class_index("7s2d"),
+        ]
+
+    @staticmethod
+    def test_pair_combos_same_card():
+        assert (np.diag(hands.PAIR_COMBOS) == -1).all()
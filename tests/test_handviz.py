@@ -0,0 +1,93 @@
+from xml.etree import ElementTree
+
+import matplotlib
+import numpy as np
+
+from poker_coach import hands, handviz
+
+matplotlib.use("Agg")
+
+HAND = dict(
+    n_seats=6,
+    pot=2.25,
+    hero_name="UTG",
+    hero_hand="AsKd",
+    hero_chips=20,
+    villains_names=["MP", "CO", "BTN", "SB", "BB"],
+    villains_ranges=[10, 15, 20, 30, 40],
+    villains_chips=[30, 25, 10, 15, 40],
+)
+
+
+class TestHand:
+    """ Test hand viewer. """
+
+    @staticmethod
+    def test_layout_cached():
+        assert handviz.layout(6) is handviz.layout(6)
+        assert len(handviz.layout(6).seats_theta) == 6
+
+    @staticmethod
+    def test_hand_draws_marks():
+        fig = handviz.hand(**HAND)
+        texts = [text.get_text() for text in fig.axes[0].texts]
+        assert texts == [mark.text for mark in handviz.marks(**HAND)]
+        assert "BTN 20%\n10 BB" in texts
+
+    @staticmethod
+    def test_hand_svg():
+        svg = handviz.hand_svg(**HAND)
+        root = ElementTree.fromstring(svg)
+        texts = [elem.text for elem in root.iter() if elem.tag.endswith("text")]
+        assert ["BTN 20%", "10 BB"] == texts[6:8]
+        assert texts[-2:] == ["A", "K"]
+
+    @staticmethod
+    def test_hand_svg_heads_up():
+        hand = dict(HAND, n_seats=2, villains_names=["BB"])
+        hand.update(villains_ranges=[50], villains_chips=[10])
+        ElementTree.fromstring(handviz.hand_svg(**hand))
+
+    @staticmethod
+    def test_hand_background_cached():
+        assert handviz.figure_table(6) is handviz.figure_table(6)
+        first = handviz.hand(**HAND)
+        second = handviz.hand(**HAND)
+        assert first.axes[0] is not second.axes[0]
+        assert len(first.axes[0].texts) == len(second.axes[0].texts)
+        assert len(first.axes[0].patches) == 1
+
+    @staticmethod
+    def test_blinds_by_seat_name():
+        hand = dict(HAND, hero_name="HJ", villains_names=["UTG+2 all in"])
+        hand.update(villains_ranges=[20], villains_chips=[10])
+        texts = [mark.text for mark in handviz.marks(**hand)]
+        assert "1 BB" not in texts
+        assert ".5 BB" not in texts
+        hand.update(hero_name="BB", villains_names=["SB all in"])
+        marks = {mark.text: mark for mark in handviz.marks(**hand)}
+        seats_theta = handviz.layout(6).seats_theta
+        assert marks["1 BB"].theta == seats_theta[0]
+        assert marks[".5 BB"].theta == seats_theta[1]
+
+
+class TestChart:
+    """ Test hand classes chart. """
+
+    @staticmethod
+    def test_chart_position():
+        assert handviz.chart_position("AA") == (0, 0)
+        assert handviz.chart_position("AKs") == (0, 1)
+        assert handviz.chart_position("AK") == (1, 0)
+        assert handviz.chart_position("32") == (12, 11)
+
+    @staticmethod
+    def test_chart_positions_unique():
+        positions = {handviz.chart_position(descr) for descr in hands.CLASSES}
+        assert len(positions) == len(hands.CLASSES)
+
+    @staticmethod
+    def test_chart():
+        values = np.linspace(-1, 1, len(hands.CLASSES))
+        fig = handviz.chart(hands.CLASSES, values, title="Push chart")
+        assert len(fig.axes) == 1
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+import poker_coach
+from poker_coach import icm
+
+
+class TestICM:
+    """ Test Independent Chip Model. """
+
+    @staticmethod
+    def test_known_equities():
+        eqs = icm.equities([50, 30, 20], [0.5, 0.3, 0.2])
+        assert np.allclose(eqs, [0.38392857, 0.3275, 0.28857143])
+
+    @staticmethod
+    def test_payouts_sum():
+        eqs = icm.equities(np.arange(1, 10), [30, 20, 15, 10, 8, 6, 5, 4, 2])
+        assert eqs.sum() == pytest.approx(100)
+
+    @staticmethod
+    def test_equal_stacks():
+        eqs = icm.equities([10] * 6, [50, 30, 20])
+        assert np.allclose(eqs, 100 / 6)
+
+    @staticmethod
+    def test_winner_takes_all():
+        eqs = icm.equities([10, 30, 60], [1])
+        assert np.allclose(eqs, [0.1, 0.3, 0.6])
+
+    @staticmethod
+    def test_busted_player():
+        eqs = icm.equities([0, 10, 10], [50, 30, 20])
+        assert eqs[0] == pytest.approx(20)
+
+    @staticmethod
+    def test_more_payouts_than_players():
+        eqs = icm.equities([10, 10], [50, 30, 20])
+        assert np.allclose(eqs, 40)
+
+    @staticmethod
+    def test_push_values():
+        win, lose, steal = icm.push_values(10, [10, 10], 1.5, [50, 30, 20], [0, 1])
+        assert len(win) == len(lose) == 2
+        assert (win > steal).all() and steal > 0 and (lose < 0).all()
+
+    @staticmethod
+    def test_call_values():
+        win, lose = icm.call_values(10, [10, 10], 1.5, [50, 30, 20], 0, blind=1)
+        assert win > 0 > lose
+
+    @staticmethod
+    def test_call_winner_takes_all_is_chip_ev():
+        scene = poker_coach.CallShoveScenario(field=(5, 20, 50), random_state=1)
+        total = (
+            scene.hero_chips + scene.villains_chips.sum() + scene.pot - scene.hero_blind
+        )
+        result = scene.evaluate(payout=[total])
+        chips = scene.evaluate()
+        assert result.expected_value == pytest.approx(chips.expected_value)
+        assert result.break_even == pytest.approx(chips.break_even)
+
+    @staticmethod
+    def test_evaluate_payout():
+        scene = poker_coach.PushFoldScenario(field=(5, 20, 50), random_state=0)
+        equities = np.full(len(scene.villains_after_range), 0.5)
+        result = scene.evaluate(equities, payout=[50, 30, 20])
+        assert len(result.expected_value) == len(equities)
+        assert isinstance(result.push, bool)
+
+    @staticmethod
+    def test_evaluate_winner_takes_all_is_chip_ev():
+        scene = poker_coach.PushFoldScenario(field=(5, 20, 50), random_state=1)
+        equities = np.full(len(scene.villains_after_range), 0.4)
+        total = scene.hero_chips + scene.villains_chips.sum() + scene.pot
+        result = scene.evaluate(equities, payout=[total])
+        chips = scene.evaluate(equities)
+        assert np.allclose(result.expected_value, chips.expected_value)
+        assert result.push == chips.push
@@ -0,0 +1,35 @@
+import poker_coach
+from benchmarks.bench_import import import_times
+
+# Dependencies only the features that need them may import.
+HEAVY_MODULES = ("pandas", "joblib", "sklearn", "matplotlib", "bluff.holdem.equity")
+
+# Generous cold start budget (in seconds) of the package import.
+IMPORT_BUDGET = 1.0
+
+
+class TestImport:
+    """ Test package cold start. """
+
+    @staticmethod
+    def test_no_heavy_dependencies():
+        times = import_times("import poker_coach")
+        assert not set(HEAVY_MODULES) & set(times)
+
+    @staticmethod
+    def test_import_budget():
+        times = import_times("import poker_coach")
+        _, cumulative = times["poker_coach"]
+        assert cumulative / 1e6 < IMPORT_BUDGET
+
+    @staticmethod
+    def test_svg_viewer_without_matplotlib():
+        statement = (
+            "from poker_coach import handviz;"
+            "handviz.hand_svg(2, 1.5, 'SB', 'AsKd', 10, ['BB'], [50], [10])"
+        )
+        assert "matplotlib" not in import_times(statement)
+
+    @staticmethod
+    def test_lazy_equity():
+        assert poker_coach.equity.hand_to_descr("AsKd") == "AK"
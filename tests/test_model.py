@@ -0,0 +1,38 @@
+import numpy as np
+
+import poker_coach
+from poker_coach import model
+
+
+class TestModel:
+    """ Test equity model backend. """
+
+    @staticmethod
+    def test_load_once(model_path):
+        assert model.load(model_path) is model.load(model_path)
+
+    @staticmethod
+    def test_features():
+        x = model.features("AsAh", [10, 20, 30])
+        assert x.shape == (3, 2)
+        assert (x[:, 0] == 0.5).all()
+
+    @staticmethod
+    def test_predict_equities(model_path):
+        eqs = model.predict_equities("AsAh", [10, 90], path=model_path)
+        assert np.allclose(eqs, [0.5 + 9.5 / 200, 0.5 + 89.5 / 200])
+
+    @staticmethod
+    def test_predict_equities_without_mmap(model_path):
+        eqs = model.predict_equities("AsAh", [10], path=model_path, mmap_mode=None)
+        assert len(eqs) == 1
+
+    @staticmethod
+    def test_predict_equities_empty(model_path):
+        assert len(model.predict_equities("AsAh", [], path=model_path)) == 0
+
+    @staticmethod
+    def test_eval_ranges_model(model_path, monkeypatch):
+        monkeypatch.setattr(model, "MODEL_PATH", model_path)
+        eqs = poker_coach.Scenario.eval_ranges("AsAh", [10, 90], method="model")
+        assert len(eqs) == 2
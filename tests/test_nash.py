@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pytest
+
+import poker_coach
+from poker_coach import hands, nash
+
+
+@pytest.fixture(name="directory")
+def fixture_directory(tmp_path, monkeypatch):
+    """ Save solutions to a temporary directory. """
+    monkeypatch.setenv("POKER_COACH_NASH", str(tmp_path))
+    nash.equilibrium.cache_clear()
+    yield str(tmp_path)
+    nash.equilibrium.cache_clear()
+
+
+class TestNash:
+    """ Test Nash push fold equilibrium. """
+
+    @staticmethod
+    def test_blinds():
+        assert nash.blinds(4).tolist() == [0, 0, 0.5, 1]
+        assert nash.blinds(2).tolist() == [0.5, 1]
+
+    @staticmethod
+    def test_heads_up_ranges():
+        # Known heads up equilibrium at 10 big blinds without antes.
+        solution = nash.solve(2, 10, ante=0, iterations=200)
+        assert solution.push_range(0) == pytest.approx(58, abs=2)
+        assert solution.call_range(0, 1) == pytest.approx(37, abs=2)
+
+    @staticmethod
+    def test_push_more_from_late_positions():
+        solution = nash.solve(6, 10, iterations=100)
+        ranges = [solution.push_range(position) for position in range(5)]
+        assert ranges == sorted(ranges)
+
+    @staticmethod
+    def test_aces_always_pushed():
+        solution = nash.solve(9, 20, iterations=100)
+        assert (solution.push[:, hands.CLASSES.index("AA")] == 1).all()
+
+    @staticmethod
+    def test_best_call_against_everything():
+        weights = np.ones((len(hands.CLASSES), len(hands.CLASSES)))
+        push = np.ones(len(hands.CLASSES))
+        matrix = poker_coach.equity_table.load_matrix()
+        calls = nash.best_call(push, 10, 1.5, 0.5, 1, matrix, weights)
+        assert calls[hands.CLASSES.index("AA")] == 1
+        assert calls[hands.CLASSES.index("72")] == 0
+
+    @staticmethod
+    def test_equilibrium_saved(directory):
+        solution = nash.equilibrium(3, 8, iterations=10)
+        assert len(os.listdir(directory)) == 1
+        nash.equilibrium.cache_clear()
+        loaded = nash.equilibrium(3, 8, iterations=10)
+        assert np.array_equal(loaded.push, solution.push)
+
+    @staticmethod
+    def test_nash_push(directory):
+        scene = poker_coach.PushFoldScenario(field=(5, 20, 50), random_state=0)
+        assert isinstance(scene.nash_push(iterations=10), bool)
+        assert os.listdir(directory)
+
+    @staticmethod
+    def test_build(tmp_path, monkeypatch):
+        path = str(tmp_path / "nash.npz")
+        monkeypatch.setattr(nash, "SEATS", range(2, 4))
+        monkeypatch.setattr(nash, "STACKS", range(5, 6))
+        nash.build(path, iterations=10)
+        solutions = nash.shipped(path)
+        assert len(solutions) == 4
+        expected = nash.solve(3, 5, iterations=10)
+        assert np.allclose(solutions["nash_3_5_12.5_10_push"], expected.push, atol=1e-3)
+
+    @staticmethod
+    def test_equilibrium_shipped(directory):
+        solution = nash.equilibrium(9, 10)
+        assert solution.push.shape == (8, len(hands.CLASSES))
+        assert not os.listdir(directory)
@@ -1,5 +1,12 @@
+import asyncio
+
+import numpy as np
+import pytest
+
 import poker_coach
 
+FIELD = (5, 20, 50)
+
 
 class TestScenario:
     """ Test general scenario class. """
@@ -112,3 +119,334 @@ class TestScenario:
             chances=0.5, win_action=1, lose_action=1, no_action=0,
         )
         assert evs[0] > 0 and evs[1] == 0
+
+    @staticmethod
+    def test_eval_ranges_table_values():
+        scene = poker_coach.Scenario(9)
+        eqs = scene.eval_ranges(
+            hero_hand=scene.hero_hand,
+            villains_range=scene.villains_range,
+            method="table",
+        )
+        assert len(eqs) == 8
+        for eq in eqs:
+            assert 0 < eq < 1
+
+    @staticmethod
+    def test_eval_ranges_table_deterministic():
+        eqs0 = poker_coach.Scenario.eval_ranges("AsKs", [5.5, 20], method="table")
+        eqs1 = poker_coach.Scenario.eval_ranges("AsKs", [5.5, 20], method="table")
+        assert (eqs0 == eqs1).all()
+
+    @staticmethod
+    def test_eval_ranges_invalid_method():
+        with pytest.raises(ValueError):
+            poker_coach.Scenario.eval_ranges("AsKs", [20], method="guess")
+
+    @staticmethod
+    def test_eval_ranges_vectorized_values():
+        scene = poker_coach.Scenario(9)
+        eqs = scene.eval_ranges(
+            hero_hand=scene.hero_hand,
+            villains_range=scene.villains_range,
+            times=100,
+            method="vectorized",
+        )
+        assert len(eqs) == 8
+        for eq in eqs:
+            assert 0 <= eq <= 1
+
+    @staticmethod
+    def test_eval_ranges_target_se():
+        eqs = poker_coach.Scenario.eval_ranges(
+            "AsKs", [5, 20], times=5000, method="vectorized", target_se=0.05
+        )
+        assert len(eqs) == 2
+
+    @staticmethod
+    def test_break_even():
+        # Risking 1 to win 3 breaks even at 25% chances.
+        assert poker_coach.Scenario.break_even(3, -1, 0) == 0.25
+
+    @staticmethod
+    def test_break_even_expected_value():
+        chances = poker_coach.Scenario.break_even(7.5, -4, 1)
+        assert poker_coach.Scenario.expected_value(chances, 7.5, -4) == pytest.approx(1)
+
+    @staticmethod
+    def test_random_state():
+        assert poker_coach.Scenario(random_state=42).random_state == 42
+
+    @staticmethod
+    def test_eval_ranges_workers():
+        eqs = poker_coach.Scenario.eval_ranges(
+            "AsKs", [5, 20], times=2000, method="vectorized", random_state=0, workers=2
+        )
+        assert len(eqs) == 2
+
+
+class TestPushFoldScenario:
+    """ Test push fold scenario evaluation. """
+
+    @staticmethod
+    def test_evaluate_len():
+        scene = poker_coach.PushFoldScenario(field=FIELD, random_state=0)
+        result = scene.evaluate(method="table")
+        assert len(result.expected_value) == len(scene.villains_after_range)
+        assert isinstance(result.push, bool)
+
+    @staticmethod
+    def test_evaluate_values():
+        scene = poker_coach.PushFoldScenario(field=FIELD, random_state=0)
+        result = scene.evaluate(equities=np.full(len(scene.villains_after_range), 0.4))
+        showdown = scene.expected_value(0.4, scene.win_value, scene.lose_value)
+        assert np.allclose(result.showdown_value, showdown)
+        assert np.allclose(result.expected_value, showdown + scene.fold_equity)
+        assert result.push == bool(min(result.expected_value) > 0)
+
+    @staticmethod
+    def test_push_break_even():
+        scene = poker_coach.PushFoldScenario(field=FIELD, random_state=0)
+        for payout in (None, [50, 30, 20]):
+            break_even = scene.push_break_even(payout=payout)
+            result = scene.evaluate(equities=break_even, payout=payout)
+            assert np.allclose(result.expected_value, 0)
+
+    @staticmethod
+    def test_evaluate_batch_padding():
+        result = poker_coach.PushFoldScenario.evaluate_batch(
+            pot=[2.5, 2.5],
+            hero_chips=[10, 10],
+            villains_chips=[[10, 10], [10, np.nan]],
+            villains_range=[[50, 5], [50, np.nan]],
+            equities=[[0.5, 0.1], [0.5, np.nan]],
+        )
+        assert result.expected_value.shape == (2, 2)
+        assert result.push.tolist() == [False, True]
+
+    @staticmethod
+    def test_evaluate_batch_matches_evaluate():
+        scenes = [
+            poker_coach.PushFoldScenario(field=FIELD, random_state=i) for i in range(20)
+        ]
+        width = max(len(scene.villains_after_range) for scene in scenes)
+
+        def pad(values):
+            return np.pad(
+                np.asarray(values, dtype=float),
+                (0, width - len(values)),
+                constant_values=np.nan,
+            )
+
+        equities = [np.full(len(scene.villains_after_range), 0.3) for scene in scenes]
+        result = poker_coach.PushFoldScenario.evaluate_batch(
+            pot=[scene.pot for scene in scenes],
+            hero_chips=[scene.hero_chips for scene in scenes],
+            villains_chips=[pad(scene.villains_after_chips) for scene in scenes],
+            villains_range=[pad(scene.villains_after_range) for scene in scenes],
+            equities=[pad(eqs) for eqs in equities],
+        )
+        expected = [scene.evaluate(eqs).push for scene, eqs in zip(scenes, equities)]
+        assert result.push.tolist() == expected
+
+    @staticmethod
+    def test_evaluate_async_converges():
+        scene = poker_coach.PushFoldScenario(field=FIELD, random_state=0)
+
+        async def collect():
+            return [progress async for progress in scene.evaluate_async(times=3000)]
+
+        progress = asyncio.run(collect())
+        assert [step.estimate.runs for step in progress] == [1000, 2000, 3000]
+        last = progress[-1]
+        expected = scene.evaluate(equities=last.estimate.equity)
+        assert np.allclose(last.result.expected_value, expected.expected_value)
+        assert last.result.push == expected.push
+
+    @staticmethod
+    def test_evaluate_async_settle():
+        scene = poker_coach.PushFoldScenario(field=FIELD, random_state=0)
+
+        async def collect():
+            steps = scene.evaluate_async(times=100000, settle=True)
+            return [progress async for progress in steps]
+
+        assert asyncio.run(collect())[-1].estimate.runs < 100000
+
+    @staticmethod
+    def test_evaluate_async_settle_payout():
+        # The decision settles under chip EV before it does under ICM.
+        payout = [50, 30, 20]
+        scene = poker_coach.PushFoldScenario(field=FIELD, random_state=15)
+        break_even = scene.push_break_even(payout=payout)
+        assert not np.allclose(scene.push_break_even(), break_even)
+
+        async def collect():
+            steps = scene.evaluate_async(times=100000, settle=True, payout=payout)
+            return [progress async for progress in steps]
+
+        last = asyncio.run(collect())[-1]
+        assert poker_coach.simulation.settled(last.estimate, break_even=break_even)
+
+
+class TestScenarioBatch:
+    """ Test batches of scenarios. """
+
+    @staticmethod
+    def test_len():
+        assert len(poker_coach.ScenarioBatch(10)) == 10
+
+    @staticmethod
+    def test_empty():
+        assert len(poker_coach.ScenarioBatch(0)) == 0
+
+    @staticmethod
+    def test_shapes():
+        batch = poker_coach.ScenarioBatch(2000, n_seats=6)
+        assert batch.villains_range.shape == (2000, 5)
+        assert batch.villains_chips.shape == (2000, 5)
+        assert batch.hero_chips.shape == (2000,)
+
+    @staticmethod
+    def test_values():
+        batch = poker_coach.ScenarioBatch(2000, n_seats=6, field=(5, 20, 50))
+        assert (batch.villains_range >= poker_coach.Scenario.MIN_ACTION).all()
+        assert (batch.villains_range <= 50).all()
+        assert (batch.hero_positions >= 0).all()
+        assert (batch.hero_positions < 5).all()
+        assert all(hand[:2] != hand[2:] for hand in batch.hero_hands)
+
+    @staticmethod
+    def test_rows_reproducible():
+        small = poker_coach.ScenarioBatch(10, random_state=0)
+        large = poker_coach.ScenarioBatch(3000, random_state=0)
+        assert small[5].hero_hand == large[5].hero_hand
+        assert (small[9].villains_range == large[9].villains_range).all()
+
+    @staticmethod
+    def test_start():
+        whole = poker_coach.ScenarioBatch(3000, random_state=0)
+        part = poker_coach.ScenarioBatch(1500, random_state=0, start=1000)
+        assert part.start == 1000
+        assert (part.hero_hands == whole.hero_hands[1000:2500]).all()
+        assert (part.villains_range == whole.villains_range[1000:2500]).all()
+
+    @staticmethod
+    def test_random_state():
+        first = poker_coach.ScenarioBatch(100, random_state=0).hero_hands
+        second = poker_coach.ScenarioBatch(100, random_state=1).hero_hands
+        assert (first != second).any()
+
+    @staticmethod
+    def test_view_properties():
+        batch = poker_coach.ScenarioBatch(5, n_seats=9, random_state=0)
+        scene = batch[-1]
+        assert isinstance(scene, poker_coach.Scenario)
+        assert scene.hero_hand == batch.hero_hands[-1]
+        assert scene.n_seats == 9
+        assert len(scene.villains_after_range) == 8 - batch.hero_positions[-1]
+        assert len(scene.villains_after_position) == len(scene.villains_after_range)
+
+    @staticmethod
+    def test_iter():
+        assert len(list(poker_coach.ScenarioBatch(3))) == 3
+
+    @staticmethod
+    def test_push_fold_views():
+        batch = poker_coach.ScenarioBatch(
+            50, scenario=poker_coach.PushFoldScenario, random_state=0
+        )
+        equities = np.full(batch.villains_range.shape, 0.3)
+        result = poker_coach.PushFoldScenario.evaluate_batch(
+            pot=batch.pot,
+            hero_chips=batch.hero_chips,
+            villains_chips=batch.after(batch.villains_chips),
+            villains_range=batch.after(batch.villains_range),
+            equities=batch.after(equities),
+        )
+        expected = [
+            scene.evaluate(np.full(len(scene.villains_after_range), 0.3)).push
+            for scene in batch
+        ]
+        assert result.push.tolist() == expected
+
+    @staticmethod
+    def test_call_shove_unsupported():
+        with pytest.raises(ValueError):
+            poker_coach.ScenarioBatch(5, scenario=poker_coach.CallShoveScenario)
+
+    @staticmethod
+    def test_hero_percentages():
+        batch = poker_coach.ScenarioBatch(20, random_state=0)
+        expected = [scene.hero_percentage for scene in batch]
+        assert batch.hero_percentages.tolist() == expected
+        assert batch.hero_classes.shape == (20,)
+
+
+class TestPushChart:
+    """ Test push chart of every hand class. """
+
+    @staticmethod
+    def test_shape():
+        scene = poker_coach.PushFoldScenario(field=FIELD, random_state=0)
+        chart = scene.push_chart()
+        n_classes = len(poker_coach.hands.CLASSES)
+        n_villains = len(scene.villains_after_range)
+        assert chart.expected_value.shape == (n_classes, n_villains)
+        assert chart.push.shape == (n_classes,)
+
+    @staticmethod
+    def test_matches_evaluate():
+        scene = poker_coach.PushFoldScenario(field=FIELD, random_state=0)
+        chart = scene.push_chart(payout=[50, 30, 20])
+        index = poker_coach.hands.class_index(scene.hero_hand)
+        result = scene.evaluate(method="table", payout=[50, 30, 20])
+        assert np.allclose(chart.expected_value[index], result.expected_value)
+        assert chart.push[index] == result.push
+
+    @staticmethod
+    def test_aces_pushed():
+        scene = poker_coach.PushFoldScenario(field=FIELD, random_state=0)
+        assert scene.push_chart().push[poker_coach.hands.CLASSES.index("AA")]
+
+
+class TestCallShoveScenario:
+    """ Test call shove scenario. """
+
+    @staticmethod
+    def test_shover_before_hero():
+        for i in range(20):
+            scene = poker_coach.CallShoveScenario(field=FIELD, random_state=i)
+            assert 0 <= scene._shover < scene._hero_position < scene.n_seats
+
+    @staticmethod
+    def test_shover_range():
+        scene = poker_coach.CallShoveScenario(field=FIELD, random_state=0)
+        assert FIELD[0] <= scene.shover_range <= FIELD[2]
+
+    @staticmethod
+    def test_evaluate():
+        scene = poker_coach.CallShoveScenario(field=FIELD, random_state=0)
+        result = scene.evaluate()
+        expected = scene.expected_value(
+            result.equity, scene.win_value, scene.lose_value
+        )
+        assert result.expected_value == pytest.approx(expected)
+        assert result.call == (result.equity > result.break_even)
+
+    @staticmethod
+    def test_nash_call():
+        scene = poker_coach.CallShoveScenario(field=FIELD, random_state=0)
+        scene._hero_hand = "AsAd"
+        assert scene.nash_call()
+        scene._hero_hand = "7h2c"
+        assert not scene.nash_call()
+
+    @staticmethod
+    def test_big_blind_posted():
+        scenes = [
+            poker_coach.CallShoveScenario(field=FIELD, random_state=i)
+            for i in range(50)
+        ]
+        blinds = {scene.hero_position: scene.hero_blind for scene in scenes}
+        assert blinds["BB"] == 1 and blinds["SB"] == 0.5
@@ -0,0 +1,69 @@
+import threading
+
+from poker_coach import prefetch
+
+
+class TestPrefetcher:
+    """ Test background prefetching. """
+
+    @staticmethod
+    def test_result():
+        prefetcher = prefetch.Prefetcher()
+        assert prefetcher.result("key", pow, 2, 10) == 1024
+
+    @staticmethod
+    def test_submit_once():
+        calls = []
+        prefetcher = prefetch.Prefetcher()
+        prefetcher.submit("key", calls.append, 1).result()
+        prefetcher.submit("key", calls.append, 2).result()
+        assert calls == [1]
+        assert "key" in prefetcher
+
+    @staticmethod
+    def test_retain_cancels_pending():
+        started = threading.Event()
+        release = threading.Event()
+        prefetcher = prefetch.Prefetcher(prefetch.ThreadPoolExecutor(max_workers=1))
+
+        def block():
+            started.set()
+            release.wait()
+
+        running = prefetcher.submit("running", block)
+        started.wait()
+        pending = prefetcher.submit("pending", pow, 2, 2)
+        prefetcher.retain(["running"])
+        release.set()
+
+        assert pending.cancelled()
+        assert running.result() is None
+        assert len(prefetcher) == 1 and "pending" not in prefetcher
+
+    @staticmethod
+    def test_resubmit_after_retain():
+        prefetcher = prefetch.Prefetcher()
+        prefetcher.submit("key", pow, 2, 2).result()
+        prefetcher.retain([])
+        assert prefetcher.result("key", pow, 2, 3) == 8
+
+    @staticmethod
+    def test_retain_stops_running():
+        started = threading.Event()
+        prefetcher = prefetch.Prefetcher(prefetch.ThreadPoolExecutor(max_workers=1))
+        stop = prefetcher.stop_event("running")
+
+        def work():
+            started.set()
+            return stop.wait(timeout=10)
+
+        running = prefetcher.submit("running", work)
+        started.wait()
+        prefetcher.retain(["other"])
+        assert running.result() is True
+        assert not prefetcher.stop_event("running").is_set()
+
+    @staticmethod
+    def test_named_executors():
+        assert prefetch.executor("draw") is prefetch.executor("draw")
+        assert prefetch.executor("draw") is not prefetch.default_executor()
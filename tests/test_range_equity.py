@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from poker_coach import equity_table, hands, range_equity, ranges
+
+
+class TestRangeEquity:
+    """ Test range versus range equities. """
+
+    @staticmethod
+    def test_hand_weights():
+        weights = range_equity.weights("AsKd")
+        assert weights.sum() == 1
+        assert weights[hands.combo_index("KdAs")] == 1
+
+    @staticmethod
+    def test_blocked():
+        blocked = range_equity.blocked("AsKd")
+        assert blocked.sum() == 1326 - 50 * 49 // 2
+        assert blocked[hands.combo_index("AsAh")]
+        assert not blocked[hands.combo_index("AhAc")]
+
+    @staticmethod
+    def test_same_hands_split():
+        assert range_equity.equity("AsAd", "AhAc") == pytest.approx(0.5)
+
+    @staticmethod
+    def test_shared_card_has_no_equity():
+        assert np.isnan(range_equity.equity("AsAd", "AsKs"))
+
+    @staticmethod
+    def test_card_removal():
+        # Only one pair of aces is left against a pair of aces.
+        villain = np.zeros(1326)
+        villain[hands.COMBO_CLASSES == hands.CLASSES.index("AA")] = 1
+        villain[hands.COMBO_CLASSES == hands.CLASSES.index("22")] = 1
+        versus_deuces = range_equity.equity("AsAh", "2s2h")
+        expected = (0.5 + 6 * versus_deuces) / 7
+        assert range_equity.equity("AsAh", villain) == pytest.approx(expected)
+
+    @staticmethod
+    def test_ranges_symmetric():
+        hero = ranges.top(20).weights
+        villain = ranges.top(5).weights
+        assert range_equity.equity(hero, villain) + range_equity.equity(
+            villain, hero
+        ) == pytest.approx(1)
+
+    @staticmethod
+    def test_matches_table():
+        eqs = range_equity.equities(
+            "AsKd", np.array([ranges.top(pct).weights for pct in (5, 30)])
+        )
+        assert np.allclose(eqs, equity_table.lookup("AsKd", [5, 30]), atol=0.01)
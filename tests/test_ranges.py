@@ -0,0 +1,65 @@
+import numpy as np
+
+import poker_coach
+from poker_coach import hands, ranges
+
+
+class TestRanges:
+    """ Test bit mask ranges. """
+
+    @staticmethod
+    def test_top_matches_classes():
+        for percentage in (0.1, 3.3, 20, 57.5, 100):
+            mask = hands.top_range(percentage)[hands.COMBO_CLASSES]
+            assert (ranges.top(percentage).mask == mask).all()
+
+    @staticmethod
+    def test_membership():
+        rng = ranges.top(5)
+        assert "AsAh" in rng
+        assert hands.combo_index("AsAh") in rng
+        assert "7s2d" not in rng
+
+    @staticmethod
+    def test_len():
+        assert len(ranges.top(100)) == ranges.N_COMBOS
+        assert len(ranges.Range()) == 0
+
+    @staticmethod
+    def test_without_blocked_combos():
+        rng = ranges.top(100).without("AsKd")
+        assert len(rng) == 50 * 49 // 2
+        assert "AsAh" not in rng and "AhAc" in rng
+
+    @staticmethod
+    def test_blockers():
+        assert len(ranges.blockers("AsKd")) == 2 * 51 - 1
+
+    @staticmethod
+    def test_set_operations():
+        small, large = ranges.top(5), ranges.top(20)
+        assert small & large == small
+        assert small | large == large
+        assert len(large - small) == len(large) - len(small)
+
+    @staticmethod
+    def test_from_hands():
+        rng = ranges.Range.from_hands(["AsKd", "7s2d"])
+        assert len(rng) == 2 and "KdAs" in rng
+
+    @staticmethod
+    def test_mask_round_trip():
+        mask = np.random.default_rng(0).random(ranges.N_COMBOS) < 0.5
+        assert (ranges.Range.from_mask(mask).mask == mask).all()
+
+    @staticmethod
+    def test_top_pocket_aces():
+        assert len(ranges.top(0.5)) == 6
+
+    @staticmethod
+    def test_scenario_villains_combos():
+        scene = poker_coach.Scenario(random_state=0)
+        combos = scene.villains_after_combos
+        assert len(combos) == len(scene.villains_after_range)
+        assert all(scene.hero_hand not in rng for rng in combos)
+        assert 0 < scene.hero_percentage <= 100
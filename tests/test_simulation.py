@@ -0,0 +1,161 @@
+import asyncio
+
+import numpy as np
+
+from poker_coach import cards, simulation
+
+
+class TestSimulation:
+    """ Test vectorized Monte Carlo simulation. """
+
+    @staticmethod
+    def test_eval_ranges_len():
+        eqs = simulation.eval_ranges("AsKs", [5, 20, 100], times=100)
+        assert len(eqs) == 3
+
+    @staticmethod
+    def test_eval_ranges_empty():
+        assert len(simulation.eval_ranges("AsKs", [], times=100)) == 0
+
+    @staticmethod
+    def test_eval_ranges_reproducible():
+        eqs0 = simulation.eval_ranges("AsKs", [5, 20], times=1000, random_state=0)
+        eqs1 = simulation.eval_ranges("AsKs", [5, 20], times=1000, random_state=0)
+        assert (eqs0 == eqs1).all()
+
+    @staticmethod
+    def test_eval_ranges_mirror():
+        eqs = simulation.eval_ranges("AsAh", [0.5], times=2000, random_state=0)
+        assert abs(eqs[0] - 0.5) < 0.05
+
+    @staticmethod
+    def test_eval_ranges_known_equity():
+        # Ace king suited has about 67% equity against a random hand.
+        eqs = simulation.eval_ranges("AsKs", [100], times=20000, random_state=0)
+        assert abs(eqs[0] - 0.67) < 0.02
+
+    @staticmethod
+    def test_villains_combos_card_removal():
+        hero = cards.encode("AsAh")
+        combos = simulation.villains_combos(hero, [0.5])[0]
+        assert len(combos) == 1
+        assert not np.isin(combos, hero).any()
+
+    @staticmethod
+    def test_simulate_chunk_boards_avoid_villain_cards():
+        hero = cards.encode("AsKs")
+        combos = simulation.villains_combos(hero, [5, 100])
+        scores = simulation.simulate_chunk(
+            hero, combos, 500, np.random.default_rng(0)
+        )
+        assert scores.shape == (2, 500)
+        assert set(np.unique(scores)) <= {0, 0.5, 1}
+
+    @staticmethod
+    def test_estimate_ranges_runs_all():
+        estimate = simulation.estimate_ranges("AsKs", [5, 20], times=3000)
+        assert estimate.runs == 3000
+        assert estimate.equity.shape == estimate.stderr.shape == (2,)
+
+    @staticmethod
+    def test_estimate_ranges_target_se():
+        estimate = simulation.estimate_ranges(
+            "AsKs", [5, 20], times=100000, target_se=0.01, random_state=0
+        )
+        assert estimate.runs < 100000
+        assert (estimate.stderr <= 0.01).all()
+
+    @staticmethod
+    def test_estimate_ranges_settled_decision():
+        # Aces are way above a 30% break even against any range.
+        estimate = simulation.estimate_ranges(
+            "AsAh", [5, 50], times=100000, break_even=[0.3, 0.3], random_state=0
+        )
+        assert estimate.runs == simulation.ADAPTIVE_CHUNK_SIZE
+
+    @staticmethod
+    def test_eval_ranges_workers_reproducible():
+        eqs0 = simulation.eval_ranges("AsKs", [5, 20], 2000, random_state=0, workers=2)
+        eqs1 = simulation.eval_ranges("AsKs", [5, 20], 2000, random_state=0, workers=2)
+        assert (eqs0 == eqs1).all()
+
+    @staticmethod
+    def test_eval_ranges_workers_seed_sequence():
+        seed = np.random.SeedSequence(0)
+        eqs0, eqs1 = [
+            simulation.eval_ranges("AsKs", [5, 20], 2000, random_state=seed, workers=2)
+            for _ in range(2)
+        ]
+        assert (eqs0 == eqs1).all()
+        assert seed.n_children_spawned == 0
+
+    @staticmethod
+    def test_eval_ranges_workers_independent_seeds():
+        eqs = simulation.eval_ranges("AsAh", [0.5], 4000, random_state=0, workers=2)
+        assert abs(eqs[0] - 0.5) < 0.05
+
+    @staticmethod
+    def test_get_pool_persists():
+        assert simulation.get_pool(2) is simulation.get_pool(2)
+
+    @staticmethod
+    def test_estimate_ranges_workers():
+        estimate = simulation.estimate_ranges(
+            "AsKs", [5, 20], times=4000, random_state=0, workers=2
+        )
+        assert estimate.runs == 4000
+
+    @staticmethod
+    def test_iter_estimates_progress():
+        estimates = simulation.iter_estimates(
+            "AsKs", [5, 20], times=2500, chunk_size=1000, random_state=0
+        )
+        assert [estimate.runs for estimate in estimates] == [1000, 2000, 2500]
+
+    @staticmethod
+    def test_aiter_estimates_matches_estimate_ranges():
+        async def last():
+            estimates = simulation.aiter_estimates(
+                "AsKs", [5, 20], times=3000, target_se=0.0, random_state=0
+            )
+            return [estimate async for estimate in estimates][-1]
+
+        estimate = asyncio.run(last())
+        expected = simulation.estimate_ranges(
+            "AsKs", [5, 20], times=3000, target_se=0.0, random_state=0
+        )
+        assert estimate.runs == expected.runs
+        assert (estimate.equity == expected.equity).all()
+
+    @staticmethod
+    def test_aiter_estimates_settled():
+        async def runs():
+            estimates = simulation.aiter_estimates(
+                "AsAh", [5, 50], times=100000, break_even=[0.3, 0.3], random_state=0
+            )
+            return [estimate.runs async for estimate in estimates]
+
+        assert asyncio.run(runs()) == [simulation.ADAPTIVE_CHUNK_SIZE]
+
+    @staticmethod
+    def test_aiter_estimates_cancel():
+        progress = []
+
+        async def consume():
+            estimates = simulation.aiter_estimates("AsKs", [5, 20], times=100000)
+            async for estimate in estimates:
+                progress.append(estimate)
+
+        async def cancel():
+            task = asyncio.create_task(consume())
+            while not progress:
+                await asyncio.sleep(0.001)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(cancel())
+        assert 1 <= len(progress) <= 2
+        assert progress[-1].runs < 100000
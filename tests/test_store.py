@@ -0,0 +1,102 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from poker_coach import store
+
+
+class Clock:
+    """ Manually advanced clock. """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStore:
+    """ Test bounded result store. """
+
+    @staticmethod
+    def test_get_set():
+        results = store.Store()
+        results.set("key", 1)
+        assert results.get("key") == 1
+        assert results.get("other", "default") == "default"
+        assert results.stats()[:2] == (1, 1)
+
+    @staticmethod
+    def test_lru_eviction():
+        results = store.Store(max_size=2, size=lambda value: 1)
+        results.set("a", 1)
+        results.set("b", 2)
+        results.get("a")
+        results.set("c", 3)
+        assert "a" in results and "c" in results
+        assert "b" not in results
+        assert results.stats().evictions == 1
+
+    @staticmethod
+    def test_too_large_not_stored():
+        results = store.Store(max_size=100)
+        results.set("key", np.zeros(100))
+        assert "key" not in results
+        assert results.size == 0
+
+    @staticmethod
+    def test_ttl():
+        clock = Clock()
+        results = store.Store(ttl=10, clock=clock)
+        results.set("default", 1)
+        results.set("longer", 2, ttl=20)
+        clock.now = 15
+        assert results.get("default") is None
+        assert results.get("longer") == 2
+        assert results.stats().expirations == 1
+        assert len(results) == 1
+
+    @staticmethod
+    def test_sizeof():
+        assert store.sizeof(np.zeros(10)) == 80
+        assert store.sizeof((np.zeros(10), np.zeros(5))) > 120
+
+    @staticmethod
+    def test_get_or_compute_once():
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+        results = store.Store()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return 42
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(results.get_or_compute, "key", compute)
+            started.wait()
+            others = [
+                executor.submit(results.get_or_compute, "key", compute)
+                for _ in range(3)
+            ]
+            release.set()
+            values = [future.result() for future in [first, *others]]
+
+        assert values == [42] * 4
+        assert calls == [1]
+
+    @staticmethod
+    def test_get_or_compute_error_not_stored():
+        results = store.Store()
+
+        def fail():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            results.get_or_compute("key", fail)
+        assert results.get_or_compute("key", pow, 2, 3) == 8
+        assert "key" in results
@@ -0,0 +1,88 @@
+import json
+
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from poker_coach import hands, model, training
+
+
+def train(target_error=0.05, target_max_error=1):
+    """ Train a few trees on a small dataset. """
+    estimators = {
+        depth: DecisionTreeRegressor(max_depth=depth, random_state=0)
+        for depth in (2, 8, 4)
+    }
+    return training.train(
+        samples=2000,
+        target_error=target_error,
+        target_max_error=target_max_error,
+        max_latency=1,
+        estimators=estimators,
+    )
+
+
+@pytest.fixture(name="trained", scope="module")
+def fixture_trained():
+    """ Train with a loose target. """
+    return train()
+
+
+class TestTraining:
+    """ Test equity model training. """
+
+    @staticmethod
+    def test_class_equities():
+        equities = training.class_equities()
+        assert equities.shape == (len(hands.CLASSES), len(hands.CLASSES))
+        # Aces against aces only.
+        assert equities[0, 0] == pytest.approx(0.5, abs=0.01)
+
+    @staticmethod
+    def test_candidates():
+        assert len(training.candidates()) > 1
+
+    @staticmethod
+    def test_dataset():
+        x, y = training.dataset(100, random_state=0)
+        assert x.shape == (100, 2)
+        assert ((y > 0) & (y < 1)).all()
+        assert (training.dataset(100, random_state=0)[1] == y).all()
+
+    @staticmethod
+    def test_selects_smallest_accepted(trained):
+        estimator, results = trained
+        # The shallowest tree misses the target.
+        assert [result.accepted for result in results] == [False, True, True]
+        assert estimator.get_depth() == 4
+
+    @staticmethod
+    def test_max_error_target():
+        estimator, results = train(target_max_error=0.15)
+        # The depth 4 tree meets the mean target but misses the maximum one.
+        assert [result.accepted for result in results] == [False, True, False]
+        assert estimator.get_depth() == 8
+
+    @staticmethod
+    def test_reproducible(trained):
+        estimator, _ = trained
+        again, _ = train()
+        x, _ = training.dataset(100, random_state=1)
+        assert (estimator.predict(x) == again.predict(x)).all()
+
+    @staticmethod
+    def test_unreachable_target():
+        with pytest.raises(ValueError):
+            train(target_error=0)
+
+    @staticmethod
+    def test_save(trained, tmp_path):
+        estimator, results = trained
+        path = str(tmp_path / "model.pkl")
+        training.save(estimator, results, path=path, seed=0)
+        x = model.features("AsKd", [10, 50])
+        assert np.allclose(model.load(path).predict(x), estimator.predict(x))
+        with open(tmp_path / "model.json") as file:
+            report = json.load(file)
+        assert report["seed"] == 0
+        assert len(report["candidates"]) == len(results)